@@ -6,196 +6,267 @@ Full featured application with PPT generation and choice between analysis modes
 
 import streamlit as st
 import sys
-import os
+import hashlib
 import yfinance as yf
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any
 
 # Add src directory to path
 sys.path.append('src')
 
 from data_analysis.free_analyzer import FreeStockAnalyzer
-from data_analysis.stock_analyzer import StockAnalyzer
-from presentation.pitch_generator_free import create_presentation_free
-from presentation.pitch_generator_ai import create_presentation_ai
-from utils.config import Config
+from data_analysis.indicators import TRADING_DAYS_PER_YEAR, rolling_mean, total_return, annualized_volatility
+from utils.disk_cache import disk_cached
+from utils.logger import setup_logger
 
-def create_basic_presentation(symbol: str, analysis_results: Dict[str, Any], info: Dict[str, Any]) -> str:
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from data_analysis.stock_analyzer import StockAnalyzer
+
+logger = setup_logger(__name__)
+
+
+# Header price fields available from the cheap fast_info endpoint, keyed by their .info names
+_FAST_INFO_FIELDS = {
+    'currentPrice': 'last_price',
+    'previousClose': 'previous_close',
+    'marketCap': 'market_cap',
+    'fiftyTwoWeekHigh': 'year_high',
+    'fiftyTwoWeekLow': 'year_low',
+}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_ticker_bundle(symbol: str, period: str = "2y"):
+    """Fetch quick quote and price history for a symbol (cached across reruns and restarts)."""
+    return disk_cached(f"{symbol}_quote_history_{period}", lambda: _download_ticker_bundle(symbol, period), ttl=600)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_company_info(symbol: str) -> Dict[str, Any]:
+    """Fetch the full (slow) .info profile; it changes rarely, so it is cached for an hour."""
+    return disk_cached(f"{symbol}_info", lambda: dict(yf.Ticker(symbol).info or {}))
+
+
+def _quick_quote(ticker) -> Dict[str, float]:
+    """Read the header price fields from fast_info, skipping any that are unavailable."""
+    quote = {}
+    fast_info = ticker.fast_info
+    for key, attr in _FAST_INFO_FIELDS.items():
+        try:
+            value = getattr(fast_info, attr)
+        except Exception:
+            continue
+        if value is not None and value == value:
+            quote[key] = float(value)
+    return quote
+
+
+def _download_ticker_bundle(symbol: str, period: str):
+    """Download quick quote and price history for a symbol from Yahoo."""
+    ticker = yf.Ticker(symbol)
+    
+    # The two endpoints are independent, so overlap their HTTP round-trips
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        quote_future = executor.submit(_quick_quote, ticker)
+        hist_future = executor.submit(ticker.history, period=period)
+        return quote_future.result(), hist_future.result()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_watchlist(symbols: tuple, period: str = "2y") -> Dict[str, tuple]:
+    """Fetch info and price history for several symbols concurrently."""
+    if not symbols:
+        return {}
+    tickers = yf.Tickers(" ".join(symbols))
+
+    def fetch_one(sym: str):
+        ticker = tickers.tickers[sym]
+        return dict(ticker.info or {}), ticker.history(period=period)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(10, len(symbols))) as executor:
+        futures = [executor.submit(fetch_one, sym) for sym in symbols]
+        for sym, future in zip(symbols, futures):
+            try:
+                results[sym] = future.result()
+            except Exception as e:
+                logger.warning(f"Error fetching watchlist data for {sym}: {str(e)}")
+    return results
+
+
+# Keyed on the charted values, not just the date range, so intraday price and volume updates redraw
+@st.cache_data(ttl=600, show_spinner=False,
+               hash_funcs={pd.DataFrame: lambda d: int(pd.util.hash_pandas_object(d[['Close', 'Volume']]).sum())})
+def _price_volume_figure(symbol: str, hist: pd.DataFrame) -> "go.Figure":
+    """Build the price/SMA/volume chart once per symbol and history window."""
+    # Plotly is imported lazily to keep cold start fast
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    # Pull the price/volume columns out once and compute the overlay on raw arrays
+    # (copy=True: the kernels need writable arrays, not pandas' read-only views)
+    close = hist['Close'].to_numpy(dtype=np.float64, copy=True)
+    volume = hist['Volume'].to_numpy(dtype=np.float64)
+    sma_50 = rolling_mean(close, 50)
+    
+    # Downsample long histories to weekly bars to keep the chart payload small
+    chart_data = pd.DataFrame({'Close': close, 'Volume': volume, 'SMA50': sma_50}, index=hist.index)
+    if len(chart_data) > 260:
+        chart_data = chart_data.resample('W').agg(
+            {'Close': 'last', 'Volume': 'sum', 'SMA50': 'last'}
+        ).dropna(subset=['Close'])
+    
+    # Create subplots
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.1,
+        row_width=[0.7, 0.3],
+        subplot_titles=('Stock Price', 'Volume')
+    )
+    
+    # Price chart
+    fig.add_trace(
+        go.Scatter(
+            x=chart_data.index,
+            y=chart_data['Close'],
+            mode='lines',
+            name=f'{symbol} Price',
+            line=dict(color='#667eea', width=3),
+            hovertemplate='<b>%{y:.2f}</b><br>%{x}<extra></extra>'
+        ),
+        row=1, col=1
+    )
+    
+    # 50-day moving average
+    fig.add_trace(
+        go.Scatter(
+            x=chart_data.index,
+            y=chart_data['SMA50'],
+            mode='lines',
+            name='50-Day SMA',
+            line=dict(color='#f5576c', width=1.5, dash='dot'),
+            hovertemplate='<b>%{y:.2f}</b><br>%{x}<extra></extra>'
+        ),
+        row=1, col=1
+    )
+    
+    # Volume chart
+    fig.add_trace(
+        go.Bar(
+            x=chart_data.index,
+            y=chart_data['Volume'],
+            name='Volume',
+            marker_color='rgba(102, 126, 234, 0.6)',
+            hovertemplate='<b>%{y:,.0f}</b><br>%{x}<extra></extra>'
+        ),
+        row=2, col=1
+    )
+    
+    fig.update_layout(
+        title=f"{symbol} - 2 Year Performance Analysis",
+        xaxis_title="Date",
+        height=600,
+        showlegend=False
+    )
+    
+    fig.update_yaxes(title_text="Price ($)", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    
+    return fig
+
+
+@st.cache_resource
+def _ppt_executor() -> ThreadPoolExecutor:
+    """Background pool that pre-builds pitch decks while the user reads the analysis."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def _drop_ppt_future() -> None:
+    """Forget any pre-built deck for this session, cancelling it if the pool hasn't started it yet."""
+    ppt_future = st.session_state.get('ppt_future')
+    if ppt_future is not None:
+        ppt_future.cancel()
+    st.session_state.ppt_future = None
+
+
+def _build_presentation(analysis_type: str, symbol: str, result: Dict[str, Any], info: Dict[str, Any]) -> bytes:
+    """Generate the pitch deck for the given analysis mode as .pptx bytes."""
+    if analysis_type == "Premium":
+        from presentation.pitch_generator_ai import create_presentation_ai
+        return create_presentation_ai(symbol, result)
+    from presentation.pitch_generator_free import create_presentation_free
+    return create_presentation_free(symbol, result, info)
+
+
+@st.cache_resource
+def _get_free_analyzer() -> FreeStockAnalyzer:
+    """Shared FreeStockAnalyzer instance so it isn't rebuilt on every rerun."""
+    return FreeStockAnalyzer()
+
+
+@st.cache_resource
+def _get_premium_analyzer(api_key: str) -> "StockAnalyzer":
+    """Shared StockAnalyzer instance per API key."""
+    # Deferred so free-mode sessions never load the AI code path
+    from data_analysis.stock_analyzer import StockAnalyzer
+    from utils.config import get_config
+    
+    return StockAnalyzer(get_config(api_key))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _run_free_analysis(stock_items: tuple) -> Dict[str, Any]:
+    """Memoized free analysis keyed on the stock snapshot."""
+    return _get_free_analyzer().analyze_stock_free(dict(stock_items))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_premium_data(symbol: str, api_key_hash: str, _api_key: str) -> Dict[str, Any]:
+    """Memoized premium stock data per symbol and API key; only the key's hash enters the cache key."""
+    return _get_premium_analyzer(_api_key).fetch_stock_data(symbol)
+
+
+def _run_premium_analysis(symbol: str, api_key: str, on_field: Callable[[str, Any], None]) -> Dict[str, Any]:
     """
-    Create a basic PowerPoint presentation without AI enhancement.
+    Premium analysis, reporting AI fields to on_field as they stream in.
     
-    Args:
-        symbol: Stock ticker symbol
-        analysis_results: Results from stock analysis
-        info: Company information from yfinance
-        
-    Returns:
-        Path to the generated presentation file
+    Not memoized here: Streamlit cannot replay writes to a placeholder made outside a cached
+    function, and the analyzer already keeps the AI response on disk, replaying it to on_field.
     """
-    try:
-        from pptx import Presentation
-        from pptx.util import Inches, Pt
-        from pptx.enum.text import PP_ALIGN
-        from pptx.dml.color import RGBColor
-        
-        # Create presentation
-        prs = Presentation()
-        
-        # Title slide
-        title_slide = prs.slides.add_slide(prs.slide_layouts[0])
-        title = title_slide.shapes.title
-        subtitle = title_slide.placeholders[1]
-        
-        title.text = f"{symbol} Stock Pitch"
-        subtitle.text = f"Investment Analysis - {info.get('longName', symbol)}\n{datetime.now().strftime('%B %d, %Y')}"
-        
-        # Executive Summary slide
-        summary_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        summary_title = summary_slide.shapes.title
-        summary_title.text = "Executive Summary"
-        
-        # Add content to summary slide
-        content = summary_slide.placeholders[1]
-        content_text = f"""
-        Company: {info.get('longName', symbol)}
-        Sector: {info.get('sector', 'Unknown')}
-        Current Price: ${info.get('currentPrice', 0):.2f}
-        Market Cap: ${info.get('marketCap', 0) / 1e9:.1f}B
-        
-        Recommendation: {analysis_results.get('recommendation', 'HOLD')}
-        Target Price: ${analysis_results.get('target_price', 0):.2f}
-        Upside Potential: {analysis_results.get('upside_potential', 'N/A')}%
-        """
-        content.text = content_text
-        
-        # Set font for content
-        for paragraph in content.text_frame.paragraphs:
-            for run in paragraph.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(14)
-        
-        # Valuation slide
-        valuation_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        val_title = valuation_slide.shapes.title
-        val_title.text = "Valuation Analysis"
-        
-        val_content = valuation_slide.placeholders[1]
-        
-        # Extract valuation info from AI analysis
-        highlights = analysis_results.get('highlights', [])
-        target_price = analysis_results.get('target_price', 0)
-        upside_potential = analysis_results.get('upside_potential', 'N/A')
-        recommendation = analysis_results.get('recommendation', 'HOLD')
-        
-        # Build valuation content from AI analysis
-        valuation_text = f"""
-        TARGET PRICE: ${target_price:.2f}
-        CURRENT PRICE: ${info.get('currentPrice', 0):.2f}
-        UPSIDE POTENTIAL: {upside_potential}%
-        RECOMMENDATION: {recommendation}
-        
-        KEY VALUATION METRICS:
-        """
-        
-        # Add highlights as bullet points
-        for highlight in highlights[:5]:  # Limit to 5 highlights
-            valuation_text += f"• {highlight}\n"
-        
-        val_content.text = valuation_text
-        
-        # Set font for valuation content
-        for paragraph in val_content.text_frame.paragraphs:
-            for run in paragraph.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(14)
-        
-        # Investment Thesis slide
-        thesis_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        thesis_title = thesis_slide.shapes.title
-        thesis_title.text = "Investment Thesis"
-        
-        thesis_content = thesis_slide.placeholders[1]
-        thesis_content.text = analysis_results.get('investment_thesis', 'Investment based on fundamental analysis.')
-        
-        # Set font for thesis content
-        for paragraph in thesis_content.text_frame.paragraphs:
-            for run in paragraph.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(14)
-        
-        # Key Highlights slide
-        highlights_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        highlights_title = highlights_slide.shapes.title
-        highlights_title.text = "Key Highlights & Risks"
-        
-        highlights_content = highlights_slide.placeholders[1]
-        highlights = analysis_results.get('highlights', [])
-        risks = analysis_results.get('risks', [])
-        
-        content_text = "KEY HIGHLIGHTS:\n"
-        for highlight in highlights[:4]:  # Top 4 highlights
-            content_text += f"• {highlight}\n"
-        
-        content_text += "\nKEY RISKS:\n"
-        for risk in risks[:4]:  # Top 4 risks
-            content_text += f"• {risk}\n"
-        
-        highlights_content.text = content_text
-        
-        # Set font for highlights content
-        for paragraph in highlights_content.text_frame.paragraphs:
-            for run in paragraph.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(14)
-        
-        # Detailed Analysis slide
-        analysis_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        analysis_title = analysis_slide.shapes.title
-        analysis_title.text = "Detailed Financial Analysis"
-        
-        analysis_content = analysis_slide.placeholders[1]
-        full_analysis = analysis_results.get('analysis', 'Analysis not available')
-        
-        # Truncate if too long for PowerPoint
-        if len(full_analysis) > 1000:
-            full_analysis = full_analysis[:1000] + "..."
-        
-        analysis_content.text = full_analysis
-        
-        # Set font for analysis content
-        for paragraph in analysis_content.text_frame.paragraphs:
-            for run in paragraph.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(12)
-        
-        # Save presentation
-        output_dir = "output"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        filename = f"{symbol}_basic_pitch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
-        filepath = os.path.join(output_dir, filename)
-        
-        prs.save(filepath)
-        return filepath
-        
-    except Exception as e:
-        print(f"Error creating basic presentation: {str(e)}")
-        return None
+    stock_data = _fetch_premium_data(symbol, hashlib.sha256(api_key.encode()).hexdigest(), api_key)
+    return _get_premium_analyzer(api_key).analyze_stock(stock_data, on_field)
 
-# Configure page
-st.set_page_config(
-    page_title="Stock Pitch AI - Professional Analysis",
-    page_icon="📊",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
 
-# Custom CSS - Enhanced UI
-st.markdown("""
+# AI response fields previewed while the analysis streams, with their labels
+_PREVIEW_LABELS = {
+    'recommendation': 'Recommendation',
+    'target_price': 'Target Price',
+    'upside_potential': 'Upside Potential',
+    'investment_thesis': 'Investment Thesis',
+    'highlights': 'Key Highlights',
+    'risks': 'Key Risks',
+}
+
+
+def _preview_fields(placeholder) -> Callable[[str, Any], None]:
+    """on_field callback rendering each finished AI field into placeholder."""
+    fields: Dict[str, Any] = {}
+    
+    def on_field(name: str, value: Any) -> None:
+        if name in _PREVIEW_LABELS:
+            fields[name] = "; ".join(map(str, value)) if isinstance(value, list) else value
+            placeholder.markdown("\n\n".join(f"**{_PREVIEW_LABELS[k]}:** {v}" for k, v in fields.items()))
+    
+    return on_field
+
+
+# Static page markup, built once at import rather than on every rerun
+_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -207,21 +278,6 @@ st.markdown("""
         box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
     }
     
-    .metric-container {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        padding: 1.5rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 1rem;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        transition: transform 0.3s ease;
-    }
-    
-    .metric-container:hover {
-        transform: translateY(-5px);
-    }
-    
     .analysis-section {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
         padding: 2rem;
@@ -325,17 +381,90 @@ st.markdown("""
         margin-bottom: 1rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🚀 Stock Pitch AI - Professional Analysis Platform</h1>
+    <p>Advanced Financial Analysis with DCF, WACC & Financial Statement Analysis</p>
+    <p>Complete with PowerPoint Generation & AI-Powered Insights</p>
+</div>
+"""
+
+_SIDEBAR_INTRO_HTML = """
+<div class="sidebar-section">
+    <h2>🎯 Stock Pitch AI Configuration</h2>
+    <p>Configure your analysis parameters below</p>
+</div>
+<div class="sidebar-section">
+    <h3>� Analysis Mode</h3>
+    <p>Choose between free comprehensive analysis or premium AI-powered insights</p>
+</div>
+"""
+
+_API_KEY_HTML = """
+<div class="sidebar-section">
+    <h4>🔑 OpenAI API Key Required</h4>
+    <p>Enter your OpenAI API key to unlock AI-powered insights</p>
+</div>
+"""
+
+_STOCK_SELECTION_HTML = """
+<div class="sidebar-section">
+    <h3>📈 Stock Selection</h3>
+    <p>Enter the stock ticker symbol you want to analyze</p>
+</div>
+"""
+
+_PARAMETERS_HTML = """
+<div class="sidebar-section">
+    <h3>⚙️ Advanced Analysis Parameters</h3>
+    <p>Customize your financial analysis settings</p>
+</div>
+"""
+
+_FEATURES_HTML = """
+<div class="sidebar-section">
+    <h3>🎯 Analysis Features</h3>
+    <p>What you'll get with your analysis:</p>
+    <ul style="margin-left: 1rem;">
+        <li>✅ DCF Valuation (Fair Value Calculation)</li>
+        <li>✅ WACC Calculation (Cost of Capital)</li>
+        <li>✅ Financial Health Assessment</li>
+        <li>✅ Risk Analysis & Beta Calculation</li>
+        <li>✅ Investment Recommendation</li>
+        <li>✅ Professional PowerPoint Report</li>
+    </ul>
+</div>
+"""
+
+_PPT_CARD_HTML = """
+<div class="ppt-generation-card">
+    <h3>🎯 Professional Stock Pitch Presentation</h3>
+    <p><strong>Generate a comprehensive PowerPoint presentation</strong> with all analysis results, charts, and recommendations ready for professional use.</p>
+    <p>✅ Includes all analysis data | ✅ Professional formatting | ✅ Ready to download</p>
+</div>
+"""
+
+# Premium result cards: recommendation picks its colour class by table lookup
+_REC_CLASS = {"BUY": "recommendation-buy", "SELL": "recommendation-sell", "HOLD": "recommendation-hold"}
+_CARD_STYLE = "color: white; padding: 1rem; border-radius: 5px; text-align: center;"
+_CARD_TMPL = '<div class="{cls}" style="{style}"><h3>{label}</h3><h2>{value}</h2></div>'
+
+# Configure page
+st.set_page_config(
+    page_title="Stock Pitch AI - Professional Analysis",
+    page_icon="📊",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS - Enhanced UI
+st.markdown(_CSS, unsafe_allow_html=True)
 
 def main():
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🚀 Stock Pitch AI - Professional Analysis Platform</h1>
-        <p>Advanced Financial Analysis with DCF, WACC & Financial Statement Analysis</p>
-        <p>Complete with PowerPoint Generation & AI-Powered Insights</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     # Initialize session state
     if 'analysis_complete' not in st.session_state:
@@ -346,23 +475,12 @@ def main():
         st.session_state.stock_info = None
     if 'current_symbol' not in st.session_state:
         st.session_state.current_symbol = None
+    if 'ppt_future' not in st.session_state:
+        st.session_state.ppt_future = None
 
     # Sidebar - Enhanced
     with st.sidebar:
-        st.markdown("""
-        <div class="sidebar-section">
-            <h2>🎯 Stock Pitch AI Configuration</h2>
-            <p>Configure your analysis parameters below</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Analysis Mode Selection
-        st.markdown("""
-        <div class="sidebar-section">
-            <h3>� Analysis Mode</h3>
-            <p>Choose between free comprehensive analysis or premium AI-powered insights</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_INTRO_HTML, unsafe_allow_html=True)
         
         analysis_mode = st.selectbox(
             "Select Analysis Mode",
@@ -374,12 +492,7 @@ def main():
         # API Key input for premium mode
         api_key = None
         if "Premium" in analysis_mode:
-            st.markdown("""
-            <div class="sidebar-section">
-                <h4>🔑 OpenAI API Key Required</h4>
-                <p>Enter your OpenAI API key to unlock AI-powered insights</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_API_KEY_HTML, unsafe_allow_html=True)
             
             api_key = st.text_input(
                 "OpenAI API Key",
@@ -393,12 +506,7 @@ def main():
                 st.info("💡 No API key? Switch to Free Analysis for comprehensive analysis without API requirements")
         
         # Stock Selection
-        st.markdown("""
-        <div class="sidebar-section">
-            <h3>📈 Stock Selection</h3>
-            <p>Enter the stock ticker symbol you want to analyze</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_STOCK_SELECTION_HTML, unsafe_allow_html=True)
         
         stock_symbol = st.text_input(
             "Stock Symbol",
@@ -413,14 +521,10 @@ def main():
             st.session_state.analysis_result = None
             st.session_state.stock_info = None
             st.session_state.current_symbol = stock_symbol
+            _drop_ppt_future()
         
         # Analysis Parameters
-        st.markdown("""
-        <div class="sidebar-section">
-            <h3>⚙️ Advanced Analysis Parameters</h3>
-            <p>Customize your financial analysis settings</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PARAMETERS_HTML, unsafe_allow_html=True)
         
         dcf_years = st.slider(
             "DCF Projection Years",
@@ -454,101 +558,68 @@ def main():
         
         st.markdown("**📊 What is Market Risk Premium?** The additional return investors expect for taking on market risk instead of risk-free investments.")
         
+        # Comparative watchlist
+        watchlist_input = st.text_input(
+            "Comparison Watchlist",
+            placeholder="e.g., MSFT, GOOGL, AMZN",
+            help="Comma-separated symbols to compare against the selected stock"
+        )
+        watchlist = tuple(dict.fromkeys(
+            s.strip().upper() for s in watchlist_input.split(",") if s.strip()
+        ))
+        
         # Features showcase
         st.markdown("---")
-        st.markdown("""
-        <div class="sidebar-section">
-            <h3>🎯 Analysis Features</h3>
-            <p>What you'll get with your analysis:</p>
-            <ul style="margin-left: 1rem;">
-                <li>✅ DCF Valuation (Fair Value Calculation)</li>
-                <li>✅ WACC Calculation (Cost of Capital)</li>
-                <li>✅ Financial Health Assessment</li>
-                <li>✅ Risk Analysis & Beta Calculation</li>
-                <li>✅ Investment Recommendation</li>
-                <li>✅ Professional PowerPoint Report</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_FEATURES_HTML, unsafe_allow_html=True)
 
     # Main content
     if stock_symbol:
         try:
             # Fetch stock data
             with st.spinner(f"📊 Fetching comprehensive data for {stock_symbol}..."):
-                ticker = yf.Ticker(stock_symbol)
-                info = ticker.info
-                hist = ticker.history(period="2y")
-                financials = ticker.financials if hasattr(ticker, 'financials') else pd.DataFrame()
-                
-            # Display enhanced stock info
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h3>{info.get('longName', stock_symbol)}</h3>
-                    <p><strong>{stock_symbol}</strong></p>
-                    <p>{info.get('sector', 'Unknown Sector')}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                current_price = info.get('currentPrice', 0)
-                prev_close = info.get('previousClose', current_price)
-                change = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
-                color = "green" if change >= 0 else "red"
-                arrow = "↗" if change >= 0 else "↘"
+                quote, hist = _fetch_ticker_bundle(stock_symbol, "2y")
+                # Fresh fast_info prices take precedence over the hourly .info profile
+                info = {**_fetch_company_info(stock_symbol), **quote}
                 
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h4>Current Price</h4>
-                    <h2>${current_price:.2f}</h2>
-                    <p style="color: {color};">{arrow} {change:+.2f}%</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Unpack company info once; everything below reads these locals
+            long_name = info.get('longName', stock_symbol)
+            sector = info.get('sector', 'Unknown')
+            current_price = info.get('currentPrice', 0)
+            prev_close = info.get('previousClose', current_price)
+            market_cap = info.get('marketCap', 0)
+            pe_ratio = info.get('trailingPE', 0)
+            eps = info.get('trailingEps', 0)
+            beta = info.get('beta', 1.0)
+            dividend_yield = info.get('dividendYield', 0)
+            pb_ratio = info.get('priceToBook', 0)
+            high_52w = info.get('fiftyTwoWeekHigh', 0)
+            low_52w = info.get('fiftyTwoWeekLow', 0)
             
-            with col3:
-                market_cap = info.get('marketCap', 0)
-                market_cap_b = market_cap / 1e9 if market_cap > 0 else 0
-                cap_type = "Large Cap" if market_cap_b > 10 else "Mid Cap" if market_cap_b > 2 else "Small Cap"
-                
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h4>Market Cap</h4>
-                    <h2>${market_cap_b:.1f}B</h2>
-                    <p>{cap_type}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Headline figures, computed once ahead of the metric cards
+            change = ((current_price - prev_close) / prev_close * 100) if prev_close else 0
+            market_cap_b = market_cap / 1e9 if market_cap > 0 else 0
+            cap_type = "Large Cap" if market_cap_b > 10 else "Mid Cap" if market_cap_b > 2 else "Small Cap"
+            pe_assessment = "Low" if pe_ratio < 15 else "High" if pe_ratio > 30 else "Moderate"
             
-            with col4:
-                pe_ratio = info.get('trailingPE', 0)
-                pe_assessment = "Low" if pe_ratio < 15 else "High" if pe_ratio > 30 else "Moderate"
-                
-                st.markdown(f"""
-                <div class="metric-container">
-                    <h4>P/E Ratio</h4>
-                    <h2>{pe_ratio:.1f}x</h2>
-                    <p>{pe_assessment} Valuation</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Display enhanced stock info
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric(long_name, stock_symbol, sector, delta_color="off")
+            col2.metric("Current Price", f"${current_price:.2f}", f"{change:+.2f}%")
+            col3.metric("Market Cap", f"${market_cap_b:.1f}B", cap_type, delta_color="off")
+            col4.metric("P/E Ratio", f"{pe_ratio:.1f}x", f"{pe_assessment} Valuation", delta_color="off")
             
             # Additional metrics row
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                beta = info.get('beta', 1.0)
                 volatility = "Low" if beta < 1 else "High" if beta > 1.5 else "Moderate"
                 st.metric("Beta (Risk)", f"{beta:.2f}", f"{volatility} Volatility")
             
             with col2:
-                dividend_yield = info.get('dividendYield', 0)
                 div_pct = dividend_yield * 100 if dividend_yield else 0
                 st.metric("Dividend Yield", f"{div_pct:.2f}%")
             
             with col3:
-                high_52w = info.get('fiftyTwoWeekHigh', 0)
-                low_52w = info.get('fiftyTwoWeekLow', 0)
                 st.metric("52W High", f"${high_52w:.2f}")
             
             with col4:
@@ -557,51 +628,34 @@ def main():
             # Enhanced price chart with volume
             st.markdown("### 📈 Stock Performance & Technical Analysis")
             
-            # Create subplots
-            fig = make_subplots(
-                rows=2, cols=1,
-                shared_xaxes=True,
-                vertical_spacing=0.1,
-                row_width=[0.7, 0.3],
-                subplot_titles=('Stock Price', 'Volume')
-            )
+            # Pull the close column out once and compute metrics on the raw array
+            close = hist['Close'].to_numpy(dtype=np.float64, copy=True)
             
-            # Price chart
-            fig.add_trace(
-                go.Scatter(
-                    x=hist.index,
-                    y=hist['Close'],
-                    mode='lines',
-                    name=f'{stock_symbol} Price',
-                    line=dict(color='#667eea', width=3),
-                    hovertemplate='<b>%{y:.2f}</b><br>%{x}<extra></extra>'
-                ),
-                row=1, col=1
-            )
-            
-            # Volume chart
-            fig.add_trace(
-                go.Bar(
-                    x=hist.index,
-                    y=hist['Volume'],
-                    name='Volume',
-                    marker_color='rgba(102, 126, 234, 0.6)',
-                    hovertemplate='<b>%{y:,.0f}</b><br>%{x}<extra></extra>'
-                ),
-                row=2, col=1
-            )
+            st.plotly_chart(_price_volume_figure(stock_symbol, hist), use_container_width=True)
             
-            fig.update_layout(
-                title=f"{stock_symbol} - 2 Year Performance Analysis",
-                xaxis_title="Date",
-                height=600,
-                showlegend=False
-            )
-            
-            fig.update_yaxes(title_text="Price ($)", row=1, col=1)
-            fig.update_yaxes(title_text="Volume", row=2, col=1)
+            period_return = total_return(close) * 100
+            volatility_pct = annualized_volatility(close, TRADING_DAYS_PER_YEAR) * 100
+            if not np.isnan(period_return) and not np.isnan(volatility_pct):
+                st.caption(f"2-Year Return: {period_return:+.1f}% | Annualized Volatility: {volatility_pct:.1f}%")
             
-            st.plotly_chart(fig, use_container_width=True)
+            # Peer comparison table (fetched in parallel)
+            if watchlist:
+                st.markdown("### 🔎 Watchlist Comparison")
+                with st.spinner("📊 Fetching watchlist data..."):
+                    peers = _fetch_watchlist(watchlist, "2y")
+                rows = []
+                for sym, (peer_info, peer_hist) in peers.items():
+                    rows.append({
+                        'Symbol': sym,
+                        'Name': peer_info.get('longName', sym),
+                        'Price': peer_info.get('currentPrice'),
+                        'Market Cap ($B)': (peer_info.get('marketCap') or 0) / 1e9,
+                        'P/E': peer_info.get('trailingPE'),
+                        'Beta': peer_info.get('beta'),
+                        '2Y Return (%)': (peer_hist['Close'].iloc[-1] / peer_hist['Close'].iloc[0] - 1) * 100 if not peer_hist.empty else None
+                    })
+                if rows:
+                    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
             
             # Analysis button
             if st.button("🔍 Generate Comprehensive Analysis", key="analyze"):
@@ -609,38 +663,40 @@ def main():
                     # Prepare stock data
                     stock_data = {
                         'symbol': stock_symbol,
-                        'company_name': info.get('longName', stock_symbol),
-                        'current_price': info.get('currentPrice', 0),
-                        'pe_ratio': info.get('trailingPE', 0),
-                        'eps': info.get('trailingEps', 0),
-                        'market_cap': info.get('marketCap', 0),
-                        'beta': info.get('beta', 1.0),
-                        'dividend_yield': info.get('dividendYield', 0),
-                        'pb_ratio': info.get('priceToBook', 0),
-                        '52w_high': info.get('fiftyTwoWeekHigh', 0),
-                        '52w_low': info.get('fiftyTwoWeekLow', 0),
-                        'sector': info.get('sector', 'Unknown')
+                        'company_name': long_name,
+                        'current_price': current_price,
+                        'pe_ratio': pe_ratio,
+                        'eps': eps,
+                        'market_cap': market_cap,
+                        'beta': beta,
+                        'dividend_yield': dividend_yield,
+                        'pb_ratio': pb_ratio,
+                        '52w_high': high_52w,
+                        '52w_low': low_52w,
+                        'sector': sector
                     }
                     
+                    # Hashable snapshot so repeat runs hit the analysis cache
+                    stock_items = tuple(sorted(stock_data.items()))
+                    
                     # Run analysis based on selected mode
                     if "Free Analysis" in analysis_mode:
-                        analyzer = FreeStockAnalyzer()
-                        result = analyzer.analyze_stock_free(stock_data)
+                        result = _run_free_analysis(stock_items)
                         analysis_type = "Free"
                     else:  # Premium Analysis
                         if api_key:
                             try:
-                                config = Config(api_key=api_key)
-                                analyzer = StockAnalyzer(config)
-                                # First fetch stock data, then analyze
-                                premium_stock_data = analyzer.fetch_stock_data(stock_symbol)
-                                result = analyzer.analyze_stock(premium_stock_data)
+                                # Fetches stock data, then analyzes, showing AI fields as they finish
+                                preview = st.empty()
+                                try:
+                                    result = _run_premium_analysis(stock_symbol, api_key, _preview_fields(preview))
+                                finally:
+                                    preview.empty()
                                 analysis_type = "Premium"
                             except Exception as e:
                                 st.error(f"❌ Premium analysis failed: {str(e)}")
                                 st.info("🔄 Falling back to free analysis...")
-                                analyzer = FreeStockAnalyzer()
-                                result = analyzer.analyze_stock_free(stock_data)
+                                result = _run_free_analysis(stock_items)
                                 analysis_type = "Free (Fallback)"
                         else:
                             st.error("❌ API key required for premium analysis")
@@ -652,37 +708,26 @@ def main():
                     st.session_state.stock_info = info
                     st.session_state.current_symbol = stock_symbol
                     st.session_state.analysis_type = analysis_type  # <-- Store analysis_type
+                    
+                    # Start building the deck now so it is ready by the time the user asks for it
+                    _drop_ppt_future()
+                    st.session_state.ppt_future = _ppt_executor().submit(
+                        _build_presentation, analysis_type, stock_symbol, result, info
+                    )
 
                     # Display results
                     st.success(f"✅ {analysis_type} Analysis Complete!")
                     
                     # Key metrics
                     if analysis_type == "Premium":
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            recommendation = result.get('recommendation', 'N/A')
-                            st.markdown(f"""
-                            <div style="background: #4CAF50; color: white; padding: 1rem; border-radius: 5px; text-align: center;">
-                                <h3>Recommendation</h3>
-                                <h2>{recommendation}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        with col2:
-                            target_price = result.get('target_price', 'N/A')
-                            st.markdown(f"""
-                            <div style="background: #667eea; color: white; padding: 1rem; border-radius: 5px; text-align: center;">
-                                <h3>Target Price</h3>
-                                <h2>${target_price if target_price != 'N/A' else 'N/A'}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        with col3:
-                            upside = result.get('upside_potential', 'N/A')
-                            st.markdown(f"""
-                            <div style="background: #764ba2; color: white; padding: 1rem; border-radius: 5px; text-align: center;">
-                                <h3>Upside Potential</h3>
-                                <h2>{upside if upside != 'N/A' else 'N/A'}</h2>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        recommendation = result.get('recommendation', 'N/A')
+                        cards = [
+                            ("Recommendation", recommendation, _REC_CLASS.get(str(recommendation).upper(), "recommendation-hold"), ""),
+                            ("Target Price", f"${result.get('target_price', 'N/A')}", "", f"background: #667eea; {_CARD_STYLE}"),
+                            ("Upside Potential", result.get('upside_potential', 'N/A'), "", f"background: #764ba2; {_CARD_STYLE}"),
+                        ]
+                        for col, (label, value, cls, style) in zip(st.columns(3), cards):
+                            col.markdown(_CARD_TMPL.format(cls=cls, style=style, label=label, value=value), unsafe_allow_html=True)
 
                     # DCF and WACC Analysis (AI version)
                     if analysis_type == "Premium":
@@ -742,15 +787,10 @@ def main():
                 st.session_state.analysis_result = None
                 st.session_state.stock_info = None
                 st.session_state.current_symbol = None
+                _drop_ppt_future()
                 st.rerun()
         
-        st.markdown("""
-        <div class="ppt-generation-card">
-            <h3>🎯 Professional Stock Pitch Presentation</h3>
-            <p><strong>Generate a comprehensive PowerPoint presentation</strong> with all analysis results, charts, and recommendations ready for professional use.</p>
-            <p>✅ Includes all analysis data | ✅ Professional formatting | ✅ Ready to download</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PPT_CARD_HTML, unsafe_allow_html=True)
         
         col1, col2 = st.columns([1, 1])
         
@@ -780,36 +820,44 @@ def main():
                     info = st.session_state.stock_info
                     symbol = st.session_state.current_symbol
                     
-                    # Use the proper PitchGenerator class instead of basic function
-                    st.info("🔄 Creating presentation...")
-                    analysis_type = st.session_state.get('analysis_type', 'Free')
-                    if analysis_type == "Premium":
-                        ppt_path = create_presentation_ai(stock_symbol, result)
-                    else:
-                        ppt_path = create_presentation_free(stock_symbol, result, info)
+                    # Use the deck pre-built in the background, or build it now if none is pending
+                    ppt_future = st.session_state.ppt_future
+                    if ppt_future is not None:
+                        if not ppt_future.done():
+                            st.info("🔄 Finishing presentation...")
+                        try:
+                            ppt_bytes = ppt_future.result()
+                        except Exception as e:
+                            # A failed background build is not cached; retry it inline below
+                            logger.warning(f"Background presentation build failed: {str(e)}")
+                            _drop_ppt_future()
+                            ppt_future = None
+                    if ppt_future is None:
+                        st.info("🔄 Creating presentation...")
+                        analysis_type = st.session_state.get('analysis_type', 'Free')
+                        ppt_bytes = _build_presentation(analysis_type, stock_symbol, result, info)
                     
-                    if ppt_path and os.path.exists(ppt_path):
+                    if ppt_bytes:
                         st.success("✅ PowerPoint presentation created successfully!")
                         
-                        # Provide download link
-                        with open(ppt_path, "rb") as file:
-                            st.download_button(
-                                label="📥 Download PowerPoint Presentation",
-                                data=file.read(),
-                                file_name=f"{symbol}_stock_pitch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx",
-                                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                                type="primary",
-                                use_container_width=True,
-                                key="download_ppt"
-                            )
+                        # The deck never touches the disk; the download is served from memory
+                        file_name = f"{symbol}_stock_pitch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
+                        st.download_button(
+                            label="📥 Download PowerPoint Presentation",
+                            data=ppt_bytes,
+                            file_name=file_name,
+                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                            type="primary",
+                            use_container_width=True,
+                            key="download_ppt"
+                        )
                         
                         # Show presentation details
-                        file_size = os.path.getsize(ppt_path)
                         st.markdown(f"""
                         <div class="ppt-generation-card">
                             <h4>📊 Presentation Details</h4>
-                            <p><strong>File:</strong> {os.path.basename(ppt_path)}</p>
-                            <p><strong>Size:</strong> {file_size:,} bytes</p>
+                            <p><strong>File:</strong> {file_name}</p>
+                            <p><strong>Size:</strong> {len(ppt_bytes):,} bytes</p>
                             <p><strong>Format:</strong> PowerPoint (.pptx)</p>
                             <p><strong>Content:</strong> Complete stock analysis with charts and recommendations</p>
                         </div>
@@ -2,6 +2,12 @@
 Stock Pitch AI - Data Analysis Package
 """
 
-from .stock_analyzer import StockAnalyzer
-
 __all__ = ['StockAnalyzer']
+
+
+def __getattr__(name):
+    # Resolved on first access so importing the package doesn't load openai
+    if name == 'StockAnalyzer':
+        from .stock_analyzer import StockAnalyzer
+        return StockAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,29 +6,221 @@ Handles WACC calculations, DCF modeling, and financial statement analysis
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional, Tuple
 import warnings
-warnings.filterwarnings('ignore')
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+
+# Add src directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_analysis.valuation_kernels import capm_cost_of_equity, dcf_scenarios, gordon_terminal_value
+from utils.disk_cache import disk_cached
+from utils.logger import setup_logger, queue_handlers
+
+# Silence only yfinance's own FutureWarnings; a catch_warnings block would not be
+# thread-safe around the concurrent fetches in get_comprehensive_analysis
+warnings.filterwarnings('ignore', category=FutureWarning, module=r'yfinance(\.|$)')
+
+# Error paths are common with sparse yfinance data, so log through a queue rather than blocking on stdout
+logger = queue_handlers(setup_logger(__name__))
+
+
+@dataclass(slots=True)
+class WACCResult:
+    """Weighted average cost of capital and its inputs"""
+    wacc: float = 0.1
+    cost_of_equity: float = 0.0
+    cost_of_debt: float = 0.0
+    tax_rate: float = 0.0
+    beta: float = 1.0
+    market_cap: float = 0.0
+    total_debt: float = 0.0
+    equity_weight: float = 0.0
+    debt_weight: float = 0.0
+    risk_free_rate: float = 0.0
+    market_risk_premium: float = 0.0
+    error: Optional[str] = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class DCFResult:
+    """DCF valuation with projected and discounted cash flows"""
+    enterprise_value: float = 0.0
+    equity_value: float = 0.0
+    intrinsic_value_per_share: float = 0.0
+    current_price: float = 0.0
+    upside_downside: float = 0.0
+    projected_fcf: List[float] = field(default_factory=list)
+    pv_fcf: List[float] = field(default_factory=list)
+    terminal_value: float = 0.0
+    pv_terminal: float = 0.0
+    wacc: float = 0.0
+    terminal_growth: float = 0.0
+    revenue_growth: float = 0.0
+    error: Optional[str] = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class RatiosResult:
+    """Financial ratios grouped by category"""
+    profitability: Dict[str, float] = field(default_factory=dict)
+    liquidity: Dict[str, float] = field(default_factory=dict)
+    valuation: Dict[str, float] = field(default_factory=dict)
+    efficiency: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 
 class FinancialCalculator:
     """Advanced financial calculations for stock valuation"""
     
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, ticker: Optional[yf.Ticker] = None):
         self.symbol = symbol.upper()
-        self.ticker = yf.Ticker(self.symbol)
+        self._ticker = ticker
         self._cache = {}
     
+    @property
+    def ticker(self) -> yf.Ticker:
+        """yfinance Ticker, created on first use so cached runs never build one"""
+        if self._ticker is None:
+            self._ticker = yf.Ticker(self.symbol)
+        return self._ticker
+    
+    @classmethod
+    def bulk(cls, symbols: List[str], prefetch: bool = True) -> Dict[str, 'FinancialCalculator']:
+        """Build calculators for several symbols from one yf.Tickers call, prefetching their data concurrently"""
+        symbols = [symbol.upper() for symbol in symbols]
+        tickers = yf.Tickers(' '.join(symbols))
+        calculators = {symbol: cls(symbol, tickers.tickers.get(symbol)) for symbol in symbols}
+        
+        if prefetch and calculators:
+            fetches = [fetch for calc in calculators.values()
+                       for fetch in (calc._info, calc._financials, calc._balance_sheet, calc._cashflow)]
+            with ThreadPoolExecutor(max_workers=min(16, len(fetches))) as executor:
+                wait([executor.submit(fetch) for fetch in fetches])
+        
+        return calculators
+    
+    def _cached(self, key: str, loader):
+        """Return self._cache[key], falling back to the on-disk cache and then loader"""
+        if key not in self._cache:
+            self._cache[key] = disk_cached(f"{self.symbol}_{key}", loader)
+        return self._cache[key]
+    
+    def _info(self) -> Dict[str, Any]:
+        """Ticker info, fetched once per calculator"""
+        return self._cached('info', lambda: self.ticker.info)
+    
+    def _financials(self) -> pd.DataFrame:
+        """Income statement, fetched once per calculator"""
+        return self._cached('financials', lambda: self.ticker.financials)
+    
+    def _balance_sheet(self) -> pd.DataFrame:
+        """Balance sheet, fetched once per calculator"""
+        return self._cached('balance_sheet', lambda: self.ticker.balance_sheet)
+    
+    def _cashflow(self) -> pd.DataFrame:
+        """Cash flow statement, fetched once per calculator"""
+        return self._cached('cashflow', lambda: self.ticker.cashflow)
+    
+    @staticmethod
+    def _latest_items(statement: pd.DataFrame, labels: list) -> np.ndarray:
+        """Latest-period values for labels in one reindex pull (NaN where missing)"""
+        if statement.empty:
+            return np.full(len(labels), np.nan)
+        return statement.iloc[:, 0].reindex(labels).to_numpy(dtype=np.float64)
+    
+    def _extract_metrics(self) -> SimpleNamespace:
+        """Pull every statement and info field the analyses use in a single pass"""
+        if 'metrics' in self._cache:
+            return self._cache['metrics']
+        
+        info = self._info()
+        # Anything yfinance hands back that isn't a DataFrame counts as an empty statement
+        financials, balance_sheet, cash_flow = (
+            frame if isinstance(frame, pd.DataFrame) else pd.DataFrame()
+            for frame in (self._financials(), self._balance_sheet(), self._cashflow())
+        )
+        
+        (revenue, net_income, gross_profit, operating_income, pretax_income, tax_provision,
+         interest_expense, interest_expense_non_operating, interest_and_debt_expense) = self._latest_items(
+            financials,
+            ['Total Revenue', 'Net Income', 'Gross Profit', 'Operating Income', 'Pretax Income', 'Tax Provision',
+             'Interest Expense', 'Interest Expense Non Operating', 'Interest And Debt Expense']
+        )
+        (total_assets, total_equity, current_assets, current_liabilities,
+         reported_debt, long_term_debt, short_long_term_debt) = self._latest_items(
+            balance_sheet,
+            ['Total Assets', 'Stockholders Equity', 'Current Assets', 'Current Liabilities',
+             'Total Debt', 'Long Term Debt', 'Short Long Term Debt']
+        )
+        free_cash_flow, operating_cf, capex = self._latest_items(
+            cash_flow, ['Free Cash Flow', 'Total Cash From Operating Activities', 'Capital Expenditures']
+        )
+        
+        # Total Debt when reported, else long-term plus current portion
+        total_debt = reported_debt if not np.isnan(reported_debt) else np.nan_to_num(long_term_debt) + np.nan_to_num(short_long_term_debt)
+        
+        beta = info.get('beta', 1.0)
+        if beta is None:
+            beta = 1.0
+        
+        if len(financials.columns) >= 2 and 'Total Revenue' in financials.index:
+            revenue_history = financials.loc['Total Revenue'].to_numpy(dtype=np.float64)
+        else:
+            revenue_history = np.empty(0)
+        
+        metrics = SimpleNamespace(
+            has_financials=not financials.empty,
+            has_balance_sheet=not balance_sheet.empty,
+            has_cash_flow=not cash_flow.empty,
+            revenue=np.nan_to_num(revenue),
+            net_income=np.nan_to_num(net_income),
+            gross_profit=np.nan_to_num(gross_profit),
+            operating_income=np.nan_to_num(operating_income),
+            pretax_income=np.nan_to_num(pretax_income),
+            tax_provision=np.nan_to_num(tax_provision),
+            interest_candidates=np.array([interest_expense, interest_expense_non_operating, interest_and_debt_expense]),
+            total_assets=np.nan_to_num(total_assets),
+            total_equity=np.nan_to_num(total_equity),
+            current_assets=np.nan_to_num(current_assets),
+            current_liabilities=np.nan_to_num(current_liabilities),
+            total_debt=total_debt,
+            free_cash_flow=np.nan_to_num(free_cash_flow),
+            operating_cf=np.nan_to_num(operating_cf),
+            capex=np.nan_to_num(capex),
+            revenue_history=revenue_history,
+            market_cap=info.get('marketCap', 0),
+            shares_outstanding=info.get('sharesOutstanding', 1),
+            beta=beta,
+            current_price=info.get('currentPrice', 0),
+            cash=info.get('totalCash', 0)
+        )
+        self._cache['metrics'] = metrics
+        return metrics
+    
     def get_financial_statements(self) -> Dict[str, Any]:
         """Get comprehensive financial statements"""
         try:
             # Get financial statements
-            financials = self.ticker.financials
-            balance_sheet = self.ticker.balance_sheet
-            cash_flow = self.ticker.cashflow
+            financials = self._financials()
+            balance_sheet = self._balance_sheet()
+            cash_flow = self._cashflow()
             
             # Get info for additional metrics
-            info = self.ticker.info
+            info = self._info()
             
             return {
                 'income_statement': financials,
@@ -37,42 +229,28 @@ class FinancialCalculator:
                 'info': info
             }
         except Exception as e:
-            print(f"Error getting financial statements: {e}")
+            logger.warning("Error getting financial statements: %s", e)
             return {}
     
-    def calculate_wacc(self) -> Dict[str, Any]:
+    def calculate_wacc(self) -> WACCResult:
         """Calculate Weighted Average Cost of Capital"""
         try:
-            info = self.ticker.info
-            balance_sheet = self.ticker.balance_sheet
-            
-            # Market values
-            market_cap = info.get('marketCap', 0)
-            enterprise_value = info.get('enterpriseValue', 0)
-            
-            # Get debt from balance sheet
-            if not balance_sheet.empty:
-                latest_bs = balance_sheet.iloc[:, 0]
-                total_debt = latest_bs.get('Total Debt', 0)
-                if pd.isna(total_debt):
-                    total_debt = latest_bs.get('Long Term Debt', 0) + latest_bs.get('Short Long Term Debt', 0)
-                    if pd.isna(total_debt):
-                        total_debt = 0
-            else:
-                total_debt = 0
+            m = self._extract_metrics()
+            market_cap = m.market_cap
+            total_debt = m.total_debt
             
             # Cost of equity (using CAPM)
-            beta = info.get('beta', 1.0)
-            if beta is None:
-                beta = 1.0
+            beta = m.beta
             
             risk_free_rate = 0.045  # 10-year treasury rate (approximate)
             market_risk_premium = 0.065  # Historical market risk premium
-            cost_of_equity = risk_free_rate + beta * market_risk_premium
+            cost_of_equity = capm_cost_of_equity(risk_free_rate, beta, market_risk_premium)
             
-            # Cost of debt
-            interest_expense = self._get_interest_expense()
-            cost_of_debt = interest_expense / total_debt if total_debt > 0 else 0.05
+            # Cost of debt (no debt on the books means no interest lookup is needed)
+            if total_debt > 0:
+                cost_of_debt = self._get_interest_expense() / total_debt
+            else:
+                cost_of_debt = 0.05
             
             # Handle NaN values
             if pd.isna(cost_of_debt) or cost_of_debt == 0:
@@ -92,157 +270,144 @@ class FinancialCalculator:
             if pd.isna(wacc):
                 wacc = cost_of_equity  # Use cost of equity as fallback
             
-            return {
-                'wacc': wacc,
-                'cost_of_equity': cost_of_equity,
-                'cost_of_debt': cost_of_debt,
-                'tax_rate': tax_rate,
-                'beta': beta,
-                'market_cap': market_cap,
-                'total_debt': total_debt,
-                'equity_weight': equity_weight,
-                'debt_weight': debt_weight,
-                'risk_free_rate': risk_free_rate,
-                'market_risk_premium': market_risk_premium
-            }
+            return WACCResult(
+                wacc=wacc,
+                cost_of_equity=cost_of_equity,
+                cost_of_debt=cost_of_debt,
+                tax_rate=tax_rate,
+                beta=beta,
+                market_cap=market_cap,
+                total_debt=total_debt,
+                equity_weight=equity_weight,
+                debt_weight=debt_weight,
+                risk_free_rate=risk_free_rate,
+                market_risk_premium=market_risk_premium
+            )
         except Exception as e:
-            print(f"Error calculating WACC: {e}")
-            return {'wacc': 0.1, 'error': str(e)}
+            logger.warning("Error calculating WACC: %s", e)
+            return WACCResult(wacc=0.1, error=str(e))
     
-    def calculate_dcf_valuation(self, years: int = 5) -> Dict[str, Any]:
-        """Calculate DCF valuation with terminal value"""
+    def calculate_dcf_valuation(self, years: int = 5, wacc_data: Optional[WACCResult] = None) -> DCFResult:
+        """Calculate DCF valuation with terminal value, reusing wacc_data when given"""
         try:
-            # Get cash flow data
-            cash_flow = self.ticker.cashflow
-            if cash_flow.empty:
-                return {'error': 'No cash flow data available'}
-            
-            # Get latest free cash flow
-            latest_cf = cash_flow.iloc[:, 0]
-            free_cash_flow = latest_cf.get('Free Cash Flow', 0)
-            
-            if pd.isna(free_cash_flow) or free_cash_flow == 0:
-                # Calculate FCF manually
-                operating_cf = latest_cf.get('Total Cash From Operating Activities', 0)
-                capex = latest_cf.get('Capital Expenditures', 0)
-                
-                # Handle NaN values
-                if pd.isna(operating_cf):
-                    operating_cf = 0
-                if pd.isna(capex):
-                    capex = 0
-                    
-                free_cash_flow = operating_cf + capex  # capex is negative
-                
-                # If still no FCF, use net income as proxy
-                if pd.isna(free_cash_flow) or free_cash_flow == 0:
-                    info = self.ticker.info
-                    free_cash_flow = info.get('freeCashflow', 0)
-                    if pd.isna(free_cash_flow) or free_cash_flow == 0:
-                        # Last resort: use 10% of market cap
-                        market_cap = info.get('marketCap', 0)
-                        free_cash_flow = market_cap * 0.1 if market_cap > 0 else 1000000000
+            free_cash_flow = self._base_free_cash_flow()
+            if free_cash_flow is None:
+                return DCFResult(error='No cash flow data available')
             
             # Growth assumptions
             revenue_growth = self._estimate_revenue_growth()
             terminal_growth = 0.025  # 2.5% long-term growth
             
             # WACC
-            wacc_data = self.calculate_wacc()
-            wacc = wacc_data['wacc']
-            
-            # Project future cash flows
-            projected_fcf = []
-            current_fcf = free_cash_flow
+            if wacc_data is None:
+                wacc_data = self.calculate_wacc()
+            wacc = wacc_data.wacc
             
-            for year in range(1, years + 1):
-                # Declining growth rate
-                growth_rate = revenue_growth * (0.9 ** (year - 1))
-                current_fcf = current_fcf * (1 + growth_rate)
-                projected_fcf.append(current_fcf)
+            # Project future cash flows with a declining growth rate
+            growth_rates = revenue_growth * 0.9 ** np.arange(years)
+            projected_fcf = free_cash_flow * np.cumprod(1 + growth_rates)
             
             # Terminal value
-            terminal_fcf = projected_fcf[-1] * (1 + terminal_growth)
-            terminal_value = terminal_fcf / (wacc - terminal_growth)
+            terminal_value = gordon_terminal_value(projected_fcf[-1], terminal_growth, wacc)
             
             # Present value calculations
-            pv_fcf = []
-            for i, fcf in enumerate(projected_fcf):
-                pv = fcf / ((1 + wacc) ** (i + 1))
-                pv_fcf.append(pv)
-            
-            pv_terminal = terminal_value / ((1 + wacc) ** years)
+            discount_factors = (1 + wacc) ** np.arange(1, years + 1)
+            pv_fcf = projected_fcf / discount_factors
+            pv_terminal = terminal_value / discount_factors[-1]
             
             # Enterprise value
-            enterprise_value = sum(pv_fcf) + pv_terminal
+            enterprise_value = pv_fcf.sum() + pv_terminal
             
             # Equity value
-            info = self.ticker.info
-            cash = info.get('totalCash', 0)
-            debt = wacc_data.get('total_debt', 0)
-            equity_value = enterprise_value + cash - debt
+            m = self._extract_metrics()
+            debt = wacc_data.total_debt
+            equity_value = enterprise_value + m.cash - debt
             
             # Share price
-            shares_outstanding = info.get('sharesOutstanding', 1)
-            intrinsic_value = equity_value / shares_outstanding
+            intrinsic_value = equity_value / m.shares_outstanding
+            
+            return DCFResult(
+                enterprise_value=enterprise_value,
+                equity_value=equity_value,
+                intrinsic_value_per_share=intrinsic_value,
+                current_price=m.current_price,
+                upside_downside=(intrinsic_value / self._info().get('currentPrice', 1) - 1) * 100,
+                projected_fcf=projected_fcf.tolist(),
+                pv_fcf=pv_fcf.tolist(),
+                terminal_value=terminal_value,
+                pv_terminal=pv_terminal,
+                wacc=wacc,
+                terminal_growth=terminal_growth,
+                revenue_growth=revenue_growth
+            )
+        except Exception as e:
+            logger.warning("Error calculating DCF: %s", e)
+            return DCFResult(error=str(e))
+    
+    def calculate_dcf_batch(self, wacc_arr: np.ndarray, growth_arr: np.ndarray,
+                            terminal_arr: np.ndarray, years: int = 5) -> Dict[str, Any]:
+        """Calculate DCF valuations for N (wacc, growth, terminal growth) scenarios in one pass"""
+        try:
+            free_cash_flow = self._base_free_cash_flow()
+            if free_cash_flow is None:
+                return {'error': 'No cash flow data available'}
+            
+            # Scenario inputs as matching contiguous (N,) arrays for the fused kernel
+            wacc, growth, terminal_growth = (
+                np.ascontiguousarray(arr, dtype=np.float64) for arr in np.broadcast_arrays(
+                    np.atleast_1d(np.asarray(wacc_arr, dtype=np.float64)),
+                    np.asarray(growth_arr, dtype=np.float64),
+                    np.asarray(terminal_arr, dtype=np.float64)
+                )
+            )
+            enterprise_value, terminal_value = dcf_scenarios(float(free_cash_flow), wacc, growth, terminal_growth, years)
+            
+            # Equity bridge is shared by every scenario
+            m = self._extract_metrics()
+            equity_value = enterprise_value + m.cash - m.total_debt
+            intrinsic_value = equity_value / m.shares_outstanding
             
             return {
+                'intrinsic_value': intrinsic_value,
                 'enterprise_value': enterprise_value,
                 'equity_value': equity_value,
-                'intrinsic_value_per_share': intrinsic_value,
-                'current_price': info.get('currentPrice', 0),
-                'upside_downside': (intrinsic_value / info.get('currentPrice', 1) - 1) * 100,
-                'projected_fcf': projected_fcf,
-                'pv_fcf': pv_fcf,
                 'terminal_value': terminal_value,
-                'pv_terminal': pv_terminal,
                 'wacc': wacc,
-                'terminal_growth': terminal_growth,
-                'revenue_growth': revenue_growth
+                'revenue_growth': growth,
+                'terminal_growth': terminal_growth
             }
         except Exception as e:
-            print(f"Error calculating DCF: {e}")
+            logger.warning("Error calculating DCF batch: %s", e)
             return {'error': str(e)}
     
-    def analyze_financial_ratios(self) -> Dict[str, Any]:
+    def analyze_financial_ratios(self) -> RatiosResult:
         """Calculate comprehensive financial ratios"""
         try:
-            info = self.ticker.info
-            financials = self.ticker.financials
-            balance_sheet = self.ticker.balance_sheet
-            
-            if financials.empty or balance_sheet.empty:
-                return {'error': 'Financial data not available'}
+            info = self._info()
+            m = self._extract_metrics()
             
-            latest_financial = financials.iloc[:, 0]
-            latest_bs = balance_sheet.iloc[:, 0]
+            if not (m.has_financials and m.has_balance_sheet):
+                return RatiosResult(error='Financial data not available')
             
-            # Revenue and profitability
-            revenue = latest_financial.get('Total Revenue', 0)
-            net_income = latest_financial.get('Net Income', 0)
-            gross_profit = latest_financial.get('Gross Profit', 0)
-            operating_income = latest_financial.get('Operating Income', 0)
-            
-            # Balance sheet items
-            total_assets = latest_bs.get('Total Assets', 0)
-            total_equity = latest_bs.get('Stockholders Equity', 0)
-            current_assets = latest_bs.get('Current Assets', 0)
-            current_liabilities = latest_bs.get('Current Liabilities', 0)
+            revenue, net_income, gross_profit, operating_income = m.revenue, m.net_income, m.gross_profit, m.operating_income
+            total_assets, total_equity, current_assets, current_liabilities = (
+                m.total_assets, m.total_equity, m.current_assets, m.current_liabilities
+            )
             
             # Calculate ratios
-            ratios = {
-                'profitability': {
+            return RatiosResult(
+                profitability={
                     'gross_margin': (gross_profit / revenue * 100) if revenue > 0 else 0,
                     'operating_margin': (operating_income / revenue * 100) if revenue > 0 else 0,
                     'net_margin': (net_income / revenue * 100) if revenue > 0 else 0,
                     'roe': (net_income / total_equity * 100) if total_equity > 0 else 0,
                     'roa': (net_income / total_assets * 100) if total_assets > 0 else 0
                 },
-                'liquidity': {
+                liquidity={
                     'current_ratio': current_assets / current_liabilities if current_liabilities > 0 else 0,
                     'quick_ratio': info.get('quickRatio', 0)
                 },
-                'valuation': {
+                valuation={
                     'pe_ratio': info.get('trailingPE', 0),
                     'forward_pe': info.get('forwardPE', 0),
                     'peg_ratio': info.get('pegRatio', 0),
@@ -250,52 +415,65 @@ class FinancialCalculator:
                     'price_to_sales': info.get('priceToSalesTrailing12Months', 0),
                     'ev_to_ebitda': info.get('enterpriseToEbitda', 0)
                 },
-                'efficiency': {
+                efficiency={
                     'asset_turnover': revenue / total_assets if total_assets > 0 else 0,
                     'inventory_turnover': info.get('inventoryTurnover', 0),
                     'receivables_turnover': info.get('receivablesTurnover', 0)
                 }
-            }
-            
-            return ratios
+            )
         except Exception as e:
-            print(f"Error analyzing financial ratios: {e}")
-            return {'error': str(e)}
+            logger.warning("Error analyzing financial ratios: %s", e)
+            return RatiosResult(error=str(e))
+    
+    def _base_free_cash_flow(self) -> Optional[float]:
+        """Latest free cash flow with fallbacks, or None when no cash flow data exists"""
+        m = self._extract_metrics()
+        if not m.has_cash_flow:
+            return None
+        
+        # Latest free cash flow (missing items read as 0)
+        free_cash_flow = m.free_cash_flow
+        
+        if free_cash_flow == 0:
+            # Calculate FCF manually
+            free_cash_flow = m.operating_cf + m.capex  # capex is negative
+            
+            # If still no FCF, use net income as proxy
+            if free_cash_flow == 0:
+                info = self._info()
+                free_cash_flow = info.get('freeCashflow', 0)
+                if pd.isna(free_cash_flow) or free_cash_flow == 0:
+                    # Last resort: use 10% of market cap
+                    market_cap = m.market_cap
+                    free_cash_flow = market_cap * 0.1 if market_cap > 0 else 1000000000
+        
+        return free_cash_flow
     
     def _get_interest_expense(self) -> float:
         """Get interest expense from income statement"""
         try:
-            financials = self.ticker.financials
-            if not financials.empty:
-                latest = financials.iloc[:, 0]
-                interest_expense = latest.get('Interest Expense', 0)
-                # Handle NaN values
-                if pd.isna(interest_expense):
-                    # Try alternative names
-                    interest_expense = latest.get('Interest Expense Non Operating', 0)
-                    if pd.isna(interest_expense):
-                        interest_expense = latest.get('Interest And Debt Expense', 0)
-                        if pd.isna(interest_expense):
-                            # Default to 3% of debt if we can't find interest expense
-                            info = self.ticker.info
-                            total_debt = info.get('totalDebt', 0)
-                            return total_debt * 0.03 if total_debt > 0 else 0
-                return abs(float(interest_expense)) if not pd.isna(interest_expense) else 0
-            return 0
+            m = self._extract_metrics()
+            if not m.has_financials:
+                return 0
+            
+            # First reported line item among the known interest expense names
+            reported = m.interest_candidates[~np.isnan(m.interest_candidates)]
+            if reported.size:
+                return abs(float(reported[0]))
+            
+            # Default to 3% of debt if we can't find interest expense
+            total_debt = self._info().get('totalDebt', 0)
+            return total_debt * 0.03 if total_debt > 0 else 0
         except Exception as e:
-            print(f"Error getting interest expense: {e}")
+            logger.warning("Error getting interest expense: %s", e)
             return 0
     
     def _get_tax_rate(self) -> float:
         """Calculate effective tax rate"""
         try:
-            financials = self.ticker.financials
-            if not financials.empty:
-                latest = financials.iloc[:, 0]
-                pretax_income = latest.get('Pretax Income', 0)
-                tax_provision = latest.get('Tax Provision', 0)
-                if pretax_income > 0:
-                    return tax_provision / pretax_income
+            m = self._extract_metrics()
+            if m.has_financials and m.pretax_income > 0:
+                return m.tax_provision / m.pretax_income
             return 0.25  # Default corporate tax rate
         except:
             return 0.25
@@ -303,22 +481,18 @@ class FinancialCalculator:
     def _estimate_revenue_growth(self) -> float:
         """Estimate revenue growth rate from historical data"""
         try:
-            financials = self.ticker.financials
-            if len(financials.columns) < 2:
+            revenue_row = self._extract_metrics().revenue_history
+            if revenue_row.size < 2:
                 return 0.05  # Default 5% growth
             
-            revenues = []
-            for col in financials.columns:
-                revenue = financials[col].get('Total Revenue', 0)
-                if revenue > 0:
-                    revenues.append(revenue)
-            
-            if len(revenues) < 2:
+            # Positions of usable (positive) revenues, newest first
+            valid = np.flatnonzero(revenue_row > 0)
+            if valid.size < 2:
                 return 0.05
             
-            # Calculate compound annual growth rate
-            years = len(revenues) - 1
-            cagr = (revenues[0] / revenues[-1]) ** (1/years) - 1
+            # Compound annual growth rate over the full span, so gaps don't shorten it
+            years = valid[-1] - valid[0]
+            cagr = np.power(revenue_row[valid[0]] / revenue_row[valid[-1]], 1.0 / years) - 1
             
             # Cap growth rate at reasonable levels
             return max(min(cagr, 0.20), -0.10)
@@ -328,12 +502,22 @@ class FinancialCalculator:
     def get_comprehensive_analysis(self) -> Dict[str, Any]:
         """Get complete financial analysis"""
         try:
-            return {
-                'financial_statements': self.get_financial_statements(),
-                'wacc_analysis': self.calculate_wacc(),
-                'dcf_valuation': self.calculate_dcf_valuation(),
-                'financial_ratios': self.analyze_financial_ratios(),
-                'symbol': self.symbol
-            }
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                # Warm the cache with one concurrent fetch per Yahoo endpoint; failures
+                # are left for the individual methods to handle as before
+                wait([executor.submit(fetch) for fetch in (self._info, self._financials, self._balance_sheet, self._cashflow)])
+                
+                # WACC is computed once and handed to the DCF
+                wacc_future = executor.submit(self.calculate_wacc)
+                futures = {
+                    'financial_statements': executor.submit(self.get_financial_statements),
+                    'wacc_analysis': wacc_future,
+                    'dcf_valuation': executor.submit(lambda: self.calculate_dcf_valuation(wacc_data=wacc_future.result())),
+                    'financial_ratios': executor.submit(self.analyze_financial_ratios)
+                }
+                results = {key: future.result() for key, future in futures.items()}
+            
+            results['symbol'] = self.symbol
+            return results
         except Exception as e:
             return {'error': str(e), 'symbol': self.symbol}
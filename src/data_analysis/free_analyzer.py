@@ -1,26 +1,234 @@
 """
-Free AI Alternative using Hugging Face models
+Free AI Alternative using rule-based analysis
 This provides a cost-free option for basic stock analysis
 """
 
 import os
-from typing import Dict, Any
-import requests
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, Final, FrozenSet, List, Mapping, Optional, Tuple
 import sys
+import numpy as np
 from datetime import datetime
 
 # Add src directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.logger import setup_logger
+from utils.logger import forward_to_parent, listen_for_workers, setup_logger
+from data_analysis.valuation_kernels import (
+    capm_cost_of_equity, dcf_paths, dcf_projection, weighted_cost_of_capital
+)
+
+# One logger shared by every analyzer instance, configured once per process
+logger = setup_logger()
+
+# Rule thresholds as ascending band edges for bisect/np.searchsorted. With bisect_right a value
+# equal to an edge lands in the upper band (an `x < edge` rule); edges nudged up with nextafter
+# keep it in the lower band (an `x > edge` rule).
+_PE_EDGES: Final = (12.0, 18.0, math.nextafter(25.0, math.inf), math.nextafter(35.0, math.inf))
+# P/E valuation bands as (valuation, recommendation, price target multiple)
+_VALUATION_BUCKETS: Final = (
+    ("Significantly undervalued", "STRONG BUY", 1.25),
+    ("Moderately undervalued", "BUY", 1.15),
+    ("Fair value", "HOLD", 1.05),
+    ("Moderately overvalued", "HOLD", 0.95),
+    ("Significantly overvalued", "SELL", 0.85),
+)
+_FAIR_VALUE: Final = 2
+
+# Risk points: bisect_left counts the beta/P/E edges exceeded, bisect_right the market-cap edges not reached
+_BETA_RISK_EDGES: Final = (1.2, 1.5)
+_PE_RISK_EDGES: Final = (25.0, 40.0)
+_MCAP_RISK_EDGES: Final = (2e9, 10e9)
+_RISK_SCORE_EDGES: Final = (2, 4)
+_RISK_LEVELS: Final = ("LOW RISK", "MODERATE RISK", "HIGH RISK")
+
+_PE_ASSESSMENT_EDGES: Final = (15.0, math.nextafter(30.0, math.inf))
+_PE_ASSESSMENTS: Final = ('Low (Potentially undervalued)', 'Moderate (Fair value)', 'High (Potentially overvalued)')
+_BETA_ASSESSMENT_EDGES: Final = (1.0, math.nextafter(1.5, math.inf))
+_BETA_ASSESSMENTS: Final = ('Low volatility (Defensive)', 'Moderate volatility', 'High volatility (Aggressive)')
+_BETA_INTERPRETATION_EDGES: Final = (0.8, math.nextafter(1.5, math.inf))
+_BETA_INTERPRETATIONS: Final = ("Low volatility", "Moderate volatility", "High volatility")
+_COMPETITIVE_POSITION_EDGES: Final = tuple(math.nextafter(edge, math.inf) for edge in (2e9, 10e9, 100e9))
+_COMPETITIVE_POSITIONS: Final = (
+    "Smaller player with niche opportunities",
+    "Growing company with emerging market presence",
+    "Established player with solid market position",
+    "Market leader with significant competitive advantages"
+)
+# DCF assumptions by company size as (5-year growth, terminal growth, discount rate)
+_DCF_SIZE_EDGES: Final = tuple(math.nextafter(edge, math.inf) for edge in (10e9, 200e9, 1e12))
+_DCF_ASSUMPTIONS: Final = (
+    (0.12, 0.04, 0.12),   # Small-cap
+    (0.10, 0.035, 0.10),  # Mid-cap ($10B+)
+    (0.08, 0.03, 0.09),   # Large-cap ($200B+)
+    (0.06, 0.025, 0.08)   # Mega-cap (>$1T)
+)
+# The same assumptions as displayed in the DCF result
+_DCF_ASSUMPTION_TEXT: Final = tuple(
+    {'growth_rate_5y': f"{growth:.1%}", 'terminal_growth_rate': f"{terminal:.1%}", 'discount_rate': f"{discount:.1%}"}
+    for growth, terminal, discount in _DCF_ASSUMPTIONS
+)
+# Per-band compounding factors for years 1..5, built year by year like the dcf_projection kernel
+_DCF_ASSUMPTION_ARRAY: Final = np.array(_DCF_ASSUMPTIONS)
+_DCF_GROWTH_FACTORS: Final = np.cumprod(np.repeat(1.0 + _DCF_ASSUMPTION_ARRAY[:, :1], 5, axis=1), axis=1)
+_DCF_DISCOUNT_FACTORS: Final = np.cumprod(np.repeat(1.0 + _DCF_ASSUMPTION_ARRAY[:, 2:], 5, axis=1), axis=1)
+# Standard deviations of the sampled DCF assumptions, and the minimum discount-over-terminal spread
+_MC_GROWTH_STD: Final = 0.02
+_MC_TERMINAL_GROWTH_STD: Final = 0.005
+_MC_DISCOUNT_STD: Final = 0.015
+_MC_MIN_SPREAD: Final = 0.01
+# WACC capital structure by company size as (debt-to-equity, credit spread)
+_WACC_SIZE_EDGES: Final = tuple(math.nextafter(edge, math.inf) for edge in (10e9, 50e9))
+_WACC_CAPITAL_STRUCTURE: Final = ((0.2, 0.05), (0.25, 0.03), (0.3, 0.02))
+# Market cap display units as (divisor, suffix), one per edge above the plain-dollar band
+_MCAP_DISPLAY_EDGES: Final = tuple(math.nextafter(edge, math.inf) for edge in (1e6, 1e9, 1e12))
+_MCAP_DISPLAY_UNITS: Final = ((1e6, "M"), (1e9, "B"), (1e12, "T"))
+_SOA_FIELDS: Final = ('pe_ratio', 'beta', 'market_cap', 'current_price')
+_DCF_SOA_FIELDS: Final = ('eps', 'market_cap', 'current_price')
+
+_SECTOR_OUTLOOKS: Final = {
+    'Technology': 'Positive long-term growth driven by digital transformation',
+    'Healthcare': 'Stable growth supported by aging demographics',
+    'Financial Services': 'Cyclical performance tied to interest rates',
+    'Consumer Discretionary': 'Sensitive to economic cycles and consumer spending',
+    'Consumer Staples': 'Defensive characteristics with steady demand',
+    'Energy': 'Volatile sector dependent on commodity prices',
+    'Industrials': 'Cyclical growth tied to economic expansion',
+    'Materials': 'Commodity-dependent with cyclical patterns',
+    'Real Estate': 'Interest rate sensitive with income generation',
+    'Utilities': 'Defensive sector with stable dividend yields',
+    'Communication Services': 'Mixed growth driven by media and telecom trends'
+}
+
+# DCF assessment -> (recommendation changes, multiple of DCF fair value, bound on the P/E price target)
+_DCF_ADJUSTMENTS: Final = {
+    "Significantly Undervalued": ({"HOLD": "STRONG BUY", "BUY": "STRONG BUY", "SELL": "HOLD"}, 0.9, max),
+    "Undervalued": ({"HOLD": "BUY", "SELL": "HOLD"}, 0.95, max),
+    "Significantly Overvalued": ({"STRONG BUY": "HOLD", "BUY": "HOLD", "HOLD": "SELL"}, 1.1, min),
+    "Overvalued": ({"STRONG BUY": "BUY", "BUY": "HOLD"}, 1.05, min),
+}
+
+# _assess_fair_value label -> signal counted towards the overall valuation consensus
+_VALUATION_SIGNALS: Final = {
+    'Significantly Undervalued': 'undervalued',
+    'Undervalued': 'undervalued',
+    'Fair Value': 'fair',
+    'Overvalued': 'overvalued',
+    'Significantly Overvalued': 'overvalued'
+}
+
+# Shared read-only default for nested lookups, so a missing section doesn't allocate a new dict
+_EMPTY: Final[Mapping[str, Any]] = MappingProxyType({})
+
+# Fallback bullet lists when no rule fires
+_DEFAULT_HIGHLIGHTS: Final = (
+    "Rule-based analysis completed",
+    "Consider upgrading for AI-powered insights",
+    "Diversification recommended"
+)
+_DEFAULT_RISKS: Final = (
+    "General market volatility",
+    "Sector-specific risks",
+    "Economic cycle sensitivity"
+)
+_DEFAULT_CATALYSTS: Final = (
+    "Earnings growth acceleration",
+    "Market sentiment improvement",
+    "Sector rotation benefits"
+)
+
+# analyze_many cost model, measured on the free rules: analysing one stock in-process, unpickling one
+# result in the parent, and spawning a pool whose workers each re-import the analyzer
+_BATCH_MS_PER_STOCK: Final = 0.10
+_UNPICKLE_MS_PER_STOCK: Final = 0.07
+_POOL_STARTUP_MS: Final = 800.0
+
+# Industry average assumptions for comparative valuation
+_INDUSTRY_AVG_PE: Final = 20.0
+_INDUSTRY_AVG_PB: Final = 2.5
+_INDUSTRY_AVG_YIELD: Final = 0.025
+_INDUSTRY_AVG_YIELD_TEXT: Final = f"{_INDUSTRY_AVG_YIELD:.1%}"
+
+
+def _middle_band_label(edges: Tuple[float, float], labels: Tuple[str, str, str], value: float) -> str:
+    """Label for a low/middle/high rule; NaN fails both comparisons and lands in the middle."""
+    return labels[bisect_right(edges, value)] if value == value else labels[1]
+
+
+def _assess_fair_value(fair_value: float, current_price: float) -> str:
+    """Valuation label for a fair value estimate against the current price."""
+    # Kept as comparisons against price multiples rather than a bisect on fair/price,
+    # which would flip for a zero or negative price
+    if fair_value > current_price * 1.15:
+        return 'Significantly Undervalued'
+    elif fair_value > current_price * 1.05:
+        return 'Undervalued'
+    elif fair_value < current_price * 0.85:
+        return 'Significantly Overvalued'
+    elif fair_value < current_price * 0.95:
+        return 'Overvalued'
+    return 'Fair Value'
+
+
+def _above_band(edges: Tuple[float, ...], value: float) -> int:
+    """Band of an `x > edge` ladder over nextafter-nudged edges; NaN fails every comparison and lands in band 0."""
+    return bisect_right(edges, value) if value == value else 0
+
+
+# stock_data key -> _Inputs field
+_INPUT_FIELDS: Final = {
+    'symbol': 'symbol', 'company_name': 'company_name', 'sector': 'sector',
+    'current_price': 'current_price', 'pe_ratio': 'pe_ratio', 'eps': 'eps', 'market_cap': 'market_cap',
+    'beta': 'beta', 'dividend_yield': 'dividend_yield', 'pb_ratio': 'pb_ratio',
+    '52w_high': 'high_52w', '52w_low': 'low_52w'
+}
+
+
+@dataclass(slots=True, frozen=True)
+class _Inputs:
+    """stock_data read once for the rule helpers; field defaults are the values used for missing keys."""
+    symbol: str = ''
+    company_name: str = ''
+    sector: str = 'Unknown'
+    current_price: float = 0
+    pe_ratio: float = 0
+    eps: float = 0
+    market_cap: float = 0
+    beta: float = 0
+    dividend_yield: float = 0
+    pb_ratio: float = 0
+    high_52w: float = 0
+    low_52w: float = 0
+    # Keys absent from stock_data, for the few rules with a different default
+    missing: FrozenSet[str] = frozenset()
+    # Value types take part in equality so cached analyses keep e.g. 1 and 1.0 apart
+    types: Tuple[type, ...] = field(default=(), repr=False)
+
+    @classmethod
+    def from_dict(cls, stock_data: Dict[str, Any]) -> '_Inputs':
+        """Build from a stock_data dict."""
+        values = {name: stock_data[key] for key, name in _INPUT_FIELDS.items() if key in stock_data}
+        return cls(**values, missing=frozenset(_INPUT_FIELDS.keys() - stock_data.keys()),
+                   types=tuple(map(type, values.values())))
 
 class FreeStockAnalyzer:
-    """Free stock analyzer using Hugging Face models."""
+    """Free stock analyzer using rule-based fundamental analysis."""
     
-    def __init__(self):
-        self.logger = setup_logger()
-        self.hf_api_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
-        # Note: You can use Hugging Face models for free with their API
+    def __init__(self) -> None:
+        # Rule-based analysis is deterministic in its inputs, so repeat runs on the same snapshot
+        # (retries, regenerated decks) are served from a per-instance cache. Callers get a shallow
+        # copy; the nested dicts are shared and must be treated as read-only.
+        self._cached_rule_based_analysis = lru_cache(maxsize=512)(self._rule_based_analysis)
+        # WACC depends only on the size band and beta, so it is shared across stocks (typed, so a
+        # beta of 1 and 1.0 keep their own 'beta' assumption); the returned dict is read-only too.
+        self._cached_wacc_analysis = lru_cache(maxsize=256, typed=True)(self._wacc_analysis)
+        self.logger = logger
         
     def analyze_stock_free(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -28,130 +236,288 @@ class FreeStockAnalyzer:
         Uses rule-based analysis + financial calculations.
         """
         try:
-            self.logger.info(f"Starting free analysis for {stock_data.get('symbol', 'UNKNOWN')}")
+            self.logger.info("Starting free analysis for %s", stock_data.get('symbol', 'UNKNOWN'))
             
             # Rule-based analysis (completely free) - this now includes valuation analysis
-            analysis = self._rule_based_analysis(stock_data)
-            
-            # Get the valuation analysis that was already performed in _rule_based_analysis
-            valuation_analysis = analysis.get('valuation_analysis', {})
+            inputs = _Inputs.from_dict(stock_data)
+            analysis = dict(self._cached_rule_based_analysis(inputs))
+            analysis = self._complete_analysis(stock_data, inputs, analysis)
             
-            # Add comprehensive structure expected by presentation generator
-            analysis.update({
-                'analysis_date': datetime.now().isoformat(),
-                'ai_analysis': self._generate_detailed_analysis_text(stock_data, analysis),
-                'financial_ratios': self._calculate_basic_ratios(stock_data),
-                'valuation': valuation_analysis,  # This includes DCF and WACC
-                'investment_thesis': analysis.get('investment_thesis', ''),
-                'metrics': {
-                    'current_price': stock_data.get('current_price'),
-                    'market_cap': stock_data.get('market_cap'),
-                    'pe_ratio': stock_data.get('pe_ratio'),
-                    'eps': stock_data.get('eps'),
-                    '52w_high': stock_data.get('52w_high'),
-                    '52w_low': stock_data.get('52w_low'),
-                    'dividend_yield': stock_data.get('dividend_yield'),
-                    'beta': stock_data.get('beta')
-                },
-                'key_highlights': self._generate_key_highlights(stock_data, analysis),
-                'risks': self._identify_financial_risks(stock_data),
-                'recommendation': analysis.get('recommendation', 'HOLD'),
-                # Add DCF and WACC values to top level for easy access
-                'dcf_value': valuation_analysis.get('dcf_analysis', {}).get('fair_value', 0),
-                'wacc': valuation_analysis.get('wacc_analysis', {}).get('wacc_percentage', 0)
-            })
-            
-            self.logger.info(f"Free analysis completed for {stock_data.get('symbol', 'UNKNOWN')}")
+            self.logger.info("Free analysis completed for %s", stock_data.get('symbol', 'UNKNOWN'))
             return analysis
             
         except Exception as e:
-            self.logger.error(f"Error in free analysis: {str(e)}")
+            self.logger.error("Error in free analysis: %s", e)
             return self._fallback_analysis(stock_data)
     
-    def _rule_based_analysis(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate comprehensive analysis using financial rules (no AI needed)."""
-        
-        current_price = stock_data.get('current_price', 0)
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        market_cap = stock_data.get('market_cap', 0)
-        beta = stock_data.get('beta', 0)
-        dividend_yield = stock_data.get('dividend_yield', 0)
-        eps = stock_data.get('eps', 0)
-        
-        # Enhanced valuation rules with DCF integration
-        basic_recommendation = "HOLD"
-        basic_valuation = "Fair value"
-        
-        # Basic P/E analysis
-        if pe_ratio and pe_ratio < 12:
-            basic_valuation = "Significantly undervalued"
-            basic_recommendation = "STRONG BUY"
-            price_target = current_price * 1.25  # 25% upside
-        elif pe_ratio and pe_ratio < 18:
-            basic_valuation = "Moderately undervalued"
-            basic_recommendation = "BUY"
-            price_target = current_price * 1.15  # 15% upside
-        elif pe_ratio and pe_ratio > 35:
-            basic_valuation = "Significantly overvalued"
-            basic_recommendation = "SELL"
-            price_target = current_price * 0.85  # 15% downside
-        elif pe_ratio and pe_ratio > 25:
-            basic_valuation = "Moderately overvalued"
-            basic_recommendation = "HOLD"
-            price_target = current_price * 0.95  # 5% downside
+    def analyze_stocks_batch(self, stocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Perform free stock analysis for a list of stocks (e.g. a watchlist).
+        P/E valuation and risk rules are evaluated for all stocks at once on
+        NumPy columns; each result matches analyze_stock_free for that stock.
+        """
+        self.logger.info("Starting free batch analysis for %d stocks", len(stocks))
+        results = []
+        
+        for stock_data, classified in zip(stocks, self._rule_based_analysis_batch(stocks)):
+            if classified is None:
+                # Non-numeric inputs take the scalar path so error handling stays identical
+                results.append(self.analyze_stock_free(stock_data))
+                continue
+            try:
+                inputs = _Inputs.from_dict(stock_data)
+                analysis = dict(self._cached_rule_based_analysis(inputs, *classified))
+                results.append(self._complete_analysis(stock_data, inputs, analysis))
+            except Exception as e:
+                self.logger.error("Error in free analysis: %s", e)
+                results.append(self._fallback_analysis(stock_data))
+        
+        self.logger.info("Free batch analysis completed for %d stocks", len(stocks))
+        return results
+    
+    def analyze_many(self, stocks: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Perform free stock analysis for a large list of stocks across worker processes.
+        
+        Args:
+            stocks: List of stock_data dicts
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            One analysis per stock, in input order, as from analyze_stocks_batch
+        """
+        cpus = os.cpu_count() or 1
+        workers = workers or cpus
+        # Workers take (1 - 1/workers) of the analysis off the parent, which still unpickles every result.
+        # That only beats the pool startup for very large batches: ~46k stocks at 8 workers, ~160k at 4,
+        # never at 3 or fewer. A single CPU just time-slices the workers, so it always stays in-process.
+        saving_ms = len(stocks) * (_BATCH_MS_PER_STOCK * (1 - 1 / workers) - _UNPICKLE_MS_PER_STOCK)
+        if workers == 1 or cpus < 2 or saving_ms <= _POOL_STARTUP_MS:
+            return self.analyze_stocks_batch(stocks)
+        
+        # Workers run analyze_stocks_batch on contiguous chunks so the vectorized rules still apply
+        chunksize = max(1, len(stocks) // (4 * workers))
+        chunks = [stocks[i:i + chunksize] for i in range(0, len(stocks), chunksize)]
+        # Spawned rather than forked: forking after Numba has started its parallel
+        # threading layer (dcf_scenarios) leaves the parent hanging at exit
+        context = multiprocessing.get_context('spawn')
+        # Workers log to the file through this process, which alone writes and rotates it
+        log_queue = context.Queue()
+        listener = listen_for_workers(log_queue)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(log_queue,)) as executor:
+                return [analysis for chunk in executor.map(_analyze_chunk, chunks) for analysis in chunk]
+        finally:
+            listener.stop()
+    
+    def dcf_fair_values(self, stocks: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        DCF fair value per share for a universe of stocks, e.g. to screen before full analysis.
+        
+        Args:
+            stocks: List of stock_data dicts
+            
+        Returns:
+            Float64 array of fair values in input order, matching the per-stock DCF 'fair_value'
+            (NaN where that would be a non-numeric current price)
+        """
+        soa = self._build_soa(stocks, _DCF_SOA_FIELDS)
+        eps, market_cap, current_price = soa['eps'], soa['market_cap'], soa['current_price']
+        
+        size_band = np.searchsorted(_DCF_SIZE_EDGES, market_cap, side='right')
+        size_band[np.isnan(market_cap)] = 0
+        _, terminal_growth, discount = _DCF_ASSUMPTION_ARRAY[size_band].T
+        
+        # Years 1..5 as columns
+        projected = eps[:, None] * _DCF_GROWTH_FACTORS[size_band]
+        factor = _DCF_DISCOUNT_FACTORS[size_band]
+        terminal_value = projected[:, -1] * (1.0 + terminal_growth) / (discount - terminal_growth)
+        fair_value = (projected / factor).sum(axis=1) + terminal_value / factor[:, -1]
+        
+        # The per-stock DCF returns the current price without EPS or when the inputs aren't numbers
+        fallback = np.array([
+            not stock.get('eps') or not all(isinstance(stock.get(key, 0), (int, float)) for key in ('eps', 'market_cap'))
+            for stock in stocks
+        ], dtype=bool)
+        return np.where(fallback, current_price, fair_value)
+    
+    def dcf_monte_carlo(self, stock_data: Dict[str, Any], n_paths: int = 100_000,
+                        seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Monte Carlo sensitivity of the DCF fair value to its growth, terminal growth and discount assumptions.
+        
+        Args:
+            stock_data: Stock data dict, as for analyze_stock_free
+            n_paths: Number of sampled assumption sets
+            seed: Seed for reproducible sampling
+            
+        Returns:
+            Mean, median and 5th/95th percentile fair values, or an error status
+        """
+        try:
+            inputs = _Inputs.from_dict(stock_data)
+            eps = inputs.eps
+            current_price = inputs.current_price
+            
+            if not eps:
+                return {
+                    'method': 'DCF Monte Carlo',
+                    'status': 'Insufficient data'
+                }
+            
+            # Sample around the point-estimate assumptions for the company's size band
+            growth_rate_5y, terminal_growth_rate, discount_rate = _DCF_ASSUMPTIONS[_above_band(_DCF_SIZE_EDGES, inputs.market_cap)]
+            rng = np.random.default_rng(seed)
+            growth = rng.normal(growth_rate_5y, _MC_GROWTH_STD, n_paths)
+            terminal_growth = np.clip(rng.normal(terminal_growth_rate, _MC_TERMINAL_GROWTH_STD, n_paths), 0.0, None)
+            # Keep the discount rate above terminal growth so the terminal value stays finite
+            discount = np.maximum(rng.normal(discount_rate, _MC_DISCOUNT_STD, n_paths), terminal_growth + _MC_MIN_SPREAD)
+            
+            fair_value = dcf_paths(float(eps), growth, terminal_growth, discount, 5)
+            percentile_5, median, percentile_95 = np.percentile(fair_value, [5, 50, 95]).tolist()
+            
+            return {
+                'method': 'DCF Monte Carlo',
+                'paths': n_paths,
+                'mean_fair_value': float(fair_value.mean()),
+                'median_fair_value': median,
+                'percentile_5': percentile_5,
+                'percentile_95': percentile_95,
+                'current_price': current_price,
+                'probability_undervalued': float((fair_value > current_price).mean()),
+                'status': 'Completed'
+            }
+            
+        except Exception as e:
+            self.logger.error("Error in DCF Monte Carlo: %s", e)
+            return {
+                'method': 'DCF Monte Carlo',
+                'status': f'Error: {str(e)}'
+            }
+    
+    @staticmethod
+    def _build_soa(stocks: List[Dict[str, Any]], fields: Tuple[str, ...] = _SOA_FIELDS) -> Dict[str, np.ndarray]:
+        """Struct-of-arrays view of the rule inputs; missing keys are 0, non-numeric values NaN."""
+        return {
+            field: np.array([
+                value if isinstance(value, (int, float)) else np.nan
+                for value in (stock.get(field, 0) for stock in stocks)
+            ], dtype=np.float64)
+            for field in fields
+        }
+    
+    def _rule_based_analysis_batch(self, stocks: List[Dict[str, Any]]) -> List[Optional[Tuple[Tuple[str, str, float], str]]]:
+        """Vectorized P/E bucket, price target and risk level; None marks stocks needing the scalar path."""
+        soa = self._build_soa(stocks)
+        pe_ratio, beta = soa['pe_ratio'], soa['beta']
+        market_cap, current_price = soa['market_cap'], soa['current_price']
+        
+        valuation_code = np.searchsorted(_PE_EDGES, pe_ratio, side='right')
+        valuation_code[pe_ratio == 0] = _FAIR_VALUE
+        price_target = current_price * np.choose(valuation_code, [bucket[2] for bucket in _VALUATION_BUCKETS])
+        
+        risk_factors = (
+            np.searchsorted(_BETA_RISK_EDGES, beta, side='left')
+            + np.searchsorted(_PE_RISK_EDGES, pe_ratio, side='left')
+            + len(_MCAP_RISK_EDGES) - np.searchsorted(_MCAP_RISK_EDGES, market_cap, side='right')
+        )
+        risk_code = np.searchsorted(_RISK_SCORE_EDGES, risk_factors, side='right')
+        
+        vectorizable = np.isfinite(pe_ratio) & np.isfinite(beta) & np.isfinite(market_cap) & np.isfinite(current_price)
+        
+        return [
+            ((_VALUATION_BUCKETS[code][0], _VALUATION_BUCKETS[code][1], target), _RISK_LEVELS[risk]) if ok else None
+            for code, target, risk, ok in zip(valuation_code.tolist(), price_target.tolist(), risk_code.tolist(), vectorizable.tolist())
+        ]
+    
+    def _complete_analysis(self, stock_data: Dict[str, Any], inputs: _Inputs, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the full data structure expected by the presentation generator."""
+        # Get the valuation analysis that was already performed in _rule_based_analysis
+        valuation_analysis = analysis.get('valuation_analysis', {})
+        
+        ratios, highlights, risks = self._classify_all(inputs)
+        
+        # Add comprehensive structure expected by presentation generator
+        analysis.update({
+            'analysis_date': datetime.now().isoformat(),
+            'ai_analysis': self._generate_detailed_analysis_text(inputs, analysis),
+            'financial_ratios': ratios,
+            'valuation': valuation_analysis,  # This includes DCF and WACC
+            'investment_thesis': analysis.get('investment_thesis', ''),
+            'metrics': {
+                'current_price': stock_data.get('current_price'),
+                'market_cap': stock_data.get('market_cap'),
+                'pe_ratio': stock_data.get('pe_ratio'),
+                'eps': stock_data.get('eps'),
+                '52w_high': stock_data.get('52w_high'),
+                '52w_low': stock_data.get('52w_low'),
+                'dividend_yield': stock_data.get('dividend_yield'),
+                'beta': stock_data.get('beta')
+            },
+            'key_highlights': highlights,
+            'risks': risks,
+            'recommendation': analysis.get('recommendation', 'HOLD'),
+            # Add DCF and WACC values to top level for easy access
+            'dcf_value': valuation_analysis.get('dcf_analysis', _EMPTY).get('fair_value', 0),
+            'wacc': valuation_analysis.get('wacc_analysis', _EMPTY).get('wacc_percentage', 0)
+        })
+        
+        return analysis
+    
+    def _rule_based_analysis(self, inputs: _Inputs, classification: Optional[Tuple[str, str, float]] = None,
+                             risk_level: Optional[str] = None) -> Dict[str, Any]:
+        """Generate comprehensive analysis using financial rules (no AI needed).
+        
+        classification and risk_level may be supplied precomputed by _rule_based_analysis_batch.
+        """
+        
+        current_price = inputs.current_price
+        pe_ratio = inputs.pe_ratio
+        market_cap = inputs.market_cap
+        beta = inputs.beta
+        dividend_yield = inputs.dividend_yield
+        eps = inputs.eps
+        
+        # Basic P/E analysis; a missing P/E is treated as fair value
+        if classification is not None:
+            basic_valuation, basic_recommendation, price_target = classification
         else:
-            basic_valuation = "Fair value"
-            basic_recommendation = "HOLD"
-            price_target = current_price * 1.05  # 5% upside
+            band = bisect_right(_PE_EDGES, pe_ratio) if pe_ratio and not math.isnan(pe_ratio) else _FAIR_VALUE
+            basic_valuation, basic_recommendation, multiple = _VALUATION_BUCKETS[band]
+            price_target = current_price * multiple
         
         # Perform valuation analysis first to get DCF insights
-        valuation_analysis = self._perform_basic_valuation(stock_data)
+        valuation_analysis = self._perform_basic_valuation(inputs)
         
         # Integrate DCF analysis into recommendation
         final_recommendation = basic_recommendation
         final_valuation = basic_valuation
         
-        dcf_analysis = valuation_analysis.get('dcf_analysis', {})
+        dcf_analysis = valuation_analysis.get('dcf_analysis', _EMPTY)
         if dcf_analysis.get('status') == 'Completed':
             dcf_assessment = dcf_analysis.get('assessment', '')
             dcf_fair_value = dcf_analysis.get('fair_value', current_price)
             
-            # Adjust recommendation based on DCF
-            if dcf_assessment == "Significantly Undervalued":
-                if basic_recommendation in ["HOLD", "BUY"]:
-                    final_recommendation = "STRONG BUY"
-                elif basic_recommendation == "SELL":
-                    final_recommendation = "HOLD"  # DCF suggests undervaluation
-                price_target = max(price_target, dcf_fair_value * 0.9)  # Use 90% of DCF value as target
-            elif dcf_assessment == "Undervalued":
-                if basic_recommendation == "HOLD":
-                    final_recommendation = "BUY"
-                elif basic_recommendation == "SELL":
-                    final_recommendation = "HOLD"
-                price_target = max(price_target, dcf_fair_value * 0.95)
-            elif dcf_assessment == "Significantly Overvalued":
-                if basic_recommendation in ["STRONG BUY", "BUY"]:
-                    final_recommendation = "HOLD"
-                elif basic_recommendation == "HOLD":
-                    final_recommendation = "SELL"
-                price_target = min(price_target, dcf_fair_value * 1.1)
-            elif dcf_assessment == "Overvalued":
-                if basic_recommendation == "STRONG BUY":
-                    final_recommendation = "BUY"
-                elif basic_recommendation == "BUY":
-                    final_recommendation = "HOLD"
-                price_target = min(price_target, dcf_fair_value * 1.05)
+            # Adjust recommendation and cap the price target based on DCF
+            adjustment = _DCF_ADJUSTMENTS.get(dcf_assessment)
+            if adjustment is not None:
+                recommendation_changes, fair_value_multiple, bound = adjustment
+                final_recommendation = recommendation_changes.get(basic_recommendation, basic_recommendation)
+                price_target = bound(price_target, dcf_fair_value * fair_value_multiple)
+        
+        target_price = round(price_target, 2) if price_target else current_price
         
         # Generate comprehensive analysis structure
         return {
-            'symbol': stock_data.get('symbol', ''),
-            'company_name': stock_data.get('company_name', ''),
+            'symbol': inputs.symbol,
+            'company_name': inputs.company_name,
             'current_price': current_price,
-            'target_price': round(price_target, 2) if price_target else current_price,
-            'price_target_12m': round(price_target, 2) if price_target else current_price,
+            'target_price': target_price,
+            'price_target_12m': target_price,
             'valuation_assessment': final_valuation,
             'recommendation': final_recommendation,
-            'investment_thesis': self._generate_investment_thesis(stock_data, final_valuation, final_recommendation),
+            'investment_thesis': self._generate_investment_thesis(inputs, final_valuation, final_recommendation),
             'key_metrics': {
                 'pe_ratio': pe_ratio,
                 'market_cap': market_cap,
@@ -159,33 +525,21 @@ class FreeStockAnalyzer:
                 'dividend_yield': dividend_yield,
                 'eps': eps,
                 'current_price': current_price,
-                'price_performance': self._calculate_price_performance(stock_data)
+                'price_performance': self._calculate_price_performance(inputs)
             },
             'analysis_type': 'Rule-based Fundamental Analysis (Free)',
             'analyst_rating': final_recommendation,
             'upside_potential': f"{((price_target - current_price) / current_price * 100):.1f}%" if price_target and current_price else "N/A",
             'investment_horizon': "12 months",
-            'risk_level': self._assess_risk_level(stock_data),
-            'sector_outlook': self._generate_sector_outlook(stock_data),
-            'key_catalysts': self._identify_catalysts(stock_data),
-            'competitive_position': self._assess_competitive_position(stock_data),
-            'financial_strength': self._assess_financial_strength(stock_data),
-            'growth_prospects': self._assess_growth_prospects(stock_data),
+            'risk_level': risk_level or self._assess_risk_level(inputs),
+            'sector_outlook': self._generate_sector_outlook(inputs),
+            'key_catalysts': self._identify_catalysts(inputs),
+            'competitive_position': self._assess_competitive_position(inputs),
+            'financial_strength': self._assess_financial_strength(inputs),
+            'growth_prospects': self._assess_growth_prospects(inputs),
             'valuation_analysis': valuation_analysis  # Include the detailed valuation analysis
         }
     
-    def _generate_basic_summary(self, stock_data: Dict[str, Any]) -> str:
-        """Generate a basic summary without premium AI."""
-        company = stock_data.get('company_name', 'Company')
-        sector = stock_data.get('sector', 'Unknown')
-        
-        return f"""
-        {company} operates in the {sector} sector. 
-        Based on current financial metrics, the stock shows standard market characteristics.
-        This analysis is based on quantitative rules and publicly available financial data.
-        For more detailed AI-powered insights, consider upgrading to the premium OpenAI-powered analysis.
-        """
-    
     def _fallback_analysis(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback analysis if everything else fails."""
         return {
@@ -196,30 +550,35 @@ class FreeStockAnalyzer:
             'note': 'Limited analysis available. Consider premium features for detailed insights.'
         }
 
-    def _generate_detailed_analysis_text(self, stock_data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
+    def _generate_detailed_analysis_text(self, inputs: _Inputs, analysis: Dict[str, Any]) -> str:
         """Generate detailed analysis text for the presentation."""
-        symbol = stock_data.get('symbol', '')
-        company_name = stock_data.get('company_name', '')
-        current_price = stock_data.get('current_price', 0)
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        market_cap = stock_data.get('market_cap', 0)
+        symbol = inputs.symbol
+        company_name = inputs.company_name
+        current_price = inputs.current_price
+        pe_ratio = inputs.pe_ratio
+        market_cap = inputs.market_cap
         target_price = analysis.get('target_price', current_price)
+        recommendation = analysis.get('recommendation', 'HOLD')
+        beta = 'N/A' if 'beta' in inputs.missing else inputs.beta
+        # Values quoted twice in the text are formatted once
+        target_price_text = f"{target_price:.2f}"
+        pe_ratio_text = f"{pe_ratio:.2f}"
         
         return f"""
         # {company_name} ({symbol}) - Investment Analysis
         
         ## Executive Summary
-        {company_name} presents a {analysis.get('recommendation', 'HOLD').lower()} opportunity with our 12-month price target of ${target_price:.2f}, representing {analysis.get('upside_potential', 'N/A')} potential upside from current levels.
+        {company_name} presents a {recommendation.lower()} opportunity with our 12-month price target of ${target_price_text}, representing {analysis.get('upside_potential', 'N/A')} potential upside from current levels.
         
         ## Current Market Position
         - **Current Price**: ${current_price:.2f}
         - **Market Capitalization**: ${market_cap:,.0f} ({self._format_market_cap(market_cap)})
-        - **P/E Ratio**: {pe_ratio:.2f}x
+        - **P/E Ratio**: {pe_ratio_text}x
         - **Risk Level**: {analysis.get('risk_level', 'MODERATE')}
         
         ## Valuation Assessment
         Our analysis indicates the stock is **{analysis.get('valuation_assessment', 'fairly valued')}** based on:
-        - Price-to-earnings ratio of {pe_ratio:.2f}x vs sector average
+        - Price-to-earnings ratio of {pe_ratio_text}x vs sector average
         - {analysis.get('financial_strength', 'Moderate financial strength')}
         - {analysis.get('competitive_position', 'Established market position')}
         
@@ -227,15 +586,15 @@ class FreeStockAnalyzer:
         {analysis.get('investment_thesis', 'Standard investment profile with balanced risk-return characteristics.')}
         
         ## Key Investment Highlights
-        - **Recommendation**: {analysis.get('recommendation', 'HOLD')}
-        - **Price Target**: ${target_price:.2f} (12-month)
+        - **Recommendation**: {recommendation}
+        - **Price Target**: ${target_price_text} (12-month)
         - **Investment Horizon**: {analysis.get('investment_horizon', '12 months')}
         - **Sector Outlook**: {analysis.get('sector_outlook', 'Sector-specific dynamics apply')}
         
         ## Financial Metrics Summary
-        - **Beta**: {stock_data.get('beta', 'N/A')} ({self._interpret_beta(stock_data.get('beta', 0))})
-        - **Dividend Yield**: {stock_data.get('dividend_yield', 0):.2%}
-        - **52-Week Range**: ${stock_data.get('52w_low', 0):.2f} - ${stock_data.get('52w_high', 0):.2f}
+        - **Beta**: {beta} ({self._interpret_beta(inputs.beta)})
+        - **Dividend Yield**: {inputs.dividend_yield:.2%}
+        - **52-Week Range**: ${inputs.low_52w:.2f} - ${inputs.high_52w:.2f}
         
         ## Growth Prospects
         {analysis.get('growth_prospects', 'Balanced growth profile with moderate expansion expected.')}
@@ -246,60 +605,98 @@ class FreeStockAnalyzer:
         - **Mitigation**: Diversification recommended, position sizing appropriate to risk tolerance
         
         ## Analyst Recommendation
-        **{analysis.get('recommendation', 'HOLD')}** - Based on fundamental analysis of financial metrics, valuation parameters, and market positioning.
+        **{recommendation}** - Based on fundamental analysis of financial metrics, valuation parameters, and market positioning.
         
         *This analysis is generated using rule-based fundamental analysis. For enhanced AI-powered insights including sentiment analysis, technical indicators, and market dynamics, consider upgrading to our premium OpenAI-powered analysis.*
         """
 
-    def _calculate_basic_ratios(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate basic financial ratios."""
-        ratios = {}
-        
-        # P/E Ratio
-        pe_ratio = stock_data.get('pe_ratio', 0)
+    def _classify_all(self, inputs: _Inputs) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        """Calculate basic ratios, key highlights and financial risks in one pass over the inputs."""
+        ratios: Dict[str, Any] = {}
+        highlights: List[str] = []
+        
+        current_price = inputs.current_price
+        high_52w = inputs.high_52w
+        low_52w = inputs.low_52w
+        pe_ratio = inputs.pe_ratio
+        pb_ratio = inputs.pb_ratio
+        market_cap = inputs.market_cap
+        dividend_yield = inputs.dividend_yield
+        beta = inputs.beta
+        
+        # Each risk is kept in its own slot so the risk list keeps its original order
+        pe_risk = beta_risk = dividend_risk = market_cap_risk = price_risk = None
+        
+        # Price position in the 52-week range
+        if current_price and high_52w:
+            if low_52w:
+                position_in_range = (current_price - low_52w) / (high_52w - low_52w)
+                if position_in_range < 0.3:
+                    highlights.append(f"Trading near 52-week low (${low_52w:.2f})")
+                elif position_in_range > 0.7:
+                    highlights.append(f"Trading near 52-week high (${high_52w:.2f})")
+            if (current_price / high_52w) > 0.95:
+                price_risk = "Trading near 52-week high - limited upside potential"
+        
+        # P/E ratio
         if pe_ratio:
             ratios['pe_ratio'] = pe_ratio
+            ratios['pe_assessment'] = _middle_band_label(_PE_ASSESSMENT_EDGES, _PE_ASSESSMENTS, pe_ratio)
             if pe_ratio < 15:
-                ratios['pe_assessment'] = 'Low (Potentially undervalued)'
+                highlights.append(f"Low P/E ratio of {pe_ratio:.1f} suggests potential value")
             elif pe_ratio > 30:
-                ratios['pe_assessment'] = 'High (Potentially overvalued)'
-            else:
-                ratios['pe_assessment'] = 'Moderate (Fair value)'
+                highlights.append(f"High P/E ratio of {pe_ratio:.1f} indicates growth premium")
+                if pe_ratio > 40:
+                    pe_risk = "High P/E ratio suggests elevated valuation risk"
         
         # Price-to-Book (if available)
-        pb_ratio = stock_data.get('pb_ratio', 0)
         if pb_ratio:
             ratios['pb_ratio'] = pb_ratio
             ratios['pb_assessment'] = 'Low' if pb_ratio < 1.5 else 'High'
         
-        # Dividend Yield
-        dividend_yield = stock_data.get('dividend_yield', 0)
+        # Market cap
+        if market_cap:
+            if market_cap > 10e9:  # $10B+
+                highlights.append("Large-cap stock with established market presence")
+            elif market_cap > 2e9:  # $2B+
+                highlights.append("Mid-cap stock with growth potential")
+            else:
+                highlights.append("Small-cap stock with higher growth/risk profile")
+                if market_cap < 2e9:
+                    market_cap_risk = "Small market cap increases liquidity and volatility risks"
+        
+        # Dividend yield; low/no yield is a risk for income investors
         if dividend_yield:
             ratios['dividend_yield'] = dividend_yield
             ratios['dividend_assessment'] = 'High' if dividend_yield > 0.03 else 'Low'
+            if dividend_yield > 0.02:
+                highlights.append(f"Dividend yield of {dividend_yield:.1%} provides income")
+        if not dividend_yield or dividend_yield < 0.01:
+            dividend_risk = "Low/no dividend yield - not suitable for income-focused portfolios"
         
         # Beta (volatility measure)
-        beta = stock_data.get('beta', 0)
         if beta:
             ratios['beta'] = beta
-            if beta < 1:
-                ratios['beta_assessment'] = 'Low volatility (Defensive)'
+            ratios['beta_assessment'] = _middle_band_label(_BETA_ASSESSMENT_EDGES, _BETA_ASSESSMENTS, beta)
+            if beta < 0.8:
+                highlights.append("Low beta suggests defensive characteristics")
             elif beta > 1.5:
-                ratios['beta_assessment'] = 'High volatility (Aggressive)'
-            else:
-                ratios['beta_assessment'] = 'Moderate volatility'
+                highlights.append("High beta indicates growth/cyclical nature")
+                beta_risk = "High beta indicates above-average market sensitivity"
         
-        return ratios
+        # Default highlights and risks if none generated
+        risks = [risk for risk in (pe_risk, beta_risk, dividend_risk, market_cap_risk, price_risk) if risk]
+        return ratios, highlights or list(_DEFAULT_HIGHLIGHTS), risks or list(_DEFAULT_RISKS)
 
-    def _perform_basic_valuation(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _perform_basic_valuation(self, inputs: _Inputs) -> Dict[str, Any]:
         """Perform comprehensive valuation analysis using multiple methods."""
-        current_price = stock_data.get('current_price', 0)
+        current_price = inputs.current_price
         
         # Run all valuation methods
-        dcf_valuation = self._calculate_dcf_valuation(stock_data)
-        wacc_analysis = self._calculate_wacc(stock_data)
-        financial_statement_analysis = self._analyze_financial_statements(stock_data)
-        comparative_valuation = self._calculate_comparative_valuation(stock_data)
+        dcf_valuation = self._calculate_dcf_valuation(inputs)
+        wacc_analysis = self._calculate_wacc(inputs)
+        financial_statement_analysis = self._analyze_financial_statements(inputs)
+        comparative_valuation = self._calculate_comparative_valuation(inputs)
         
         # Combine all valuation methods
         valuation = {
@@ -315,109 +712,12 @@ class FreeStockAnalyzer:
         
         return valuation
 
-    def _generate_key_highlights(self, stock_data: Dict[str, Any], analysis: Dict[str, Any]) -> list:
-        """Generate key highlights for the presentation."""
-        highlights = []
-        
-        # Price-based highlights
-        current_price = stock_data.get('current_price', 0)
-        high_52w = stock_data.get('52w_high', 0)
-        low_52w = stock_data.get('52w_low', 0)
-        
-        if current_price and high_52w and low_52w:
-            position_in_range = (current_price - low_52w) / (high_52w - low_52w)
-            if position_in_range < 0.3:
-                highlights.append(f"Trading near 52-week low (${low_52w:.2f})")
-            elif position_in_range > 0.7:
-                highlights.append(f"Trading near 52-week high (${high_52w:.2f})")
-        
-        # P/E ratio highlights
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        if pe_ratio:
-            if pe_ratio < 15:
-                highlights.append(f"Low P/E ratio of {pe_ratio:.1f} suggests potential value")
-            elif pe_ratio > 30:
-                highlights.append(f"High P/E ratio of {pe_ratio:.1f} indicates growth premium")
-        
-        # Market cap highlights
-        market_cap = stock_data.get('market_cap', 0)
-        if market_cap:
-            if market_cap > 10e9:  # $10B+
-                highlights.append("Large-cap stock with established market presence")
-            elif market_cap > 2e9:  # $2B+
-                highlights.append("Mid-cap stock with growth potential")
-            else:
-                highlights.append("Small-cap stock with higher growth/risk profile")
-        
-        # Dividend highlights
-        dividend_yield = stock_data.get('dividend_yield', 0)
-        if dividend_yield and dividend_yield > 0.02:
-            highlights.append(f"Dividend yield of {dividend_yield:.1%} provides income")
-        
-        # Volatility highlights
-        beta = stock_data.get('beta', 0)
-        if beta:
-            if beta < 0.8:
-                highlights.append("Low beta suggests defensive characteristics")
-            elif beta > 1.5:
-                highlights.append("High beta indicates growth/cyclical nature")
-        
-        # Default highlights if none generated
-        if not highlights:
-            highlights = [
-                "Rule-based analysis completed",
-                "Consider upgrading for AI-powered insights",
-                "Diversification recommended"
-            ]
-        
-        return highlights
-
-    def _identify_financial_risks(self, stock_data: Dict[str, Any]) -> list:
-        """Identify potential financial risks."""
-        risks = []
-        
-        # High P/E ratio risk
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        if pe_ratio and pe_ratio > 40:
-            risks.append("High P/E ratio suggests elevated valuation risk")
-        
-        # High volatility risk
-        beta = stock_data.get('beta', 0)
-        if beta and beta > 1.5:
-            risks.append("High beta indicates above-average market sensitivity")
-        
-        # Low dividend risk (for income investors)
-        dividend_yield = stock_data.get('dividend_yield', 0)
-        if not dividend_yield or dividend_yield < 0.01:
-            risks.append("Low/no dividend yield - not suitable for income-focused portfolios")
-        
-        # Market cap risks
-        market_cap = stock_data.get('market_cap', 0)
-        if market_cap and market_cap < 2e9:  # Less than $2B
-            risks.append("Small market cap increases liquidity and volatility risks")
-        
-        # Price position risks
-        current_price = stock_data.get('current_price', 0)
-        high_52w = stock_data.get('52w_high', 0)
-        if current_price and high_52w and (current_price / high_52w) > 0.95:
-            risks.append("Trading near 52-week high - limited upside potential")
-        
-        # Default risks if none identified
-        if not risks:
-            risks = [
-                "General market volatility",
-                "Sector-specific risks",
-                "Economic cycle sensitivity"
-            ]
-        
-        return risks
-
-    def _assess_financial_health(self, stock_data: Dict[str, Any]) -> str:
+    def _assess_financial_health(self, inputs: _Inputs) -> str:
         """Assess overall financial health."""
         health_factors = []
         
         # P/E ratio health
-        pe_ratio = stock_data.get('pe_ratio', 0)
+        pe_ratio = inputs.pe_ratio
         if pe_ratio and 10 <= pe_ratio <= 25:
             health_factors.append("reasonable")
         elif pe_ratio and pe_ratio < 10:
@@ -426,12 +726,12 @@ class FreeStockAnalyzer:
             health_factors.append("growth-oriented")
         
         # Market cap stability
-        market_cap = stock_data.get('market_cap', 0)
+        market_cap = inputs.market_cap
         if market_cap and market_cap > 10e9:
             health_factors.append("stable")
         
         # Dividend health
-        dividend_yield = stock_data.get('dividend_yield', 0)
+        dividend_yield = inputs.dividend_yield
         if dividend_yield and dividend_yield > 0.02:
             health_factors.append("income-generating")
         
@@ -440,13 +740,13 @@ class FreeStockAnalyzer:
         else:
             return "mixed financial characteristics"
 
-    def _generate_investment_thesis(self, stock_data: Dict[str, Any], valuation: str, recommendation: str) -> str:
+    def _generate_investment_thesis(self, inputs: _Inputs, valuation: str, recommendation: str) -> str:
         """Generate a compelling investment thesis."""
-        company_name = stock_data.get('company_name', 'Company')
-        symbol = stock_data.get('symbol', '')
-        current_price = stock_data.get('current_price', 0)
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        market_cap = stock_data.get('market_cap', 0)
+        company_name = 'Company' if 'company_name' in inputs.missing else inputs.company_name
+        symbol = inputs.symbol
+        current_price = inputs.current_price
+        pe_ratio = inputs.pe_ratio
+        market_cap = inputs.market_cap
         
         # Create a compelling thesis based on the data
         thesis_parts = []
@@ -478,11 +778,11 @@ class FreeStockAnalyzer:
         
         return f"{', '.join(thesis_parts)}. Our analysis suggests a {recommendation} rating based on fundamental metrics."
     
-    def _calculate_price_performance(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_price_performance(self, inputs: _Inputs) -> Dict[str, Any]:
         """Calculate price performance metrics."""
-        current_price = stock_data.get('current_price', 0)
-        high_52w = stock_data.get('52w_high', 0)
-        low_52w = stock_data.get('52w_low', 0)
+        current_price = inputs.current_price
+        high_52w = inputs.high_52w
+        low_52w = inputs.low_52w
         
         performance = {}
         
@@ -493,125 +793,70 @@ class FreeStockAnalyzer:
         
         return performance
 
-    def _assess_risk_level(self, stock_data: Dict[str, Any]) -> str:
+    def _assess_risk_level(self, inputs: _Inputs) -> str:
         """Assess overall risk level."""
-        risk_factors = 0
-        
-        # Beta risk
-        beta = stock_data.get('beta', 0)
-        if beta > 1.5:
-            risk_factors += 2
-        elif beta > 1.2:
-            risk_factors += 1
-        
-        # P/E ratio risk
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        if pe_ratio > 40:
-            risk_factors += 2
-        elif pe_ratio > 25:
-            risk_factors += 1
-        
-        # Market cap risk
-        market_cap = stock_data.get('market_cap', 0)
-        if market_cap < 2e9:  # < $2B
-            risk_factors += 2
-        elif market_cap < 10e9:  # < $10B
-            risk_factors += 1
-        
-        if risk_factors >= 4:
-            return "HIGH RISK"
-        elif risk_factors >= 2:
-            return "MODERATE RISK"
-        else:
-            return "LOW RISK"
+        risk_factors = (
+            bisect_left(_BETA_RISK_EDGES, inputs.beta)  # > 1.2, > 1.5
+            + bisect_left(_PE_RISK_EDGES, inputs.pe_ratio)  # > 25, > 40
+            + len(_MCAP_RISK_EDGES) - bisect_right(_MCAP_RISK_EDGES, inputs.market_cap)  # < $10B, < $2B
+        )
+        return _RISK_LEVELS[bisect_right(_RISK_SCORE_EDGES, risk_factors)]
 
-    def _generate_sector_outlook(self, stock_data: Dict[str, Any]) -> str:
+    def _generate_sector_outlook(self, inputs: _Inputs) -> str:
         """Generate sector outlook."""
-        sector = stock_data.get('sector', 'Unknown')
-        
-        sector_outlooks = {
-            'Technology': 'Positive long-term growth driven by digital transformation',
-            'Healthcare': 'Stable growth supported by aging demographics',
-            'Financial Services': 'Cyclical performance tied to interest rates',
-            'Consumer Discretionary': 'Sensitive to economic cycles and consumer spending',
-            'Consumer Staples': 'Defensive characteristics with steady demand',
-            'Energy': 'Volatile sector dependent on commodity prices',
-            'Industrials': 'Cyclical growth tied to economic expansion',
-            'Materials': 'Commodity-dependent with cyclical patterns',
-            'Real Estate': 'Interest rate sensitive with income generation',
-            'Utilities': 'Defensive sector with stable dividend yields',
-            'Communication Services': 'Mixed growth driven by media and telecom trends'
-        }
-        
-        return sector_outlooks.get(sector, 'Sector-specific dynamics require careful analysis')
+        return _SECTOR_OUTLOOKS.get(inputs.sector, 'Sector-specific dynamics require careful analysis')
 
-    def _identify_catalysts(self, stock_data: Dict[str, Any]) -> list:
+    def _identify_catalysts(self, inputs: _Inputs) -> List[str]:
         """Identify potential catalysts."""
         catalysts = []
         
         # P/E-based catalysts
-        pe_ratio = stock_data.get('pe_ratio', 0)
+        pe_ratio = inputs.pe_ratio
         if pe_ratio and pe_ratio < 15:
             catalysts.append("Potential re-rating as market recognizes value")
         elif pe_ratio > 30:
             catalysts.append("Earnings growth needed to justify valuation")
         
         # Dividend catalysts
-        dividend_yield = stock_data.get('dividend_yield', 0)
+        dividend_yield = inputs.dividend_yield
         if dividend_yield and dividend_yield > 0.04:
             catalysts.append("Attractive dividend yield in low-rate environment")
         
         # Market cap catalysts
-        market_cap = stock_data.get('market_cap', 0)
+        market_cap = inputs.market_cap
         if market_cap and market_cap < 2e9:
             catalysts.append("Potential acquisition target")
         elif market_cap > 50e9:
             catalysts.append("Index inclusion and institutional buying")
         
         # Beta catalysts
-        beta = stock_data.get('beta', 0)
+        beta = inputs.beta
         if beta and beta < 0.8:
             catalysts.append("Defensive characteristics in volatile markets")
         
         # Default catalysts
-        if not catalysts:
-            catalysts = [
-                "Earnings growth acceleration",
-                "Market sentiment improvement",
-                "Sector rotation benefits"
-            ]
-        
-        return catalysts
+        return catalysts or list(_DEFAULT_CATALYSTS)
 
-    def _assess_competitive_position(self, stock_data: Dict[str, Any]) -> str:
+    def _assess_competitive_position(self, inputs: _Inputs) -> str:
         """Assess competitive position."""
-        market_cap = stock_data.get('market_cap', 0)
-        
-        if market_cap > 100e9:
-            return "Market leader with significant competitive advantages"
-        elif market_cap > 10e9:
-            return "Established player with solid market position"
-        elif market_cap > 2e9:
-            return "Growing company with emerging market presence"
-        else:
-            return "Smaller player with niche opportunities"
+        return _COMPETITIVE_POSITIONS[_above_band(_COMPETITIVE_POSITION_EDGES, inputs.market_cap)]
 
-    def _assess_financial_strength(self, stock_data: Dict[str, Any]) -> str:
+    def _assess_financial_strength(self, inputs: _Inputs) -> str:
         """Assess financial strength."""
         strength_score = 0
         
         # P/E ratio strength
-        pe_ratio = stock_data.get('pe_ratio', 0)
+        pe_ratio = inputs.pe_ratio
         if pe_ratio and 10 <= pe_ratio <= 20:
             strength_score += 1
         
         # Dividend strength
-        dividend_yield = stock_data.get('dividend_yield', 0)
+        dividend_yield = inputs.dividend_yield
         if dividend_yield and dividend_yield > 0.02:
             strength_score += 1
         
         # Market cap strength
-        market_cap = stock_data.get('market_cap', 0)
+        market_cap = inputs.market_cap
         if market_cap and market_cap > 10e9:
             strength_score += 1
         
@@ -622,10 +867,10 @@ class FreeStockAnalyzer:
         else:
             return "Moderate financial strength"
 
-    def _assess_growth_prospects(self, stock_data: Dict[str, Any]) -> str:
+    def _assess_growth_prospects(self, inputs: _Inputs) -> str:
         """Assess growth prospects."""
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        beta = stock_data.get('beta', 0)
+        pe_ratio = inputs.pe_ratio
+        beta = inputs.beta
         
         if pe_ratio and pe_ratio > 25:
             if beta and beta > 1.2:
@@ -639,29 +884,21 @@ class FreeStockAnalyzer:
     
     def _format_market_cap(self, market_cap: float) -> str:
         """Format market cap for display."""
-        if market_cap > 1e12:
-            return f"${market_cap/1e12:.1f}T"
-        elif market_cap > 1e9:
-            return f"${market_cap/1e9:.1f}B"
-        elif market_cap > 1e6:
-            return f"${market_cap/1e6:.1f}M"
-        else:
+        unit = _above_band(_MCAP_DISPLAY_EDGES, market_cap)
+        if not unit:
             return f"${market_cap:,.0f}"
+        divisor, suffix = _MCAP_DISPLAY_UNITS[unit - 1]
+        return f"${market_cap/divisor:.1f}{suffix}"
 
     def _interpret_beta(self, beta: float) -> str:
         """Interpret beta value."""
-        if beta < 0.8:
-            return "Low volatility"
-        elif beta > 1.5:
-            return "High volatility"
-        else:
-            return "Moderate volatility"
+        return _middle_band_label(_BETA_INTERPRETATION_EDGES, _BETA_INTERPRETATIONS, beta)
     
-    def _calculate_dcf_valuation(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_dcf_valuation(self, inputs: _Inputs) -> Dict[str, Any]:
         """Calculate Discounted Cash Flow (DCF) valuation."""
         try:
-            eps = stock_data.get('eps', 0)
-            current_price = stock_data.get('current_price', 0)
+            eps = inputs.eps
+            current_price = inputs.current_price
             
             if not eps:
                 return {
@@ -672,72 +909,32 @@ class FreeStockAnalyzer:
                 }
             
             # DCF assumptions - adjust based on company characteristics
-            market_cap = stock_data.get('market_cap', 0)
-            pe_ratio = stock_data.get('pe_ratio', 0)
-            
-            # Dynamic growth assumptions based on company size and valuation
-            if market_cap > 1e12:  # Mega-cap (>$1T)
-                growth_rate_5y = 0.06  # 6% growth for mega-cap
-                terminal_growth_rate = 0.025  # 2.5% terminal growth
-                discount_rate = 0.08  # 8% discount rate for stable mega-cap
-            elif market_cap > 200e9:  # Large-cap ($200B+)
-                growth_rate_5y = 0.08  # 8% growth for large-cap
-                terminal_growth_rate = 0.03  # 3% terminal growth
-                discount_rate = 0.09  # 9% discount rate
-            elif market_cap > 10e9:  # Mid-cap ($10B+)
-                growth_rate_5y = 0.10  # 10% growth for mid-cap
-                terminal_growth_rate = 0.035  # 3.5% terminal growth
-                discount_rate = 0.10  # 10% discount rate
-            else:  # Small-cap
-                growth_rate_5y = 0.12  # 12% growth for small-cap
-                terminal_growth_rate = 0.04  # 4% terminal growth
-                discount_rate = 0.12  # 12% discount rate for higher risk
+            market_cap = inputs.market_cap
+            pe_ratio = inputs.pe_ratio
             
-            # Calculate projected cash flows
-            projected_cashflows = []
-            current_cf = eps
+            # Dynamic growth assumptions based on company size
+            size_band = _above_band(_DCF_SIZE_EDGES, market_cap)
+            growth_rate_5y, terminal_growth_rate, discount_rate = _DCF_ASSUMPTIONS[size_band]
             
-            for year in range(1, 6):
-                future_cf = current_cf * (1 + growth_rate_5y) ** year
-                present_value = future_cf / (1 + discount_rate) ** year
-                projected_cashflows.append({
-                    'year': year,
-                    'projected_cf': future_cf,
-                    'present_value': present_value
-                })
+            # Projected cash flows, terminal value and their present values in one compiled pass
+            (future_cf_array, present_value_array, sum_pv_cashflows,
+             terminal_value, terminal_pv) = dcf_projection(eps, growth_rate_5y, terminal_growth_rate, discount_rate, 5)
             
-            # Terminal value calculation
-            terminal_cf = projected_cashflows[-1]['projected_cf'] * (1 + terminal_growth_rate)
-            terminal_value = terminal_cf / (discount_rate - terminal_growth_rate)
-            terminal_pv = terminal_value / (1 + discount_rate) ** 5
-            
-            # Sum all present values
-            sum_pv_cashflows = sum([cf['present_value'] for cf in projected_cashflows])
             dcf_fair_value = sum_pv_cashflows + terminal_pv
             
             # Calculate upside/downside
             upside_potential = ((dcf_fair_value - current_price) / current_price) * 100 if current_price > 0 else 0
             
             # Assessment
-            if dcf_fair_value > current_price * 1.15:
-                assessment = 'Significantly Undervalued'
-            elif dcf_fair_value > current_price * 1.05:
-                assessment = 'Undervalued'
-            elif dcf_fair_value < current_price * 0.85:
-                assessment = 'Significantly Overvalued'
-            elif dcf_fair_value < current_price * 0.95:
-                assessment = 'Overvalued'
-            else:
-                assessment = 'Fair Value'
+            assessment = _assess_fair_value(dcf_fair_value, current_price)
             
             return {
                 'method': 'DCF Analysis',
-                'assumptions': {
-                    'growth_rate_5y': f"{growth_rate_5y:.1%}",
-                    'terminal_growth_rate': f"{terminal_growth_rate:.1%}",
-                    'discount_rate': f"{discount_rate:.1%}"
-                },
-                'projected_cashflows': projected_cashflows,
+                'assumptions': dict(_DCF_ASSUMPTION_TEXT[size_band]),
+                'projected_cashflows': [
+                    {'year': year, 'projected_cf': future_cf, 'present_value': present_value}
+                    for year, future_cf, present_value in zip(range(1, 6), future_cf_array.tolist(), present_value_array.tolist())
+                ],
                 'terminal_value': terminal_value,
                 'terminal_pv': terminal_pv,
                 'sum_pv_cashflows': sum_pv_cashflows,
@@ -756,97 +953,187 @@ class FreeStockAnalyzer:
                 'assessment': 'Unable to calculate'
             }
 
-    def _calculate_wacc(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_wacc(self, inputs: _Inputs) -> Dict[str, Any]:
         """Calculate Weighted Average Cost of Capital (WACC)."""
         try:
-            market_cap = stock_data.get('market_cap', 0)
-            beta = stock_data.get('beta', 1.0)
+            beta = 1.0 if 'beta' in inputs.missing else inputs.beta
+            return self._cached_wacc_analysis(_above_band(_WACC_SIZE_EDGES, inputs.market_cap), beta)
             
-            # WACC calculation assumptions
-            risk_free_rate = 0.045  # 4.5% (10-year treasury)
-            market_risk_premium = 0.065  # 6.5% market risk premium
-            tax_rate = 0.25  # 25% corporate tax rate
+        except Exception as e:
+            return {
+                'method': 'WACC Analysis',
+                'status': f'Error: {str(e)}',
+                'wacc': 'Unable to calculate'
+            }
+
+    def _wacc_analysis(self, size_band: int, beta: float) -> Dict[str, Any]:
+        """WACC for a company size band and beta; everything else is a fixed assumption."""
+        # WACC calculation assumptions
+        risk_free_rate = 0.045  # 4.5% (10-year treasury)
+        market_risk_premium = 0.065  # 6.5% market risk premium
+        tax_rate = 0.25  # 25% corporate tax rate
+        
+        # Cost of equity using CAPM
+        cost_of_equity = capm_cost_of_equity(risk_free_rate, beta, market_risk_premium)
+        
+        # Estimate debt-to-equity ratio and credit spread based on company size
+        debt_to_equity, credit_spread = _WACC_CAPITAL_STRUCTURE[size_band]
+        
+        cost_of_debt = risk_free_rate + credit_spread
+        after_tax_cost_of_debt = cost_of_debt * (1 - tax_rate)
+        
+        # Calculate weights
+        equity_weight = 1 / (1 + debt_to_equity)
+        debt_weight = debt_to_equity / (1 + debt_to_equity)
+        
+        # Calculate WACC
+        wacc = weighted_cost_of_capital(cost_of_equity, after_tax_cost_of_debt, debt_to_equity)
+        
+        return {
+            'method': 'WACC Analysis',
+            'assumptions': {
+                'risk_free_rate': f"{risk_free_rate:.1%}",
+                'market_risk_premium': f"{market_risk_premium:.1%}",
+                'beta': beta,
+                'tax_rate': f"{tax_rate:.1%}",
+                'debt_to_equity': f"{debt_to_equity:.1%}"
+            },
+            'calculations': {
+                'cost_of_equity': f"{cost_of_equity:.1%}",
+                'cost_of_debt': f"{cost_of_debt:.1%}",
+                'after_tax_cost_of_debt': f"{after_tax_cost_of_debt:.1%}",
+                'equity_weight': f"{equity_weight:.1%}",
+                'debt_weight': f"{debt_weight:.1%}"
+            },
+            'wacc': f"{wacc:.1%}",
+            'wacc_decimal': wacc,
+            'interpretation': self._interpret_wacc(wacc),
+            'status': 'Completed'
+        }
+
+    def _analyze_financial_statements(self, inputs: _Inputs) -> Dict[str, Any]:
+        """Analyze financial statements and ratios, scoring all six areas in one pass over the inputs."""
+        try:
+            eps = inputs.eps
+            pe_ratio = inputs.pe_ratio
+            pb_ratio = inputs.pb_ratio
+            market_cap = inputs.market_cap
+            dividend_yield = inputs.dividend_yield
+            beta = 1.0 if 'beta' in inputs.missing else inputs.beta
+            
+            # Profitability
+            profitability_score = 0
+            if eps > 0:
+                profitability_score += 3
+                if eps > 2:
+                    profitability_score += 2
             
-            # Cost of equity using CAPM
-            cost_of_equity = risk_free_rate + (beta * market_risk_premium)
+            if pe_ratio > 0 and pe_ratio < 25:
+                profitability_score += 2
             
-            # Estimate debt-to-equity ratio based on company size
-            if market_cap > 50e9:
-                debt_to_equity = 0.3
-            elif market_cap > 10e9:
-                debt_to_equity = 0.25
+            # Liquidity
+            if market_cap > 10e9:
+                liquidity_score = 5
+            elif market_cap > 2e9:
+                liquidity_score = 3
             else:
-                debt_to_equity = 0.2
+                liquidity_score = 1
             
-            # Cost of debt
-            if market_cap > 50e9:
-                credit_spread = 0.02
-            elif market_cap > 10e9:
-                credit_spread = 0.03
+            # Leverage
+            if dividend_yield > 0.03:
+                leverage_score = 3
+            elif dividend_yield > 0.01:
+                leverage_score = 2
             else:
-                credit_spread = 0.05
+                leverage_score = 1
+            
+            if market_cap > 10e9:
+                leverage_score += 2
+            
+            # Efficiency
+            efficiency_score = 0
+            if pe_ratio > 0 and pe_ratio < 20:
+                efficiency_score += 3
+            elif pe_ratio > 0 and pe_ratio < 30:
+                efficiency_score += 2
+            
+            if 0.8 <= beta <= 1.2:
+                efficiency_score += 2
+            
+            # Valuation ratios
+            valuation_score = 0
+            if pe_ratio > 0:
+                if pe_ratio < 15:
+                    valuation_score += 3
+                elif pe_ratio < 25:
+                    valuation_score += 2
+                else:
+                    valuation_score += 1
             
-            cost_of_debt = risk_free_rate + credit_spread
-            after_tax_cost_of_debt = cost_of_debt * (1 - tax_rate)
+            if pb_ratio > 0:
+                if pb_ratio < 2:
+                    valuation_score += 2
+                elif pb_ratio < 3:
+                    valuation_score += 1
             
-            # Calculate weights
-            equity_weight = 1 / (1 + debt_to_equity)
-            debt_weight = debt_to_equity / (1 + debt_to_equity)
+            # Growth
+            growth_score = 0
+            if pe_ratio > 20:
+                growth_score += 2
+            elif pe_ratio > 15:
+                growth_score += 1
             
-            # Calculate WACC
-            wacc = (equity_weight * cost_of_equity) + (debt_weight * after_tax_cost_of_debt)
+            if market_cap < 10e9:
+                growth_score += 2
+            elif market_cap < 50e9:
+                growth_score += 1
+            
+            # Overall financial health score
+            score = profitability_score + liquidity_score + leverage_score + efficiency_score + valuation_score + growth_score
+            grade = self._assign_financial_grade(score)
             
             return {
-                'method': 'WACC Analysis',
-                'assumptions': {
-                    'risk_free_rate': f"{risk_free_rate:.1%}",
-                    'market_risk_premium': f"{market_risk_premium:.1%}",
+                'method': 'Financial Statement Analysis',
+                'profitability_analysis': {
+                    'eps': eps,
+                    'pe_ratio': pe_ratio,
+                    'profitability_score': profitability_score,
+                    'assessment': self._score_to_assessment(profitability_score, 5)
+                },
+                'liquidity_analysis': {
+                    'market_cap': market_cap,
+                    'liquidity_score': liquidity_score,
+                    'assessment': self._score_to_assessment(liquidity_score, 5)
+                },
+                'leverage_analysis': {
+                    'dividend_yield': dividend_yield,
+                    'leverage_score': leverage_score,
+                    'assessment': self._score_to_assessment(leverage_score, 5)
+                },
+                'efficiency_analysis': {
+                    'pe_ratio': pe_ratio,
                     'beta': beta,
-                    'tax_rate': f"{tax_rate:.1%}",
-                    'debt_to_equity': f"{debt_to_equity:.1%}"
+                    'efficiency_score': efficiency_score,
+                    'assessment': self._score_to_assessment(efficiency_score, 5)
                 },
-                'calculations': {
-                    'cost_of_equity': f"{cost_of_equity:.1%}",
-                    'cost_of_debt': f"{cost_of_debt:.1%}",
-                    'after_tax_cost_of_debt': f"{after_tax_cost_of_debt:.1%}",
-                    'equity_weight': f"{equity_weight:.1%}",
-                    'debt_weight': f"{debt_weight:.1%}"
+                'valuation_ratios': {
+                    'pe_ratio': pe_ratio,
+                    'pb_ratio': pb_ratio,
+                    'valuation_score': valuation_score,
+                    'assessment': self._score_to_assessment(valuation_score, 5)
                 },
-                'wacc': f"{wacc:.1%}",
-                'wacc_decimal': wacc,
-                'interpretation': self._interpret_wacc(wacc),
-                'status': 'Completed'
-            }
-            
-        except Exception as e:
-            return {
-                'method': 'WACC Analysis',
-                'status': f'Error: {str(e)}',
-                'wacc': 'Unable to calculate'
-            }
-
-    def _analyze_financial_statements(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze financial statements and ratios."""
-        try:
-            analysis = {
-                'method': 'Financial Statement Analysis',
-                'profitability_analysis': self._analyze_profitability(stock_data),
-                'liquidity_analysis': self._analyze_liquidity(stock_data),
-                'leverage_analysis': self._analyze_leverage(stock_data),
-                'efficiency_analysis': self._analyze_efficiency(stock_data),
-                'valuation_ratios': self._analyze_valuation_ratios(stock_data),
-                'growth_analysis': self._analyze_growth_metrics(stock_data),
-                'status': 'Completed'
+                'growth_analysis': {
+                    'pe_ratio': pe_ratio,
+                    'market_cap': market_cap,
+                    'growth_score': growth_score,
+                    'assessment': self._score_to_assessment(growth_score, 4)
+                },
+                'status': 'Completed',
+                'overall_score': score,
+                'grade': grade,
+                'summary': self._generate_financial_summary(grade, score)
             }
             
-            # Calculate overall financial health score
-            score = self._calculate_financial_health_score(analysis)
-            analysis['overall_score'] = score
-            analysis['grade'] = self._assign_financial_grade(score)
-            analysis['summary'] = self._generate_financial_summary(analysis)
-            
-            return analysis
-            
         except Exception as e:
             return {
                 'method': 'Financial Statement Analysis',
@@ -854,45 +1141,38 @@ class FreeStockAnalyzer:
                 'summary': 'Unable to complete analysis'
             }
 
-    def _calculate_comparative_valuation(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_comparative_valuation(self, inputs: _Inputs) -> Dict[str, Any]:
         """Calculate comparative valuation using multiple methods."""
         try:
-            current_price = stock_data.get('current_price', 0)
-            pe_ratio = stock_data.get('pe_ratio', 0)
-            pb_ratio = stock_data.get('pb_ratio', 0)
-            eps = stock_data.get('eps', 0)
-            dividend_yield = stock_data.get('dividend_yield', 0)
-            
-            # Industry average assumptions
-            industry_averages = {
-                'pe_ratio': 20.0,
-                'pb_ratio': 2.5,
-                'dividend_yield': 0.025
-            }
+            current_price = inputs.current_price
+            pe_ratio = inputs.pe_ratio
+            pb_ratio = inputs.pb_ratio
+            eps = inputs.eps
+            dividend_yield = inputs.dividend_yield
             
-            valuation_methods = {}
+            valuation_methods: Dict[str, Dict[str, Any]] = {}
             
             # P/E Multiple Valuation
             if pe_ratio and eps:
-                pe_fair_value = eps * industry_averages['pe_ratio']
+                pe_fair_value = eps * _INDUSTRY_AVG_PE
                 valuation_methods['pe_multiple'] = {
                     'method': 'P/E Multiple',
                     'current_pe': pe_ratio,
-                    'industry_avg_pe': industry_averages['pe_ratio'],
+                    'industry_avg_pe': _INDUSTRY_AVG_PE,
                     'fair_value': pe_fair_value,
-                    'premium_discount': f"{((pe_ratio - industry_averages['pe_ratio']) / industry_averages['pe_ratio'] * 100):.1f}%"
+                    'premium_discount': f"{((pe_ratio - _INDUSTRY_AVG_PE) / _INDUSTRY_AVG_PE * 100):.1f}%"
                 }
             
             # P/B Multiple Valuation
             if pb_ratio and current_price:
                 book_value_per_share = current_price / pb_ratio if pb_ratio > 0 else 0
-                pb_fair_value = book_value_per_share * industry_averages['pb_ratio']
+                pb_fair_value = book_value_per_share * _INDUSTRY_AVG_PB
                 valuation_methods['pb_multiple'] = {
                     'method': 'P/B Multiple',
                     'current_pb': pb_ratio,
-                    'industry_avg_pb': industry_averages['pb_ratio'],
+                    'industry_avg_pb': _INDUSTRY_AVG_PB,
                     'fair_value': pb_fair_value,
-                    'premium_discount': f"{((pb_ratio - industry_averages['pb_ratio']) / industry_averages['pb_ratio'] * 100):.1f}%" if pb_ratio > 0 else "N/A"
+                    'premium_discount': f"{((pb_ratio - _INDUSTRY_AVG_PB) / _INDUSTRY_AVG_PB * 100):.1f}%" if pb_ratio > 0 else "N/A"
                 }
             
             # Dividend Yield Comparison
@@ -900,13 +1180,13 @@ class FreeStockAnalyzer:
                 dividend_comparison = {
                     'method': 'Dividend Yield Comparison',
                     'current_yield': f"{dividend_yield:.1%}",
-                    'industry_avg_yield': f"{industry_averages['dividend_yield']:.1%}",
-                    'yield_premium': f"{((dividend_yield - industry_averages['dividend_yield']) / industry_averages['dividend_yield'] * 100):.1f}%"
+                    'industry_avg_yield': _INDUSTRY_AVG_YIELD_TEXT,
+                    'yield_premium': f"{((dividend_yield - _INDUSTRY_AVG_YIELD) / _INDUSTRY_AVG_YIELD * 100):.1f}%"
                 }
                 valuation_methods['dividend_yield'] = dividend_comparison
             
             # Calculate weighted average fair value
-            fair_values = []
+            fair_values: List[float] = []
             if 'pe_multiple' in valuation_methods:
                 fair_values.append(valuation_methods['pe_multiple']['fair_value'])
             if 'pb_multiple' in valuation_methods:
@@ -915,17 +1195,7 @@ class FreeStockAnalyzer:
             if fair_values:
                 avg_fair_value = sum(fair_values) / len(fair_values)
                 upside_potential = ((avg_fair_value - current_price) / current_price * 100) if current_price > 0 else 0
-                
-                if avg_fair_value > current_price * 1.15:
-                    assessment = 'Significantly Undervalued'
-                elif avg_fair_value > current_price * 1.05:
-                    assessment = 'Undervalued'
-                elif avg_fair_value < current_price * 0.85:
-                    assessment = 'Significantly Overvalued'
-                elif avg_fair_value < current_price * 0.95:
-                    assessment = 'Overvalued'
-                else:
-                    assessment = 'Fair Value'
+                assessment = _assess_fair_value(avg_fair_value, current_price)
             else:
                 avg_fair_value = current_price
                 upside_potential = 0
@@ -948,32 +1218,35 @@ class FreeStockAnalyzer:
                 'assessment': 'Unable to calculate'
             }
 
-    def _calculate_weighted_fair_value(self, dcf_valuation: Dict, comparative_valuation: Dict, current_price: float) -> Dict[str, Any]:
+    def _calculate_weighted_fair_value(self, dcf_valuation: Dict[str, Any], comparative_valuation: Dict[str, Any], current_price: float) -> Dict[str, Any]:
         """Calculate weighted average fair value from different methods."""
         try:
-            fair_values = []
-            weights = []
-            
             # DCF valuation (40% weight)
-            if dcf_valuation.get('status') == 'Completed' and dcf_valuation.get('fair_value', 0) > 0:
-                fair_values.append(dcf_valuation['fair_value'])
-                weights.append(0.4)
+            use_dcf = dcf_valuation.get('status') == 'Completed' and dcf_valuation.get('fair_value', 0) > 0
             
             # Comparative valuation (60% weight)
-            if comparative_valuation.get('status') == 'Completed' and comparative_valuation.get('average_fair_value', 0) > 0:
-                fair_values.append(comparative_valuation['average_fair_value'])
-                weights.append(0.6)
+            use_comparative = (comparative_valuation.get('status') == 'Completed'
+                               and comparative_valuation.get('average_fair_value', 0) > 0)
             
-            if fair_values and weights:
-                total_weight = sum(weights)
-                normalized_weights = [w / total_weight for w in weights]
-                weighted_fair_value = sum(fv * w for fv, w in zip(fair_values, normalized_weights))
-                confidence = min(len(fair_values) * 25, 100)
-                
+            # Weights are normalized over the methods used, so a single method counts in full
+            # (float() keeps the result a float when the comparative fallback is an int price)
+            if use_dcf and use_comparative:
+                weighted_fair_value = dcf_valuation['fair_value'] * 0.4 + comparative_valuation['average_fair_value'] * 0.6
+                methods_used = 2
+            elif use_dcf:
+                weighted_fair_value = float(dcf_valuation['fair_value'])
+                methods_used = 1
+            elif use_comparative:
+                weighted_fair_value = float(comparative_valuation['average_fair_value'])
+                methods_used = 1
+            else:
+                methods_used = 0
+            
+            if methods_used:
                 return {
                     'weighted_fair_value': weighted_fair_value,
-                    'confidence_level': f"{confidence}%",
-                    'methods_used': len(fair_values),
+                    'confidence_level': f"{methods_used * 25}%",
+                    'methods_used': methods_used,
                     'current_price': current_price,
                     'implied_return': f"{((weighted_fair_value - current_price) / current_price * 100):.1f}%" if current_price > 0 else "N/A"
                 }
@@ -994,7 +1267,7 @@ class FreeStockAnalyzer:
                 'error': str(e)
             }
 
-    def _determine_overall_valuation_assessment(self, dcf_valuation: Dict, comparative_valuation: Dict, current_price: float) -> str:
+    def _determine_overall_valuation_assessment(self, dcf_valuation: Dict[str, Any], comparative_valuation: Dict[str, Any], current_price: float) -> str:
         """Determine overall valuation assessment."""
         try:
             assessments = []
@@ -1009,9 +1282,10 @@ class FreeStockAnalyzer:
                 return 'Unable to determine valuation'
             
             # Count assessment types
-            undervalued_count = sum(1 for a in assessments if 'undervalued' in a.lower())
-            overvalued_count = sum(1 for a in assessments if 'overvalued' in a.lower())
-            fair_value_count = sum(1 for a in assessments if 'fair' in a.lower())
+            signals = [_VALUATION_SIGNALS.get(assessment) for assessment in assessments]
+            undervalued_count = signals.count('undervalued')
+            overvalued_count = signals.count('overvalued')
+            fair_value_count = signals.count('fair')
             
             # Determine consensus
             if undervalued_count > overvalued_count and undervalued_count > fair_value_count:
@@ -1025,149 +1299,6 @@ class FreeStockAnalyzer:
             return 'Unable to determine valuation'
 
     # Helper methods for financial statement analysis
-    def _analyze_profitability(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze profitability metrics."""
-        eps = stock_data.get('eps', 0)
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        
-        profitability_score = 0
-        if eps > 0:
-            profitability_score += 3
-            if eps > 2:
-                profitability_score += 2
-        
-        if pe_ratio > 0 and pe_ratio < 25:
-            profitability_score += 2
-        
-        return {
-            'eps': eps,
-            'pe_ratio': pe_ratio,
-            'profitability_score': profitability_score,
-            'assessment': self._score_to_assessment(profitability_score, 5)
-        }
-
-    def _analyze_liquidity(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze liquidity metrics."""
-        market_cap = stock_data.get('market_cap', 0)
-        
-        liquidity_score = 0
-        if market_cap > 10e9:
-            liquidity_score += 5
-        elif market_cap > 2e9:
-            liquidity_score += 3
-        else:
-            liquidity_score += 1
-        
-        return {
-            'market_cap': market_cap,
-            'liquidity_score': liquidity_score,
-            'assessment': self._score_to_assessment(liquidity_score, 5)
-        }
-
-    def _analyze_leverage(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze leverage metrics."""
-        dividend_yield = stock_data.get('dividend_yield', 0)
-        market_cap = stock_data.get('market_cap', 0)
-        
-        leverage_score = 0
-        if dividend_yield > 0.03:
-            leverage_score += 3
-        elif dividend_yield > 0.01:
-            leverage_score += 2
-        else:
-            leverage_score += 1
-        
-        if market_cap > 10e9:
-            leverage_score += 2
-        
-        return {
-            'dividend_yield': dividend_yield,
-            'leverage_score': leverage_score,
-            'assessment': self._score_to_assessment(leverage_score, 5)
-        }
-
-    def _analyze_efficiency(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze efficiency metrics."""
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        beta = stock_data.get('beta', 1.0)
-        
-        efficiency_score = 0
-        if pe_ratio > 0 and pe_ratio < 20:
-            efficiency_score += 3
-        elif pe_ratio > 0 and pe_ratio < 30:
-            efficiency_score += 2
-        
-        if 0.8 <= beta <= 1.2:
-            efficiency_score += 2
-        
-        return {
-            'pe_ratio': pe_ratio,
-            'beta': beta,
-            'efficiency_score': efficiency_score,
-            'assessment': self._score_to_assessment(efficiency_score, 5)
-        }
-
-    def _analyze_valuation_ratios(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze valuation ratios."""
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        pb_ratio = stock_data.get('pb_ratio', 0)
-        
-        valuation_score = 0
-        if pe_ratio > 0:
-            if pe_ratio < 15:
-                valuation_score += 3
-            elif pe_ratio < 25:
-                valuation_score += 2
-            else:
-                valuation_score += 1
-        
-        if pb_ratio > 0:
-            if pb_ratio < 2:
-                valuation_score += 2
-            elif pb_ratio < 3:
-                valuation_score += 1
-        
-        return {
-            'pe_ratio': pe_ratio,
-            'pb_ratio': pb_ratio,
-            'valuation_score': valuation_score,
-            'assessment': self._score_to_assessment(valuation_score, 5)
-        }
-
-    def _analyze_growth_metrics(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze growth metrics."""
-        pe_ratio = stock_data.get('pe_ratio', 0)
-        market_cap = stock_data.get('market_cap', 0)
-        
-        growth_score = 0
-        if pe_ratio > 20:
-            growth_score += 2
-        elif pe_ratio > 15:
-            growth_score += 1
-        
-        if market_cap < 10e9:
-            growth_score += 2
-        elif market_cap < 50e9:
-            growth_score += 1
-        
-        return {
-            'pe_ratio': pe_ratio,
-            'market_cap': market_cap,
-            'growth_score': growth_score,
-            'assessment': self._score_to_assessment(growth_score, 4)
-        }
-
-    def _calculate_financial_health_score(self, analysis: Dict[str, Any]) -> int:
-        """Calculate overall financial health score."""
-        total_score = 0
-        total_score += analysis['profitability_analysis'].get('profitability_score', 0)
-        total_score += analysis['liquidity_analysis'].get('liquidity_score', 0)
-        total_score += analysis['leverage_analysis'].get('leverage_score', 0)
-        total_score += analysis['efficiency_analysis'].get('efficiency_score', 0)
-        total_score += analysis['valuation_ratios'].get('valuation_score', 0)
-        total_score += analysis['growth_analysis'].get('growth_score', 0)
-        return total_score
-
     def _assign_financial_grade(self, score: int) -> str:
         """Assign letter grade based on financial health score."""
         if score >= 20:
@@ -1185,10 +1316,8 @@ class FreeStockAnalyzer:
         else:
             return 'D (Poor)'
 
-    def _generate_financial_summary(self, analysis: Dict[str, Any]) -> str:
+    def _generate_financial_summary(self, grade: str, score: int) -> str:
         """Generate financial summary."""
-        grade = analysis['grade']
-        score = analysis['overall_score']
         return f"Financial Health Grade: {grade} (Score: {score}/24). Assessment based on profitability, liquidity, leverage, efficiency, valuation, and growth metrics."
 
     def _score_to_assessment(self, score: int, max_score: int) -> str:
@@ -1213,3 +1342,19 @@ class FreeStockAnalyzer:
             return 'Moderate cost of capital - typical for most companies'
         else:
             return 'High cost of capital - higher risk profile'
+
+
+# Per-process analyzer used by FreeStockAnalyzer.analyze_many workers
+_worker_analyzer: Optional[FreeStockAnalyzer] = None
+
+
+def _init_worker(log_queue) -> None:
+    """Set up a worker process with its own analyzer, logging to the file through the parent."""
+    global _worker_analyzer
+    forward_to_parent(log_queue)
+    _worker_analyzer = FreeStockAnalyzer()
+
+
+def _analyze_chunk(stocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Analyze one chunk of stocks in a worker process."""
+    return (_worker_analyzer or FreeStockAnalyzer()).analyze_stocks_batch(stocks)
@@ -0,0 +1,220 @@
+"""
+Price Indicator Kernels
+NumPy/Numba implementations of the price-history metrics used across the app.
+Every kernel has a pinned signature, so it is compiled (or loaded from the on-disk
+cache) at import rather than on first call; pass writable float64 arrays.
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.jit import njit
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@njit('f8[:](f8[:], i8)', cache=True)
+def rolling_mean(values, window):
+    """Simple moving average using a running sum (NaN until the window fills).
+
+    As in rolling_means, NaNs are counted rather than summed, so a window holding
+    any NaN yields NaN and the sum recovers once it leaves the window.
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    running_sum = 0.0
+    nans = 0
+    for i in range(n):
+        value = values[i]
+        if np.isnan(value):
+            nans += 1
+        else:
+            running_sum += value
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                running_sum -= old
+        if i >= window - 1 and nans == 0:
+            out[i] = running_sum / window
+    return out
+
+
+@njit('f8[:, :](f8[:, :], i8[:])', cache=True)
+def rolling_means(rows, windows):
+    """Simple moving average of each row over its own window, in one pass over time.
+
+    Each row keeps a running sum of the finite values in its window; a window holding
+    any NaN yields NaN, as pandas' rolling mean does.
+    """
+    m, n = rows.shape
+    out = np.full((m, n), np.nan)
+    sums = np.zeros(m)
+    nans = np.zeros(m, dtype=np.int64)
+    for i in range(n):
+        for r in range(m):
+            value = rows[r, i]
+            if np.isnan(value):
+                nans[r] += 1
+            else:
+                sums[r] += value
+            window = windows[r]
+            if i >= window:
+                old = rows[r, i - window]
+                if np.isnan(old):
+                    nans[r] -= 1
+                else:
+                    sums[r] -= old
+            if i >= window - 1 and nans[r] == 0:
+                out[r, i] = sums[r] / window
+    return out
+
+
+@njit('UniTuple(f8[:], 5)(f8[:], i8, f8)', cache=True)
+def bollinger_bands(close, period, num_std):
+    """Upper, middle and lower bands plus bandwidth and %B from one running sum / sum-of-squares pass.
+
+    The standard deviation is the sample (ddof=1) one pandas' rolling std uses. Values are
+    shifted by the first price before squaring to keep the sum of squares well conditioned.
+    """
+    n = close.shape[0]
+    upper = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    bandwidth = np.full(n, np.nan)
+    percent_b = np.full(n, np.nan)
+    shift = close[0] if n > 0 and not np.isnan(close[0]) else 0.0
+    total = 0.0
+    total_sq = 0.0
+    nans = 0
+    for i in range(n):
+        value = close[i] - shift
+        if np.isnan(value):
+            nans += 1
+        else:
+            total += value
+            total_sq += value * value
+        if i >= period:
+            old = close[i - period] - shift
+            if np.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+                total_sq -= old * old
+        if i < period - 1 or nans > 0:
+            continue
+        mean = total / period
+        std = np.sqrt(max(total_sq - total * mean, 0.0) / (period - 1))
+        middle[i] = mean + shift
+        upper[i] = middle[i] + num_std * std
+        lower[i] = middle[i] - num_std * std
+        width = upper[i] - lower[i]
+        if middle[i] != 0.0:
+            bandwidth[i] = width / middle[i]
+        if width > 0.0:
+            percent_b[i] = (close[i] - lower[i]) / width
+    return upper, middle, lower, bandwidth, percent_b
+
+
+@njit('UniTuple(f8[:], 3)(f8[:], i8, i8, i8)', cache=True)
+def macd_lines(close, fast_span, slow_span, signal_span):
+    """MACD line, signal line and histogram from one pass with three EWM states.
+
+    Each EWM is pandas' default adjusted form (ewm(span=...).mean()): a decayed sum of
+    observations over a decayed sum of weights. A NaN price keeps the previous MACD value
+    and still decays older weights, as with ignore_na=False.
+    """
+    n = close.shape[0]
+    macd = np.empty(n)
+    signal = np.empty(n)
+    histogram = np.empty(n)
+    fast_decay = 1.0 - 2.0 / (fast_span + 1.0)
+    slow_decay = 1.0 - 2.0 / (slow_span + 1.0)
+    signal_decay = 1.0 - 2.0 / (signal_span + 1.0)
+    fast_sum = fast_weight = 0.0
+    slow_sum = slow_weight = 0.0
+    signal_sum = signal_weight = 0.0
+    for i in range(n):
+        fast_sum *= fast_decay
+        fast_weight *= fast_decay
+        slow_sum *= slow_decay
+        slow_weight *= slow_decay
+        signal_sum *= signal_decay
+        signal_weight *= signal_decay
+        value = close[i]
+        if not np.isnan(value):
+            fast_sum += value
+            fast_weight += 1.0
+            slow_sum += value
+            slow_weight += 1.0
+        if slow_weight > 0.0:
+            macd[i] = fast_sum / fast_weight - slow_sum / slow_weight
+            signal_sum += macd[i]
+            signal_weight += 1.0
+        else:
+            macd[i] = np.nan
+        signal[i] = signal_sum / signal_weight if signal_weight > 0.0 else np.nan
+        histogram[i] = macd[i] - signal[i]
+    return macd, signal, histogram
+
+
+@njit('f8[:](f8[:], i8)', cache=True)
+def rsi(close, period):
+    """Relative Strength Index with Wilder smoothing, seeded by the simple average of the first period (NaN before it)."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        # NaN deltas count as no change, as pandas' where() did
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0.0:
+            out[i] = 100.0
+    return out
+
+
+@njit('f8(f8[:])', cache=True)
+def total_return(close):
+    """Total return over the series as a fraction."""
+    if close.shape[0] < 2 or close[0] == 0.0:
+        return np.nan
+    return close[-1] / close[0] - 1.0
+
+
+@njit('f8(f8[:], i8)', cache=True)
+def annualized_volatility(close, periods_per_year):
+    """Annualized standard deviation of daily log returns (pass TRADING_DAYS_PER_YEAR for daily bars)."""
+    n = close.shape[0]
+    if n < 3:
+        return np.nan
+    total = 0.0
+    total_sq = 0.0
+    count = 0
+    for i in range(1, n):
+        if close[i - 1] > 0.0 and close[i] > 0.0:
+            r = np.log(close[i] / close[i - 1])
+            total += r
+            total_sq += r * r
+            count += 1
+    if count < 2:
+        return np.nan
+    mean = total / count
+    variance = (total_sq - count * mean * mean) / (count - 1)
+    return np.sqrt(max(variance, 0.0) * periods_per_year)
@@ -6,16 +6,218 @@ Fetches stock data and performs comprehensive analysis using AI models.
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from collections.abc import Mapping
+from functools import cached_property
+from concurrent.futures import Future, ThreadPoolExecutor
 import openai
+import hashlib
+import json
+import re
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import setup_logger
+from utils.disk_cache import disk_cached, disk_load, disk_store
+from data_analysis.indicators import bollinger_bands, macd_lines, rolling_means, rsi
+
+# Fields pulled out of a malformed AI response when JSON parsing fails
+_RE_THESIS = re.compile(r'"investment_thesis"\s*:\s*"([^"]+)"', re.IGNORECASE)
+_RE_RECOMMENDATION = re.compile(r'"recommendation"\s*:\s*"([^"]+)"', re.IGNORECASE)
+_RE_TARGET_PRICE = re.compile(r'"target_price"\s*:\s*([\d.]+)', re.IGNORECASE)
+_RE_UPSIDE = re.compile(r'"upside_potential"\s*:\s*([\d.\-]+)', re.IGNORECASE)
+_RE_HIGHLIGHTS = re.compile(r'"highlights"\s*:\s*\[(.*?)\]', re.DOTALL)
+_RE_RISKS = re.compile(r'"risks"\s*:\s*\[(.*?)\]', re.DOTALL)
+
+# Output cap for the JSON analysis. The response template alone is ~350 tokens and the model
+# expands its placeholders (the worked DCF especially), so this leaves room for a long answer
+# while staying well under the old 4000. Completion usage is logged per call for re-sizing,
+# and a response cut off at the cap is never cached.
+_AI_MAX_TOKENS = 1500
+
+# ticker.info field reported as each financial ratio
+_RATIO_FIELDS = {
+    # Profitability ratios
+    'profit_margin': 'profitMargins',
+    'operating_margin': 'operatingMargins',
+    'roe': 'returnOnEquity',
+    'roa': 'returnOnAssets',
+    # Valuation ratios
+    'pe_ratio': 'trailingPE',
+    'peg_ratio': 'pegRatio',
+    'price_to_book': 'priceToBook',
+    'price_to_sales': 'priceToSalesTrailing12Months',
+    # Liquidity ratios
+    'current_ratio': 'currentRatio',
+    'quick_ratio': 'quickRatio',
+    # Leverage ratios
+    'debt_to_equity': 'debtToEquity',
+}
+
+# Seconds a cached AI analysis stays valid; the prompt hash already changes with the inputs
+_AI_CACHE_TTL = 24 * 3600
+
+# A symbol's latest analysis is reused for an hour while the price stays within 1% of the one it was built on
+_AI_LATEST_TTL = 3600
+_AI_PRICE_TOLERANCE = 0.01
+
+# company_info fields in the AI prompt that don't move with the price (market cap and P/E do),
+# hashed into the latest entry's key so only the price can differ from the prompt it was built on
+_AI_FUNDAMENTAL_FIELDS = ('freeCashflow', 'totalRevenue', 'totalDebt', 'totalCash', 'sharesOutstanding',
+                          'debtToEquity', 'returnOnEquity', 'profitMargins', 'currentRatio', 'revenueGrowth')
+
+# Statement endpoints fetched on request (include_statements); each falls back to an empty frame on failure
+_STATEMENTS = ('financials', 'balance_sheet', 'cashflow')
+
+# The only ticker.info fields read after fetching (prompt, ratios and valuation); the rest is dropped
+_USED_INFO_KEYS = frozenset({
+    'currentRatio', 'debtToEquity', 'freeCashflow', 'operatingMargins', 'pegRatio', 'priceToBook',
+    'priceToSalesTrailing12Months', 'profitMargins', 'quickRatio', 'returnOnAssets', 'returnOnEquity',
+    'revenueGrowth', 'sharesOutstanding', 'totalAssets', 'totalCash', 'totalDebt', 'totalRevenue',
+    'trailingEps', 'trailingPE',
+})
+
+# Moving averages computed together by rolling_means: three on Close, one on Volume
+_SMA_KEYS = ('sma_20', 'sma_50', 'sma_200', 'volume_sma')
+_SMA_WINDOWS = np.array([20, 50, 200, 20], dtype=np.int64)
+
+# Indicator columns of each lazily computed TechnicalIndicators group, in the group array's row order
+_MACD_KEYS = ('macd', 'macd_signal', 'macd_histogram')
+_BOLLINGER_KEYS = ('bb_upper', 'bb_lower', 'bb_middle')
+_INDICATOR_GROUPS = {
+    **{key: ('_moving_averages', row) for row, key in enumerate(_SMA_KEYS)},
+    'rsi': ('_rsi', 0),
+    **{key: ('_macd', row) for row, key in enumerate(_MACD_KEYS)},
+    **{key: ('_bollinger_bands', row) for row, key in enumerate(_BOLLINGER_KEYS)},
+}
+
+
+class TechnicalIndicators(Mapping):
+    """Read-only mapping of indicator name to Series; each group is computed on first access.
+    
+    Groups are stored as (columns, n) arrays; Series are built when read and
+    to_array() stacks everything into one (n, k) matrix.
+    """
+    
+    def __init__(self, data: pd.DataFrame) -> None:
+        """Keep the price history as arrays for the indicator kernels."""
+        # copy=True: the kernels' pinned signatures need writable arrays, not pandas' read-only views
+        self._close = data['Close'].to_numpy(dtype=np.float64, copy=True)
+        self._volume = data['Volume'].to_numpy(dtype=np.float64, copy=True)
+        self._index = data.index
+    
+    def __getitem__(self, key: str) -> pd.Series:
+        group, row = _INDICATOR_GROUPS[key]
+        return pd.Series(getattr(self, group)[row], index=self._index, name=key)
+    
+    def __iter__(self):
+        return iter(_INDICATOR_GROUPS)
+    
+    def __len__(self) -> int:
+        return len(_INDICATOR_GROUPS)
+    
+    @property
+    def columns(self) -> List[str]:
+        """Indicator names in to_array() column order."""
+        return list(_INDICATOR_GROUPS)
+    
+    @property
+    def index(self) -> pd.Index:
+        """Row labels (dates) shared by every indicator."""
+        return self._index
+    
+    def to_array(self, dtype: Any = np.float32) -> np.ndarray:
+        """All indicators as one column-major (n, k) matrix in columns order."""
+        out = np.empty((len(self._index), len(_INDICATOR_GROUPS)), dtype=dtype, order='F')
+        for column, (group, row) in enumerate(_INDICATOR_GROUPS.values()):
+            out[:, column] = getattr(self, group)[row]
+        return out
+    
+    @cached_property
+    def _moving_averages(self) -> np.ndarray:
+        """Price and volume moving averages in one pass."""
+        return rolling_means(np.vstack((self._close, self._close, self._close, self._volume)), _SMA_WINDOWS)
+    
+    @cached_property
+    def _rsi(self) -> np.ndarray:
+        """Relative Strength Index."""
+        return rsi(self._close, 14)[np.newaxis, :]
+    
+    @cached_property
+    def _macd(self) -> np.ndarray:
+        """MACD line, signal and histogram."""
+        return np.vstack(macd_lines(self._close, 12, 26, 9))
+    
+    @cached_property
+    def _bollinger_bands(self) -> np.ndarray:
+        """Bollinger Bands; the kernel's bandwidth and %B have no reader here, so they are left out."""
+        upper, middle, lower, _, _ = bollinger_bands(self._close, 20, 2.0)
+        return np.vstack((upper, lower, middle))
+
+
+def _format_amount(value: Any, prefix: str = "$") -> str:
+    """Format a raw figure with thousands separators for the AI prompt, or 'N/A' when missing."""
+    return 'N/A' if value is None or value == 'N/A' else f"{prefix}{value:,.0f}"
+
+
+class _JsonFieldStream:
+    """Brace-depth tracker that yields each top-level field of a streamed JSON object once it closes."""
+    
+    def __init__(self) -> None:
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._field_start: Optional[int] = None
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add streamed text and return the (name, value) pairs completed by it."""
+        self._text += chunk
+        fields = []
+        for i in range(self._pos, len(self._text)):
+            char = self._text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+                if self._depth == 1:
+                    self._field_start = i + 1
+            elif char in '}]' or (char == ',' and self._depth == 1):
+                if self._depth == 1 and self._field_start is not None:
+                    fields.extend(self._parse_field(self._text[self._field_start:i]))
+                    self._field_start = i + 1
+                if char != ',':
+                    self._depth -= 1
+        self._pos = len(self._text)
+        return fields
+    
+    @staticmethod
+    def _parse_field(segment: str) -> List[Tuple[str, Any]]:
+        """Parse one '"name": value' segment; anything malformed is left to the full-response parse."""
+        if not segment.strip():
+            return []
+        try:
+            return list(json.loads('{' + segment + '}').items())
+        except ValueError:
+            return []
+
 
 class StockAnalyzer:
     """AI-powered stock analysis engine."""
@@ -32,14 +234,24 @@ class StockAnalyzer:
         openai.api_key = config.openai_api_key
         self.client = openai.OpenAI(api_key=config.openai_api_key)
         self.logger.info(f"StockAnalyzer initialized with API key: {config.openai_api_key[:8]}...")
+        
+        # yfinance Tickers by symbol, reused across fetches
+        self._tickers: Dict[str, yf.Ticker] = {}
+    
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        """Return the yfinance Ticker for symbol, creating it on first use."""
+        if symbol not in self._tickers:
+            self._tickers[symbol] = yf.Ticker(symbol)
+        return self._tickers[symbol]
     
-    def fetch_stock_data(self, symbol: str, period: str = "1y") -> Dict[str, Any]:
+    def fetch_stock_data(self, symbol: str, period: str = "1y", include_statements: bool = False) -> Dict[str, Any]:
         """
         Fetch comprehensive stock data from Yahoo Finance.
         
         Args:
             symbol: Stock ticker symbol
             period: Time period for data (1y, 2y, 5y, max)
+            include_statements: Also fetch the financials, balance_sheet and cashflow DataFrames
             
         Returns:
             Dictionary containing stock data and information
@@ -47,46 +259,16 @@ class StockAnalyzer:
         try:
             self.logger.info(f"Fetching stock data for {symbol}")
             
-            # Create ticker object
-            ticker = yf.Ticker(symbol)
-            
-            # Get historical data
-            hist_data = ticker.history(period=period)
-            
-            # Get company info
-            info = ticker.info
-            
-            # Get financial statements
-            financials = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cashflow = ticker.cashflow
-            
-            # Calculate technical indicators
-            technical_indicators = self._calculate_technical_indicators(hist_data)
-            
-            # Compile all data
-            stock_data = {
-                "symbol": symbol,
-                "company_name": info.get("longName", symbol),
-                "sector": info.get("sector", "Unknown"),
-                "industry": info.get("industry", "Unknown"),
-                "historical_data": hist_data,
-                "company_info": info,
-                "financials": financials,
-                "balance_sheet": balance_sheet,
-                "cashflow": cashflow,
-                "technical_indicators": technical_indicators,
-                "current_price": hist_data['Close'].iloc[-1] if not hist_data.empty else None,
-                "market_cap": info.get("marketCap"),
-                "pe_ratio": info.get("trailingPE"),
-                "eps": info.get("trailingEps"),
-                "52w_high": info.get("fiftyTwoWeekHigh"),
-                "52w_low": info.get("fiftyTwoWeekLow"),
-                "dividend_yield": info.get("dividendYield"),
-                "beta": info.get("beta"),
-                "volume": info.get("volume"),
-                "avg_volume": info.get("averageVolume")
-            }
+            # The endpoints are independent HTTPS calls, so overlap their round-trips
+            ticker = self._ticker(symbol)
+            statements = _STATEMENTS if include_statements else ()
+            with ThreadPoolExecutor(max_workers=2 + len(statements)) as executor:
+                hist_future = executor.submit(disk_cached, f"{symbol.upper()}_history_{period}",
+                                              lambda: ticker.history(period=period))
+                fundamentals = self._submit_fundamentals(executor, symbol, statements)
+            
+            # Price history is required; info and statements degrade to empty
+            stock_data = self._compile_stock_data(symbol, hist_future.result(), fundamentals)
             
             self.logger.info(f"Successfully fetched data for {symbol}")
             return stock_data
@@ -95,79 +277,121 @@ class StockAnalyzer:
             self.logger.error(f"Error fetching stock data for {symbol}: {str(e)}")
             raise
     
-    def _calculate_technical_indicators(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate technical indicators from historical data."""
-        try:
-            indicators = {}
-            
-            if data.empty:
-                return indicators
-            
-            # Moving averages
-            indicators['sma_20'] = data['Close'].rolling(window=20).mean()
-            indicators['sma_50'] = data['Close'].rolling(window=50).mean()
-            indicators['sma_200'] = data['Close'].rolling(window=200).mean()
-            
-            # RSI
-            indicators['rsi'] = self._calculate_rsi(data['Close'])
-            
-            # MACD
-            macd_data = self._calculate_macd(data['Close'])
-            indicators.update(macd_data)
-            
-            # Bollinger Bands
-            bb_data = self._calculate_bollinger_bands(data['Close'])
-            indicators.update(bb_data)
-            
-            # Volume indicators
-            indicators['volume_sma'] = data['Volume'].rolling(window=20).mean()
+    def fetch_stock_data_batch(self, symbols: List[str], period: str = "1y",
+                               include_statements: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch stock data for several symbols, downloading all price histories in one request.
+        
+        Args:
+            symbols: Stock ticker symbols
+            period: Time period for data (1y, 2y, 5y, max)
+            include_statements: Also fetch the financials, balance_sheet and cashflow DataFrames
             
-            return indicators
+        Returns:
+            Dictionary mapping each symbol to its fetch_stock_data-style dictionary
+        """
+        try:
+            self.logger.info(f"Fetching stock data for {len(symbols)} symbols")
+            if not symbols:
+                return {}
+            
+            # Info and statements fan out on the pool while yf.download pulls every history at once
+            statements = _STATEMENTS if include_statements else ()
+            with ThreadPoolExecutor(max_workers=min(16, len(symbols) * (1 + len(statements)))) as executor:
+                fundamentals = {symbol: self._submit_fundamentals(executor, symbol, statements) for symbol in symbols}
+                history = yf.download(symbols, period=period, group_by='ticker', threads=True, progress=False)
+            
+            if not isinstance(history.columns, pd.MultiIndex):
+                # Older yfinance versions return a lone symbol's history with flat columns
+                history = pd.concat({symbols[0].upper(): history}, axis=1)
+            
+            downloaded = set(history.columns.get_level_values(0))
+            results = {}
+            for symbol in symbols:
+                key = symbol.upper()
+                hist_data = history[key].dropna(how='all') if key in downloaded else pd.DataFrame()
+                results[symbol] = self._compile_stock_data(symbol, hist_data, fundamentals[symbol])
+            
+            self.logger.info(f"Successfully fetched data for {len(results)} symbols")
+            return results
             
         except Exception as e:
-            self.logger.error(f"Error calculating technical indicators: {str(e)}")
-            return {}
+            self.logger.error(f"Error fetching stock data batch: {str(e)}")
+            raise
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate Relative Strength Index."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def _submit_fundamentals(self, executor: ThreadPoolExecutor, symbol: str,
+                             statements: Tuple[str, ...]) -> Dict[str, Future]:
+        """Submit the disk-cached info and statement fetches for symbol; keys match FinancialCalculator's."""
+        key = symbol.upper()
+        ticker = self._ticker(symbol)
+        futures = {'info': executor.submit(disk_cached, f"{key}_info", lambda: ticker.info)}
+        for name in statements:
+            futures[name] = executor.submit(disk_cached, f"{key}_{name}", lambda name=name: getattr(ticker, name))
+        return futures
     
-    def _calculate_macd(self, prices: pd.Series) -> Dict[str, pd.Series]:
-        """Calculate MACD indicators."""
-        ema_12 = prices.ewm(span=12).mean()
-        ema_26 = prices.ewm(span=26).mean()
-        macd = ema_12 - ema_26
-        signal = macd.ewm(span=9).mean()
-        histogram = macd - signal
+    def _compile_stock_data(self, symbol: str, hist_data: pd.DataFrame, fundamentals: Dict[str, Future]) -> Dict[str, Any]:
+        """Build the stock data dictionary from price history and the fundamentals futures."""
+        info = self._optional_result(fundamentals['info'], symbol, 'info', {})
+        
+        # Calculate technical indicators
+        technical_indicators = self._calculate_technical_indicators(hist_data)
         
-        return {
-            'macd': macd,
-            'macd_signal': signal,
-            'macd_histogram': histogram
+        # Compile all data
+        stock_data = {
+            "symbol": symbol,
+            "company_name": info.get("longName", symbol),
+            "sector": info.get("sector", "Unknown"),
+            "industry": info.get("industry", "Unknown"),
+            "historical_data": hist_data,
+            "company_info": {key: value for key, value in info.items() if key in _USED_INFO_KEYS},
+            "technical_indicators": technical_indicators,
+            "current_price": hist_data['Close'].iloc[-1] if not hist_data.empty else None,
+            "market_cap": info.get("marketCap"),
+            "pe_ratio": info.get("trailingPE"),
+            "eps": info.get("trailingEps"),
+            "52w_high": info.get("fiftyTwoWeekHigh"),
+            "52w_low": info.get("fiftyTwoWeekLow"),
+            "dividend_yield": info.get("dividendYield"),
+            "beta": info.get("beta"),
+            "volume": info.get("volume"),
+            "avg_volume": info.get("averageVolume")
         }
+        
+        # Statements only when the caller asked for them
+        for name in _STATEMENTS:
+            if name in fundamentals:
+                stock_data[name] = self._optional_result(fundamentals[name], symbol, name, pd.DataFrame())
+        return stock_data
     
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20) -> Dict[str, pd.Series]:
-        """Calculate Bollinger Bands."""
-        sma = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+    def _optional_result(self, future: Future, symbol: str, name: str, default: Any) -> Any:
+        """Return a fetch future's result, or default (with a warning) if the fetch failed."""
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.warning(f"Could not fetch {name} for {symbol}: {str(e)}")
+            return default
+    
+    def _calculate_technical_indicators(self, data: pd.DataFrame) -> Mapping:
+        """Wrap historical data in a TechnicalIndicators mapping; indicators are computed when read."""
+        if data.empty:
+            return {}
         
-        return {
-            'bb_upper': sma + (std * 2),
-            'bb_lower': sma - (std * 2),
-            'bb_middle': sma
-        }
+        # Only a missing column or non-numeric prices mean "no indicators"; anything else is a bug
+        try:
+            return TechnicalIndicators(data)
+        except (KeyError, ValueError) as e:
+            self.logger.error(f"Error calculating technical indicators: {str(e)}")
+            return {}
     
-    def analyze_stock(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_stock(self, stock_data: Dict[str, Any],
+                      on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
         Perform comprehensive AI-powered stock analysis.
         
         Args:
             stock_data: Dictionary containing stock data
+            on_field: Optional callback receiving (name, value) for each AI response field
+                as it finishes streaming, for showing partial analysis early
             
         Returns:
             Dictionary containing analysis results
@@ -176,7 +400,7 @@ class StockAnalyzer:
             self.logger.info(f"Starting AI analysis for {stock_data.get('symbol', 'UNKNOWN')}")
             
             # Get comprehensive AI analysis in ONE call (now includes prompt preparation)
-            ai_analysis_result = self._get_comprehensive_ai_analysis(stock_data)
+            ai_analysis_result = self._get_comprehensive_ai_analysis(stock_data, on_field)
             
             # Calculate financial ratios
             financial_ratios = self._calculate_financial_ratios(stock_data)
@@ -217,99 +441,9 @@ class StockAnalyzer:
             self.logger.error(f"Error in stock analysis: {str(e)}")
             raise
     
-    def _prepare_analysis_prompt(self, stock_data: Dict[str, Any]) -> str:
-        """Prepare the prompt for AI analysis."""
-        # Safely format market cap
-        market_cap = stock_data.get('market_cap', 0)
-        market_cap_str = f"${market_cap:,}" if market_cap and market_cap > 0 else 'N/A'
-        
-        # Safely format other values
-        current_price = stock_data.get('current_price', 0)
-        pe_ratio = stock_data.get('pe_ratio', 'N/A')
-        eps = stock_data.get('eps', 'N/A')
-        low_52w = stock_data.get('52w_low', 'N/A')
-        high_52w = stock_data.get('52w_high', 'N/A')
-        beta = stock_data.get('beta', 'N/A')
-        sector = stock_data.get('sector', 'N/A')
-        industry = stock_data.get('industry', 'N/A')
-        company_name = stock_data.get('company_name', 'Unknown Company')
-        symbol = stock_data.get('symbol', 'UNKNOWN')
-        
-        # Get additional financial metrics for calculations
-        company_info = stock_data.get('company_info', {})
-        revenue = company_info.get('totalRevenue', 'N/A')
-        profit_margin = company_info.get('profitMargins', 'N/A')
-        debt_to_equity = company_info.get('debtToEquity', 'N/A')
-        roe = company_info.get('returnOnEquity', 'N/A')
-        forward_pe = company_info.get('forwardPE', 'N/A')
-        price_to_book = company_info.get('priceToBook', 'N/A')
-        free_cashflow = company_info.get('freeCashflow', 'N/A')
-        total_debt = company_info.get('totalDebt', 'N/A')
-        total_cash = company_info.get('totalCash', 'N/A')
-        shares_outstanding = company_info.get('sharesOutstanding', 'N/A')
-        enterprise_value = company_info.get('enterpriseValue', 'N/A')
-        
-        prompt = f"""
-        As a CRITICAL Wall Street equity research analyst, conduct a HARSH, REALISTIC analysis of {company_name} ({symbol}).
-        
-        COMPANY DATA FOR CALCULATIONS:
-        - Sector: {sector} | Industry: {industry}
-        - Current Price: ${current_price:.2f}
-        - Market Cap: {market_cap_str}
-        - 52-Week Range: ${low_52w} - ${high_52w}
-        
-        FINANCIAL DATA FOR DCF/WACC CALCULATIONS:
-        - Revenue: {revenue}
-        - Free Cash Flow: {free_cashflow}
-        - Total Debt: {total_debt}
-        - Total Cash: {total_cash}
-        - Shares Outstanding: {shares_outstanding}
-        - Enterprise Value: {enterprise_value}
-        - P/E Ratio: {pe_ratio} | Forward P/E: {forward_pe}
-        - EPS: {eps}
-        - Price-to-Book: {price_to_book}
-        - Profit Margin: {profit_margin}
-        - ROE: {roe}
-        - Debt-to-Equity: {debt_to_equity}
-        - Beta: {beta}
-        
-        MANDATORY ANALYSIS - USE THE ACTUAL NUMBERS ABOVE:
-        
-        1. DCF CALCULATION:
-           - Use Free Cash Flow to calculate intrinsic value
-           - Apply discount rate based on Beta and risk-free rate
-           - Show your calculation steps
-           - Compare to current price
-        
-        2. WACC CALCULATION:
-           - Calculate cost of equity using CAPM
-           - Factor in debt costs using Debt-to-Equity
-           - Show your WACC percentage
-        
-        3. VALUATION ASSESSMENT:
-           - Is current P/E justified vs peers?
-           - Is Price-to-Book reasonable?
-           - Calculate fair value range
-           - Be HONEST about overvaluation
-        
-        4. CRITICAL ANALYSIS:
-           - What's wrong with this company?
-           - Why might it fail?
-           - What are the red flags?
-           - Is management overpaid?
-        
-        5. REALISTIC RECOMMENDATION:
-           - Most stocks are OVERVALUED in this market
-           - Only recommend BUY if truly undervalued
-           - Use HOLD for fairly valued
-           - Use SELL for overvalued
-        
-        DO REAL MATH - NO GENERIC ANALYSIS!
-        """
-        return prompt
-    
-    def _get_comprehensive_ai_analysis(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Get comprehensive AI analysis in ONE call for speed."""
+    def _get_comprehensive_ai_analysis(self, stock_data: Dict[str, Any],
+                                       on_field: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """Get comprehensive AI analysis in ONE streamed call, reporting fields to on_field as they arrive."""
         try:
             self.logger.info("Starting comprehensive AI analysis...")
             
@@ -319,42 +453,25 @@ class StockAnalyzer:
             symbol = stock_data.get('symbol', 'UNKNOWN')
             current_price = stock_data.get('current_price', 0)
             
+            # Intraday refreshes barely move the price, so skip the prompt and API call entirely.
+            # Keyed per API key and on the non-price inputs, so new fundamentals always get a fresh analysis.
+            fundamentals = repr((company_name, stock_data.get('beta'), self.config.openai_api_key,
+                                 [company_info.get(field) for field in _AI_FUNDAMENTAL_FIELDS]))
+            latest_key = f"ai_{symbol}_latest_{hashlib.sha256(fundamentals.encode()).hexdigest()}"
+            if self.config.cache_enabled and current_price:
+                latest = disk_load(latest_key, ttl=_AI_LATEST_TTL)
+                if latest and abs(current_price - latest['price']) < _AI_PRICE_TOLERANCE * latest['price']:
+                    self.logger.info(f"Reusing AI analysis for {symbol} built at ${latest['price']:.2f}")
+                    self._replay_fields(latest['result'], on_field)
+                    return latest['result']
+            
             # Format financial data for calculations
-            free_cashflow = company_info.get('freeCashflow', 'N/A')
-            if free_cashflow != 'N/A' and free_cashflow is not None:
-                free_cashflow_str = f"${free_cashflow:,.0f}"
-            else:
-                free_cashflow_str = 'N/A'
-                
-            revenue = company_info.get('totalRevenue', 'N/A')
-            if revenue != 'N/A' and revenue is not None:
-                revenue_str = f"${revenue:,.0f}"
-            else:
-                revenue_str = 'N/A'
-                
-            total_debt = company_info.get('totalDebt', 'N/A')
-            if total_debt != 'N/A' and total_debt is not None:
-                total_debt_str = f"${total_debt:,.0f}"
-            else:
-                total_debt_str = 'N/A'
-                
-            total_cash = company_info.get('totalCash', 'N/A')
-            if total_cash != 'N/A' and total_cash is not None:
-                total_cash_str = f"${total_cash:,.0f}"
-            else:
-                total_cash_str = 'N/A'
-                
-            market_cap = stock_data.get('market_cap', 'N/A')
-            if market_cap != 'N/A' and market_cap is not None:
-                market_cap_str = f"${market_cap:,.0f}"
-            else:
-                market_cap_str = 'N/A'
-                
-            shares_outstanding = company_info.get('sharesOutstanding', 'N/A')
-            if shares_outstanding != 'N/A' and shares_outstanding is not None:
-                shares_outstanding_str = f"{shares_outstanding:,.0f}"
-            else:
-                shares_outstanding_str = 'N/A'
+            free_cashflow_str = _format_amount(company_info.get('freeCashflow'))
+            revenue_str = _format_amount(company_info.get('totalRevenue'))
+            total_debt_str = _format_amount(company_info.get('totalDebt'))
+            total_cash_str = _format_amount(company_info.get('totalCash'))
+            market_cap_str = _format_amount(stock_data.get('market_cap'))
+            shares_outstanding_str = _format_amount(company_info.get('sharesOutstanding'), prefix="")
             
             comprehensive_prompt = f"""
             PROFESSIONAL FINANCIAL ANALYSIS REQUIRED
@@ -424,53 +541,26 @@ class StockAnalyzer:
             DO THE MATH WITH REAL NUMBERS!
             """
             
-            self.logger.info("Making OpenAI API call...")
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # FREE model that works with your account
-                messages=[
-                    {"role": "system", "content": "You are a professional Wall Street equity research analyst. You provide balanced, objective analysis using real financial data. You calculate DCF and WACC using actual numbers from the financial statements. Your recommendations are based on rigorous valuation analysis, considering both bullish and bearish factors. You give BUY recommendations for significantly undervalued stocks, HOLD for fairly valued stocks, and SELL for overvalued stocks. Respond ONLY with valid JSON showing your calculations."},
-                    {"role": "user", "content": comprehensive_prompt}
-                ],
-                max_tokens=4000,  # Increased for comprehensive analysis
-                temperature=0.7
-            )
-            
-            self.logger.info(f"OpenAI API call completed. Response length: {len(response.choices[0].message.content)}")
-            
-            # Parse JSON response
-            import json
-            response_text = response.choices[0].message.content
-            
-            try:
-                # Try to parse as JSON
-                result = json.loads(response_text)
-                self.logger.info("JSON parsing successful")
-            except json.JSONDecodeError:
-                # If JSON parsing fails, extract manually
-                self.logger.warning("JSON parsing failed, extracting manually")
-                # Fallback: try to extract key fields from the text
-                import re
-                def extract(pattern, text, default=None):
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    return match.group(1).strip() if match else default
-                result = {
-                    "analysis": response_text,
-                    "investment_thesis": extract(r'"investment_thesis"\s*:\s*"([^"]+)"', response_text),
-                    "recommendation": extract(r'"recommendation"\s*:\s*"([^"]+)"', response_text, "N/A"),
-                    "target_price": extract(r'"target_price"\s*:\s*([\d.]+)', response_text, "N/A"),
-                    "upside_potential": extract(r'"upside_potential"\s*:\s*([\d.\-]+)', response_text, "N/A"),
-                    "highlights": re.findall(r'"highlights"\s*:\s*\[(.*?)\]', response_text, re.DOTALL),
-                    "risks": re.findall(r'"risks"\s*:\s*\[(.*?)\]', response_text, re.DOTALL)
-                }
-                # Try to clean up highlights/risks if found
-                if result["highlights"]:
-                    result["highlights"] = [h.strip(' ",') for h in result["highlights"][0].split(',') if h.strip()]
-                else:
-                    result["highlights"] = []
-                if result["risks"]:
-                    result["risks"] = [r.strip(' ",') for r in result["risks"][0].split(',') if r.strip()]
-                else:
-                    result["risks"] = []
+            # Identical prompts (same symbol and metrics) reuse the stored response for a day, per API key
+            prompt_key = None
+            result = None
+            if self.config.cache_enabled:
+                prompt_hash = hashlib.sha256((self.config.openai_api_key + comprehensive_prompt).encode()).hexdigest()
+                prompt_key = f"ai_{symbol}_{prompt_hash}"
+                result = disk_load(prompt_key, ttl=_AI_CACHE_TTL)
+            
+            if result is None:
+                # Truncated or regex-salvaged responses are shown but not stored, so the next run retries
+                result, complete = self._request_ai_analysis(comprehensive_prompt, on_field)
+                if prompt_key and complete:
+                    disk_store(prompt_key, result)
+            else:
+                # A cached response never streamed, so report all of its fields at once
+                self._replay_fields(result, on_field)
+                complete = True
+            
+            if self.config.cache_enabled and current_price and complete:
+                disk_store(latest_key, {'price': current_price, 'result': result})
             
             return result
             
@@ -486,24 +576,88 @@ class StockAnalyzer:
                 "upside_potential": 0
             }
     
-    def _get_ai_analysis(self, prompt: str) -> str:
-        """Get AI analysis using OpenAI GPT."""
+    def _replay_fields(self, result: Dict[str, Any], on_field: Optional[Callable[[str, Any], None]]) -> None:
+        """Report every field of a cached analysis to on_field, if given."""
+        if on_field:
+            for name, value in result.items():
+                on_field(name, value)
+    
+    def _request_ai_analysis(self, comprehensive_prompt: str,
+                             on_field: Optional[Callable[[str, Any], None]] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Stream the analysis from OpenAI and parse it, falling back to regex extraction for malformed JSON.
+        
+        Returns:
+            The parsed analysis, and whether it is complete: neither cut off at max_tokens nor regex-salvaged
+        """
+        self.logger.info("Making OpenAI API call...")
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",  # FREE model that works with your account
+            messages=[
+                {"role": "system", "content": "You are a professional Wall Street equity research analyst. You provide balanced, objective analysis using real financial data. You calculate DCF and WACC using actual numbers from the financial statements. Your recommendations are based on rigorous valuation analysis, considering both bullish and bearish factors. You give BUY recommendations for significantly undervalued stocks, HOLD for fairly valued stocks, and SELL for overvalued stocks. Respond ONLY with valid JSON showing your calculations."},
+                {"role": "user", "content": comprehensive_prompt}
+            ],
+            max_tokens=_AI_MAX_TOKENS,
+            temperature=0.3,  # Lower entropy keeps the JSON compliant
+            response_format={"type": "json_object"},  # Guarantees parseable JSON on the happy path
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        # Collect the streamed tokens, handing each top-level field to on_field as soon as it closes
+        chunks = []
+        complete = True
+        fields = _JsonFieldStream() if on_field else None
+        for chunk in response:
+            if getattr(chunk, 'usage', None):
+                self.logger.info(f"OpenAI completion tokens: {chunk.usage.completion_tokens}/{_AI_MAX_TOKENS}")
+            if not chunk.choices:
+                continue
+            if chunk.choices[0].finish_reason == "length":
+                complete = False
+                self.logger.warning(f"OpenAI response truncated at max_tokens={_AI_MAX_TOKENS}")
+            delta = chunk.choices[0].delta.content or ""
+            chunks.append(delta)
+            if fields:
+                for name, value in fields.feed(delta):
+                    on_field(name, value)
+        response_text = "".join(chunks)
+        
+        self.logger.info(f"OpenAI API call completed. Response length: {len(response_text)}")
+        
+        # Parse JSON response
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # FREE model that works with your account
-                messages=[
-                    {"role": "system", "content": "You are a senior Wall Street equity research analyst with 15+ years of experience. Provide detailed, professional analysis with specific insights and actionable conclusions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=3000,  # Increased for comprehensive analysis
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            self.logger.error(f"Error getting AI analysis: {str(e)}")
-            return "AI analysis temporarily unavailable."
+            # Try to parse as JSON (orjson when installed; its decode error subclasses json's)
+            result = orjson.loads(response_text) if orjson else json.loads(response_text)
+            self.logger.info("JSON parsing successful")
+        except json.JSONDecodeError:
+            complete = False
+            # If JSON parsing fails, extract manually
+            self.logger.warning("JSON parsing failed, extracting manually")
+            # Fallback: try to extract key fields from the text
+            def extract(pattern, text, default=None):
+                match = pattern.search(text)
+                return match.group(1).strip() if match else default
+            result = {
+                "analysis": response_text,
+                "investment_thesis": extract(_RE_THESIS, response_text),
+                "recommendation": extract(_RE_RECOMMENDATION, response_text, "N/A"),
+                "target_price": extract(_RE_TARGET_PRICE, response_text, "N/A"),
+                "upside_potential": extract(_RE_UPSIDE, response_text, "N/A"),
+                "highlights": _RE_HIGHLIGHTS.search(response_text),
+                "risks": _RE_RISKS.search(response_text)
+            }
+            # Try to clean up highlights/risks if found
+            if result["highlights"]:
+                result["highlights"] = [h.strip(' ",') for h in result["highlights"].group(1).split(',') if h.strip()]
+            else:
+                result["highlights"] = []
+            if result["risks"]:
+                result["risks"] = [r.strip(' ",') for r in result["risks"].group(1).split(',') if r.strip()]
+            else:
+                result["risks"] = []
+        
+        return result, complete
     
     def _calculate_financial_ratios(self, stock_data: Dict[str, Any]) -> Dict[str, float]:
         """Calculate key financial ratios."""
@@ -512,25 +666,12 @@ class StockAnalyzer:
         try:
             info = stock_data.get("company_info", {})
             
-            # Profitability ratios
-            ratios["profit_margin"] = info.get("profitMargins")
-            ratios["operating_margin"] = info.get("operatingMargins")
-            ratios["roe"] = info.get("returnOnEquity")
-            ratios["roa"] = info.get("returnOnAssets")
-            
-            # Valuation ratios
-            ratios["pe_ratio"] = info.get("trailingPE")
-            ratios["peg_ratio"] = info.get("pegRatio")
-            ratios["price_to_book"] = info.get("priceToBook")
-            ratios["price_to_sales"] = info.get("priceToSalesTrailing12Months")
-            
-            # Liquidity ratios
-            ratios["current_ratio"] = info.get("currentRatio")
-            ratios["quick_ratio"] = info.get("quickRatio")
-            
-            # Leverage ratios
-            ratios["debt_to_equity"] = info.get("debtToEquity")
-            ratios["debt_to_assets"] = info.get("totalDebt", 0) / info.get("totalAssets", 1) if info.get("totalAssets") else None
+            ratios.update((name, info.get(field)) for name, field in _RATIO_FIELDS.items())
+            
+            # Leverage: debt over assets, only when both figures are reported
+            total_assets = info.get("totalAssets")
+            total_debt = info.get("totalDebt")
+            ratios["debt_to_assets"] = total_debt / total_assets if total_assets and total_debt is not None else None
             
         except Exception as e:
             self.logger.error(f"Error calculating financial ratios: {str(e)}")
@@ -0,0 +1,108 @@
+"""
+Valuation Kernels
+Numba-compiled numeric cores for the DCF and WACC calculations.
+Inputs are plain floats and float64 arrays so the kernels stay free of pandas objects.
+"""
+
+import os
+import sys
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.jit import njit, prange
+
+
+@njit('f8(f8, f8, f8)', cache=True, fastmath=True)
+def capm_cost_of_equity(risk_free_rate, beta, market_risk_premium):
+    """Cost of equity via CAPM: rf + beta * MRP."""
+    return risk_free_rate + beta * market_risk_premium
+
+
+@njit('f8(f8[:], f8)', cache=True, fastmath=True)
+def discounted_sum(cash_flows, rate):
+    """Present value of cash flows received at the end of years 1..n."""
+    total = 0.0
+    factor = 1.0
+    for i in range(cash_flows.shape[0]):
+        factor *= 1.0 + rate
+        total += cash_flows[i] / factor
+    return total
+
+
+@njit('Tuple((f8[:], f8[:], f8, f8, f8))(f8, f8, f8, f8, i8)', cache=True, fastmath=True)
+def dcf_projection(base_cash_flow, growth, terminal_growth, rate, years):
+    """Single-stage DCF: cash flows growing at a constant rate for years 1..n, then a Gordon terminal value.
+
+    Returns the projected cash flows, their present values, the sum of those present
+    values, the terminal value and the terminal value's present value.
+    """
+    projected = np.empty(years)
+    present_value = np.empty(years)
+    cash_flow = base_cash_flow
+    factor = 1.0
+    total = 0.0
+    for i in range(years):
+        cash_flow *= 1.0 + growth
+        factor *= 1.0 + rate
+        projected[i] = cash_flow
+        present_value[i] = cash_flow / factor
+        total += present_value[i]
+    terminal_value = cash_flow * (1.0 + terminal_growth) / (rate - terminal_growth)
+    return projected, present_value, total, terminal_value, terminal_value / factor
+
+
+@njit('f8(f8, f8, f8)', cache=True, fastmath=True)
+def weighted_cost_of_capital(cost_of_equity, after_tax_cost_of_debt, debt_to_equity):
+    """WACC from the cost of each source and the debt-to-equity ratio."""
+    return (cost_of_equity + debt_to_equity * after_tax_cost_of_debt) / (1.0 + debt_to_equity)
+
+
+@njit('f8(f8, f8, f8)', cache=True, fastmath=True)
+def gordon_terminal_value(final_cash_flow, terminal_growth, rate):
+    """Terminal value of a cash flow growing at a constant rate forever."""
+    return final_cash_flow * (1.0 + terminal_growth) / (rate - terminal_growth)
+
+
+@njit('Tuple((f8[:], f8[:]))(f8, f8[:], f8[:], f8[:], i8)', cache=True, fastmath=True, parallel=True)
+def dcf_scenarios(free_cash_flow, wacc, growth, terminal_growth, years):
+    """Enterprise and terminal values for N DCF scenarios in one fused, parallel loop.
+
+    Growth decays by 10% a year from each scenario's starting rate, matching
+    FinancialCalculator's single-scenario projection.
+    """
+    n = wacc.shape[0]
+    enterprise_value = np.empty(n)
+    terminal_value = np.empty(n)
+    for i in prange(n):
+        cash_flow = free_cash_flow
+        growth_rate = growth[i]
+        factor = 1.0
+        total = 0.0
+        for _ in range(years):
+            cash_flow *= 1.0 + growth_rate
+            growth_rate *= 0.9
+            factor *= 1.0 + wacc[i]
+            total += cash_flow / factor
+        terminal_value[i] = cash_flow * (1.0 + terminal_growth[i]) / (wacc[i] - terminal_growth[i])
+        enterprise_value[i] = total + terminal_value[i] / factor
+    return enterprise_value, terminal_value
+
+
+@njit('f8[:](f8, f8[:], f8[:], f8[:], i8)', cache=True, fastmath=True, parallel=True)
+def dcf_paths(base_cash_flow, growth, terminal_growth, rate, years):
+    """Fair values of N single-stage DCF paths (see dcf_projection), one per set of sampled assumptions."""
+    n = growth.shape[0]
+    fair_value = np.empty(n)
+    for i in prange(n):
+        cash_flow = base_cash_flow
+        factor = 1.0
+        total = 0.0
+        for _ in range(years):
+            cash_flow *= 1.0 + growth[i]
+            factor *= 1.0 + rate[i]
+            total += cash_flow / factor
+        fair_value[i] = total + cash_flow * (1.0 + terminal_growth[i]) / (rate[i] - terminal_growth[i]) / factor
+    return fair_value
+
@@ -2,6 +2,12 @@
 Stock Pitch AI - Presentation Package
 """
 
-from .pitch_generator import PitchGenerator
-
 __all__ = ['PitchGenerator']
+
+
+def __getattr__(name):
+    # Resolved on first access so importing the free or AI generator doesn't load openai
+    if name == 'PitchGenerator':
+        from .pitch_generator import PitchGenerator
+        return PitchGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,81 @@
+"""
+Deck Template
+Keeps python-pptx's blank template in memory so each new deck skips the disk read,
+appends runs of bullet paragraphs to a text body in a single XML parse, and
+serializes finished decks in memory or to a file with one write.
+"""
+import io
+import os
+import re
+from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import escape
+
+import pptx
+from pptx import Presentation
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.presentation import Presentation as PresentationType
+from pptx.util import Length
+
+# The same default.pptx Presentation() opens when called without a file, read once at import
+_TEMPLATE_BYTES = (Path(pptx.__file__).parent / 'templates' / 'default.pptx').read_bytes()
+
+# Same splitting and escaping rules python-pptx applies when assigning paragraph.text
+_RE_LINE_BREAK = re.compile('\n|\v')
+_RE_CTRL_CHARS = re.compile(r'([\x00-\x08\x0B-\x1F])')
+
+def new_presentation() -> PresentationType:
+    """Return a fresh, empty presentation parsed from the in-memory template."""
+    return Presentation(io.BytesIO(_TEMPLATE_BYTES))
+
+def presentation_bytes(prs: PresentationType) -> bytes:
+    """Serialize a deck to .pptx bytes without touching the disk."""
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+def save_presentation(prs: PresentationType, filepath: str) -> None:
+    """Save a deck by zipping it in memory and writing the file in one call.
+
+    prs.save(filepath) streams each zip entry to the file as it is compressed,
+    which costs dozens of small writes per deck. The file's directory is created
+    if it doesn't exist.
+    """
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    try:
+        f = open(filepath, 'wb')
+    except FileNotFoundError:
+        # Only create the output directory when it is actually missing
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        f = open(filepath, 'wb')
+    with f:
+        f.write(buffer.getbuffer())
+
+def _escape_ctrl_char(match: re.Match) -> str:
+    return '_x%04X_' % ord(match.group(1))
+
+def _runs_xml(text: str) -> str:
+    """Runs for one paragraph's text, with line breaks where text has newlines."""
+    return '<a:br/>'.join(f'<a:r><a:t>{escape(_RE_CTRL_CHARS.sub(_escape_ctrl_char, part))}</a:t></a:r>'
+                          if part else '' for part in _RE_LINE_BREAK.split(text))
+
+def render_paragraphs(txBody, lines: Iterable[str], size: Length, level: int = 0, bold: bool = False) -> None:
+    """Append one paragraph per line to a text body.
+
+    Produces the same XML as add_paragraph() followed by setting text, font.size,
+    font.bold and level, but builds every paragraph in one string and parses it once.
+
+    Args:
+        txBody: The text frame's underlying p:txBody element
+        lines: Paragraph texts, in order
+        size: Font size for every paragraph
+        level: Indentation level for every paragraph
+        bold: Whether every paragraph is bold
+    """
+    ppr = (f'<a:pPr lvl="{level}">' if level else '<a:pPr>') + \
+        f'<a:defRPr sz="{size.centipoints}"' + (' b="1"' if bold else '') + '/></a:pPr>'
+    body = ''.join(f'<a:p>{ppr}{_runs_xml(line)}</a:p>' for line in lines)
+    if body:
+        txBody.extend(parse_xml(f'<a:txBody {nsdecls("a")}>{body}</a:txBody>'))
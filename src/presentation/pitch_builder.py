@@ -0,0 +1,75 @@
+"""
+Pitch Builder
+Shared deck layout for the free and AI generators: a title slide, then one
+title-and-content slide per section, returned as .pptx bytes.
+"""
+
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from pptx.util import Length, Pt
+
+from presentation.deck_template import new_presentation, presentation_bytes, render_paragraphs
+
+# Header and bullet sizes on the highlights & risks slide
+_PT_13, _PT_15 = Pt(13), Pt(15)
+
+class Block(NamedTuple):
+    """A run of paragraphs that share one style."""
+    lines: Sequence[str]
+    size: Length
+    level: int = 0
+    bold: bool = False
+
+class Section(NamedTuple):
+    """One content slide: its title, the text frame's first paragraph and the blocks after it."""
+    title: str
+    lead: Optional[str]
+    lead_size: Optional[Length] = None
+    lead_bold: bool = False
+    lead_font: Optional[str] = None
+    blocks: Sequence[Block] = ()
+
+def highlights_and_risks(title: str, highlights: Sequence, risks: Sequence) -> Section:
+    """Section listing key highlights then key risks as bullets under bold headers."""
+    blocks = [Block([f"• {h}" for h in highlights], _PT_13, level=1)] if highlights else []
+    if risks:
+        blocks += [Block(["Key Risks:"], _PT_15, bold=True), Block([f"• {r}" for r in risks], _PT_13, level=1)]
+    return Section(title, "Key Highlights:" if highlights else None, _PT_15, lead_bold=True, blocks=blocks)
+
+def build_pitch(symbol: str, mode: str, subtitle: str, sections: Iterable[Section]) -> bytes:
+    """
+    Build a pitch deck in memory.
+
+    Args:
+        symbol: Stock symbol, shown on the title slide
+        mode: Analysis mode shown in the title ("Free", "AI")
+        subtitle: First line of the title slide's subtitle; the date goes on the second
+        sections: Content slides in order; a section whose lead is None leaves its first paragraph empty
+
+    Returns:
+        The deck as .pptx bytes, ready to hand to a download
+    """
+    prs = new_presentation()
+    # Title and title-and-content layouts, looked up once for every slide that uses them
+    title_layout, content_layout = prs.slide_layouts[0], prs.slide_layouts[1]
+    # Title slide
+    title_slide = prs.slides.add_slide(title_layout)
+    title_slide.shapes.title.text = f"{symbol} Stock Pitch ({mode} Mode)"
+    title_slide.placeholders[1].text = f"{subtitle}\n{datetime.now().strftime('%B %d, %Y')}"
+    # Content slides
+    for section in sections:
+        slide = prs.slides.add_slide(content_layout)
+        slide.shapes.title.text = section.title
+        tf = slide.placeholders[1].text_frame
+        if section.lead is not None:
+            p = tf.paragraphs[0]
+            p.text = section.lead
+            p.font.size = section.lead_size
+            if section.lead_bold:
+                p.font.bold = True
+            if section.lead_font:
+                p.font.name = section.lead_font
+        for block in section.blocks:
+            render_paragraphs(tf._txBody, block.lines, block.size, level=block.level, bold=block.bold)
+    return presentation_bytes(prs)
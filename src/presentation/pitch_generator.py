@@ -17,6 +17,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import setup_logger
+from presentation.deck_template import new_presentation, save_presentation
 
 class PitchGenerator:
     """AI-powered presentation generator for stock pitches."""
@@ -63,7 +64,7 @@ class PitchGenerator:
             self.logger.info(f"Creating presentation for {symbol}")
             
             # Create presentation object
-            prs = Presentation()
+            prs = new_presentation()
             
             # Apply template
             if style in self.templates:
@@ -392,6 +393,6 @@ class PitchGenerator:
         filepath = os.path.join(output_dir, filename)
         
         # Save presentation
-        prs.save(filepath)
+        save_presentation(prs, filepath)
         
         return filepath
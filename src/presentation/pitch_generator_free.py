@@ -3,110 +3,42 @@ Free Version Presentation Generator
 Generates a basic PowerPoint using only non-AI analysis results.
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-from datetime import datetime
+from functools import lru_cache
+from pptx.util import Pt
 from typing import Dict, Any
-import os
 
-def create_presentation_free(symbol: str, analysis_results: Dict[str, Any], info: Dict[str, Any]) -> str:
-    prs = Presentation()
-    # Title slide
-    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
-    title = title_slide.shapes.title
-    subtitle = title_slide.placeholders[1]
-    title.text = f"{symbol} Stock Pitch (Free Mode)"
-    subtitle.text = f"Investment Analysis - {info.get('longName', symbol)}\n{datetime.now().strftime('%B %d, %Y')}"
-    # Executive Summary
-    summary_slide = prs.slides.add_slide(prs.slide_layouts[1])
-    summary_title = summary_slide.shapes.title
-    summary_title.text = "Executive Summary"
-    content = summary_slide.placeholders[1]
-    tf = content.text_frame
-    p = tf.paragraphs[0]
-    p.text = analysis_results.get('investment_thesis', 'Investment thesis not available')
-    p.font.size = Pt(16)
-    # Key Metrics
+from presentation.pitch_builder import Block, Section, build_pitch, highlights_and_risks
+
+# Font sizes used throughout the deck, built once instead of per paragraph
+_PT_13, _PT_14, _PT_15, _PT_16, _PT_22 = Pt(13), Pt(14), Pt(15), Pt(16), Pt(22)
+
+@lru_cache(maxsize=None)
+def _label(key: str) -> str:
+    """Display label for a metric or ratio key, e.g. 'pe_ratio' -> 'Pe Ratio'."""
+    return key.replace('_', ' ').title()
+
+def create_presentation_free(symbol: str, analysis_results: Dict[str, Any], info: Dict[str, Any]) -> bytes:
+    # Executive Summary with key metrics and financial ratios
     metrics = analysis_results.get('metrics', {})
-    for key, value in metrics.items():
-        if value is not None:
-            p = tf.add_paragraph()
-            p.text = f"{key.replace('_', ' ').title()}: {value}"
-            p.font.size = Pt(14)
-            p.level = 1
-    # Financial Ratios
     ratios = analysis_results.get('financial_ratios', {})
+    summary = [Block([f"{_label(key)}: {value}" for key, value in metrics.items() if value is not None],
+                     _PT_14, level=1)]
     if ratios:
-        p = tf.add_paragraph()
-        p.text = "Financial Ratios:"
-        p.font.size = Pt(15)
-        p.font.bold = True
-        for k, v in ratios.items():
-            p = tf.add_paragraph()
-            p.text = f"{k.replace('_', ' ').title()}: {v}"
-            p.font.size = Pt(13)
-            p.level = 1
+        summary += [Block(["Financial Ratios:"], _PT_15, bold=True),
+                    Block([f"{_label(k)}: {v}" for k, v in ratios.items()], _PT_13, level=1)]
+    sections = [Section("Executive Summary", analysis_results.get('investment_thesis', 'Investment thesis not available'),
+                        _PT_16, blocks=summary)]
     # Detailed Summary Slide
     ai_analysis = analysis_results.get('ai_analysis', '')
     if ai_analysis:
-        detail_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        detail_slide.shapes.title.text = "Detailed Analysis"
-        content = detail_slide.placeholders[1]
-        tf = content.text_frame
-        p = tf.paragraphs[0]
-        p.text = ai_analysis
-        p.font.size = Pt(13)
-        p.font.name = 'Consolas'
+        sections.append(Section("Detailed Analysis", ai_analysis, _PT_13, lead_font='Consolas'))
     # Highlights & Risks Slide
     highlights = analysis_results.get('key_highlights', [])
     risks = analysis_results.get('risks', [])
     if highlights or risks:
-        hr_slide = prs.slides.add_slide(prs.slide_layouts[1])
-        hr_slide.shapes.title.text = "Highlights & Risks"
-        content = hr_slide.placeholders[1]
-        tf = content.text_frame
-        if highlights:
-            p = tf.paragraphs[0]
-            p.text = "Key Highlights:"
-            p.font.size = Pt(15)
-            p.font.bold = True
-            for h in highlights:
-                p = tf.add_paragraph()
-                p.text = f"• {h}"
-                p.font.size = Pt(13)
-                p.level = 1
-        if risks:
-            p = tf.add_paragraph()
-            p.text = "Key Risks:"
-            p.font.size = Pt(15)
-            p.font.bold = True
-            for r in risks:
-                p = tf.add_paragraph()
-                p.text = f"• {r}"
-                p.font.size = Pt(13)
-                p.level = 1
+        sections.append(highlights_and_risks("Highlights & Risks", highlights, risks))
     # Recommendation Slide
-    rec_slide = prs.slides.add_slide(prs.slide_layouts[1])
-    rec_slide.shapes.title.text = "Investment Recommendation"
-    content = rec_slide.placeholders[1]
-    tf = content.text_frame
-    rec = analysis_results.get('recommendation', 'HOLD')
-    p = tf.paragraphs[0]
-    p.text = f"Recommendation: {rec}"
-    p.font.size = Pt(22)
-    p.font.bold = True
     thesis = analysis_results.get('investment_thesis', '')
-    if thesis:
-        p = tf.add_paragraph()
-        p.text = thesis
-        p.font.size = Pt(14)
-        p.level = 1
-    # Save
-    output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
-    filename = f"{symbol}_stock_pitch_free_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"
-    filepath = os.path.join(output_dir, filename)
-    prs.save(filepath)
-    return filepath
+    sections.append(Section("Investment Recommendation", f"Recommendation: {analysis_results.get('recommendation', 'HOLD')}",
+                            _PT_22, lead_bold=True, blocks=[Block([thesis] if thesis else [], _PT_14, level=1)]))
+    return build_pitch(symbol, "Free", f"Investment Analysis - {info.get('longName', symbol)}", sections)
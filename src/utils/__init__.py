@@ -2,7 +2,14 @@
 Stock Pitch AI - Utilities Package
 """
 
-from .config import Config
 from .logger import setup_logger
 
-__all__ = ['Config', 'setup_logger']
+__all__ = ['Config', 'get_config', 'setup_logger']
+
+
+def __getattr__(name):
+    # Resolved on first access so importing utils.logger doesn't load pydantic_settings
+    if name in ('Config', 'get_config'):
+        from . import config
+        return getattr(config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,13 +4,16 @@ Handles environment variables, API keys, and application settings.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
-# Load environment variables
-load_dotenv()
+@lru_cache(maxsize=1)
+def _ensure_env() -> None:
+    """Load .env into the environment, once, when the first Config is created."""
+    load_dotenv()
 
 class Config(BaseSettings):
     """Configuration class for Stock Pitch AI."""
@@ -44,6 +47,7 @@ class Config(BaseSettings):
     
     def __init__(self, api_key: Optional[str] = None, **kwargs):
         """Initialize configuration with optional API key override."""
+        _ensure_env()
         if api_key:
             kwargs['openai_api_key'] = api_key
         super().__init__(**kwargs)
@@ -57,3 +61,8 @@ class Config(BaseSettings):
 
 # Global configuration instance can be created with API key when needed
 # config = Config(openai_api_key="your_api_key_here")
+
+@lru_cache(maxsize=8)
+def get_config(api_key: Optional[str] = None) -> Config:
+    """Shared Config per API key, validated from the environment only on first use."""
+    return Config(api_key=api_key)
@@ -0,0 +1,122 @@
+"""
+On-disk result cache for Stock Pitch AI
+Pickles slow network results so warm fetches survive process restarts.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CACHE_DIR = "cache"
+DEFAULT_TTL = 3600
+
+# No caller reads with a longer ttl, so older files can never be served; writes sweep them away
+# (including temp files left by interrupted writes) at most once per _PRUNE_INTERVAL seconds
+MAX_TTL = 24 * 3600
+_PRUNE_INTERVAL = 3600
+_last_prune = 0.0
+
+# Returned by disk_load on a miss inside disk_cached, so a cached None still counts as a hit
+_MISSING = object()
+
+
+def _cache_path(key: str) -> str:
+    """File path for a cache key; characters unsafe in file names are replaced."""
+    safe_key = "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+    return os.path.join(CACHE_DIR, f"{safe_key}.pkl")
+
+
+def disk_load(key: str, ttl: int = DEFAULT_TTL, default: Any = None) -> Any:
+    """
+    Return the value stored under key if it is younger than ttl seconds.
+    
+    Args:
+        key: Cache key
+        ttl: Maximum age of a cached value in seconds
+        default: Returned when there is no fresh, readable entry
+        
+    Returns:
+        The cached value or default
+    """
+    path = _cache_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+    except Exception:
+        # Unreadable, torn or version-skewed pickles can raise almost anything; all are misses
+        pass
+    return default
+
+
+def disk_store(key: str, value: Any) -> None:
+    """Pickle value under key, replacing any previous entry atomically."""
+    path = _cache_path(key)
+    tmp_path = None
+    try:
+        # A unique temp file per write, so threads storing the same key never share one
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        except FileNotFoundError:
+            # First write, or the cache directory was cleared
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except Exception as e:
+        logger.warning(f"Error writing disk cache: {str(e)}")
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    global _last_prune
+    if time.time() - _last_prune > _PRUNE_INTERVAL:
+        _last_prune = time.time()
+        _prune(MAX_TTL)
+
+
+def _prune(max_age: float) -> None:
+    """Delete cache files last written more than max_age seconds ago."""
+    now = time.time()
+    try:
+        entries = os.scandir(CACHE_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > max_age:
+                    os.remove(entry.path)
+            except OSError:
+                # Replaced or removed by another writer meanwhile
+                pass
+
+
+def disk_cached(key: str, loader: Callable[[], Any], ttl: int = DEFAULT_TTL) -> Any:
+    """
+    Return a pickled result younger than ttl seconds, else call loader and store it.
+    
+    Args:
+        key: Cache key; characters unsafe in file names are replaced
+        loader: Zero-argument callable producing the value on a miss
+        ttl: Maximum age of a cached value in seconds
+        
+    Returns:
+        The cached or freshly loaded value
+    """
+    result = disk_load(key, ttl, _MISSING)
+    if result is _MISSING:
+        result = loader()
+        disk_store(key, result)
+    return result
@@ -3,10 +3,61 @@ Logging configuration for Stock Pitch AI
 Provides structured logging across the application.
 """
 
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
 from datetime import datetime
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+# Log file rotation
+_LOG_MAX_BYTES = 10_000_000
+_LOG_BACKUP_COUNT = 5
+
+class _DetailedFormatter(logging.Formatter):
+    """Detailed file format built with one f-string rather than %-style substitution."""
+    
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        # Records carrying a traceback or stack take the standard path to get those appended
+        if record.exc_info or record.exc_text or record.stack_info:
+            return super().format(record)
+        return (f"{self.formatTime(record)} - {record.name} - {record.levelname} - "
+                f"{record.funcName}:{record.lineno} - {record.getMessage()}")
+
+# One handler per log file, shared by every logger so rotation happens in one place
+_file_handlers: Dict[str, RotatingFileHandler] = {}
+
+def _file_handler(log_file: str, formatter: logging.Formatter) -> RotatingFileHandler:
+    """Return the shared rotating handler for a log file."""
+    handler = _file_handlers.get(log_file)
+    if handler is None:
+        # Create logs directory if it doesn't exist
+        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        handler = RotatingFileHandler(log_file, maxBytes=_LOG_MAX_BYTES, backupCount=_LOG_BACKUP_COUNT)
+        handler.setLevel(logging.DEBUG)
+        handler.setFormatter(formatter)
+        _file_handlers[log_file] = handler
+    return handler
+
+# Worker processes never open the log file, so only the parent rotates it. Their loggers are kept here
+# and, once forward_to_parent is called, send file records to the parent through its queue.
+_worker_loggers: List[logging.Logger] = []
+_parent_log_queue = None
+
+def _in_worker_process() -> bool:
+    """Whether this is a child process (e.g. an analyze_many worker) rather than the app itself."""
+    return multiprocessing.parent_process() is not None
+
+def _forwarding_handler(log_queue) -> QueueHandler:
+    """Handler sending every record to the parent process's log file."""
+    handler = QueueHandler(log_queue)
+    handler.setLevel(logging.DEBUG)
+    return handler
 
 def setup_logger(name: Optional[str] = None, log_level: str = "INFO") -> logging.Logger:
     """
@@ -33,9 +84,7 @@ def setup_logger(name: Optional[str] = None, log_level: str = "INFO") -> logging
         return logger
     
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-    )
+    detailed_formatter = _DetailedFormatter()
     
     simple_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s'
@@ -48,24 +97,73 @@ def setup_logger(name: Optional[str] = None, log_level: str = "INFO") -> logging
     logger.addHandler(console_handler)
     
     # File handler
+    if _in_worker_process():
+        _worker_loggers.append(logger)
+        if _parent_log_queue is not None:
+            logger.addHandler(_forwarding_handler(_parent_log_queue))
+        return logger
+    
     try:
-        # Create logs directory if it doesn't exist
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
         # Create log file with timestamp
         timestamp = datetime.now().strftime("%Y%m%d")
-        log_file = os.path.join(log_dir, f"stock_pitch_ai_{timestamp}.log")
+        log_file = os.path.join("logs", f"stock_pitch_ai_{timestamp}.log")
         
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(_file_handler(log_file, detailed_formatter))
         
     except Exception as e:
         logger.warning(f"Could not set up file logging: {e}")
     
     return logger
 
+def queue_handlers(logger: logging.Logger) -> logging.Logger:
+    """
+    Move a logger's handlers behind a QueueHandler so log calls never block on I/O.
+    
+    Args:
+        logger: Logger whose existing handlers should run on a background listener
+        
+    Returns:
+        The same logger, now writing through a queue
+    """
+    handlers = list(logger.handlers)
+    if not handlers or any(isinstance(h, QueueHandler) for h in handlers):
+        return logger
+    
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
+
+def forward_to_parent(log_queue) -> None:
+    """
+    In a worker process, send file records from every logger to the parent's log file.
+    
+    Args:
+        log_queue: Multiprocessing queue the parent is draining with listen_for_workers
+    """
+    global _parent_log_queue
+    _parent_log_queue = log_queue
+    for logger in _worker_loggers:
+        logger.addHandler(_forwarding_handler(log_queue))
+
+def listen_for_workers(log_queue) -> QueueListener:
+    """
+    Write records forwarded by worker processes to this process's log files.
+    
+    Args:
+        log_queue: Multiprocessing queue handed to the workers' forward_to_parent
+        
+    Returns:
+        The running listener; stop() it once the workers have exited
+    """
+    listener = QueueListener(log_queue, *_file_handlers.values(), respect_handler_level=True)
+    listener.start()
+    return listener
+
 # Create default logger
 default_logger = setup_logger("stock_pitch_ai")
@@ -0,0 +1,20 @@
+"""
+Shared test setup
+Puts src/ on the import path, as app.py does, and keeps the on-disk cache in a temp directory.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point utils.disk_cache at a fresh directory so tests never read or leave real cache files."""
+    from utils import disk_cache
+    path = tmp_path / 'cache'
+    monkeypatch.setattr(disk_cache, 'CACHE_DIR', str(path))
+    return path
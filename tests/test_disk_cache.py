@@ -0,0 +1,126 @@
+"""
+On-disk result cache: hits, expiry and unreadable entries.
+"""
+
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils import disk_cache
+from utils.disk_cache import _cache_path, _prune, disk_cached, disk_load, disk_store
+
+
+def _loader(value):
+    """Loader returning value and counting its calls."""
+    def load():
+        load.calls += 1
+        return value
+    load.calls = 0
+    return load
+
+
+def test_round_trip_creates_the_directory(cache_dir):
+    frame = pd.DataFrame({'Close': [1.0, 2.0]})
+    disk_store('AAPL_history_1y', frame)
+    assert cache_dir.is_dir()
+    pd.testing.assert_frame_equal(disk_load('AAPL_history_1y'), frame)
+
+
+def test_cached_loads_once_and_keeps_none():
+    load = _loader(None)
+    assert disk_cached('empty', load) is None
+    assert disk_cached('empty', load) is None
+    assert load.calls == 1
+
+
+def test_expired_entry_is_reloaded():
+    load = _loader({'price': 1.0})
+    disk_cached('quote', load, ttl=60)
+    old = time.time() - 120
+    os.utime(_cache_path('quote'), (old, old))
+    assert disk_load('quote', ttl=60, default='stale') == 'stale'
+    disk_cached('quote', load, ttl=60)
+    assert load.calls == 2
+
+
+def test_unreadable_entry_is_a_miss(cache_dir):
+    cache_dir.mkdir()
+    with open(_cache_path('broken'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert disk_load('broken', default='miss') == 'miss'
+    assert disk_cached('broken', _loader(3)) == 3
+    assert disk_load('broken') == 3
+
+
+def test_pickle_of_a_missing_class_is_a_miss(cache_dir):
+    cache_dir.mkdir()
+    with open(_cache_path('skewed'), 'wb') as f:
+        f.write(b'cno_such_module\nThing\n.')
+    assert disk_load('skewed', default='miss') == 'miss'
+
+
+def test_unsafe_key_characters_are_replaced(cache_dir):
+    disk_store('ai/BRK.B latest', 1)
+    assert [path.name for path in cache_dir.iterdir()] == ['ai_BRK.B_latest.pkl']
+    assert disk_load('ai/BRK.B latest') == 1
+
+
+
+def test_concurrent_writers_never_expose_a_torn_entry():
+    # Large enough to pickle in many frames, so interleaved writes would tear the file
+    values = [[i] * 50_000 + [str(j) for j in range(20_000)] for i in range(4)]
+    errors = []
+    done = threading.Event()
+
+    def write(value):
+        for _ in range(40):
+            disk_store('shared', value)
+
+    def read():
+        while not done.is_set():
+            try:
+                value = disk_load('shared')
+            except Exception as e:
+                errors.append(repr(e))
+            else:
+                if value is not None and value not in values:
+                    errors.append('torn value')
+
+    writers = [threading.Thread(target=write, args=(value,)) for value in values]
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
+    assert disk_load('shared') in values
+
+
+def test_prune_removes_only_expired_files(cache_dir):
+    disk_store('old', 1)
+    disk_store('new', 2)
+    old = time.time() - disk_cache.MAX_TTL - 60
+    os.utime(_cache_path('old'), (old, old))
+    _prune(disk_cache.MAX_TTL)
+    assert sorted(path.name for path in cache_dir.iterdir()) == ['new.pkl']
+
+
+def test_store_sweeps_expired_files(cache_dir, monkeypatch):
+    disk_store('old', 1)
+    old = time.time() - disk_cache.MAX_TTL - 60
+    os.utime(_cache_path('old'), (old, old))
+    monkeypatch.setattr(disk_cache, '_last_prune', 0.0)
+    disk_store('new', 2)
+    assert sorted(path.name for path in cache_dir.iterdir()) == ['new.pkl']
+
+
+def test_write_failure_is_logged_not_raised(cache_dir, caplog):
+    cache_dir.write_text('a file where the directory should be')
+    disk_store('key', 1)
+    assert 'Error writing disk cache' in caplog.text
+    assert disk_load('key', default='miss') == 'miss'
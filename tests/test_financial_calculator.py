@@ -0,0 +1,76 @@
+"""
+FinancialCalculator batch DCF against its single-scenario valuation.
+Statements are seeded into the calculator's cache, so no network is used.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analysis.financial_calculator import FinancialCalculator, WACCResult
+
+_PERIODS = pd.to_datetime(['2024-12-31', '2023-12-31', '2022-12-31', '2021-12-31'])
+
+
+def _calculator():
+    """Calculator for a made-up company with four years of statements."""
+    calc = FinancialCalculator('TEST')
+    calc._cache.update({
+        'info': {'marketCap': 5.0e11, 'sharesOutstanding': 2.5e9, 'currentPrice': 200.0,
+                 'totalCash': 6.0e10, 'beta': 1.1},
+        'financials': pd.DataFrame({
+            'Total Revenue': [1.2e11, 1.05e11, 9.4e10, 8.1e10],
+            'Net Income': [2.4e10, 2.0e10, 1.7e10, 1.4e10],
+            'Pretax Income': [3.0e10, 2.5e10, 2.1e10, 1.8e10],
+            'Tax Provision': [6.0e9, 5.0e9, 4.2e9, 3.6e9],
+            'Interest Expense': [1.5e9, 1.4e9, 1.3e9, 1.2e9],
+        }, index=_PERIODS).T,
+        'balance_sheet': pd.DataFrame({
+            'Total Assets': [3.5e11, 3.2e11, 3.0e11, 2.8e11],
+            'Stockholders Equity': [1.5e11, 1.4e11, 1.3e11, 1.2e11],
+            'Total Debt': [4.0e10, 4.2e10, 4.5e10, 4.8e10],
+        }, index=_PERIODS).T,
+        'cashflow': pd.DataFrame({
+            'Free Cash Flow': [2.6e10, 2.2e10, 1.9e10, 1.6e10],
+        }, index=_PERIODS).T,
+    })
+    return calc
+
+
+def test_dcf_batch_matches_single_valuation():
+    calc = _calculator()
+    wacc = calc.calculate_wacc()
+    single = calc.calculate_dcf_valuation(wacc_data=wacc)
+    batch = calc.calculate_dcf_batch(np.array([wacc.wacc]), np.array([single.revenue_growth]), np.array([0.025]))
+    assert single.error is None and 'error' not in batch
+    assert batch['enterprise_value'][0] == pytest.approx(single.enterprise_value, rel=1e-10)
+    assert batch['equity_value'][0] == pytest.approx(single.equity_value, rel=1e-10)
+    assert batch['intrinsic_value'][0] == pytest.approx(single.intrinsic_value_per_share, rel=1e-10)
+    assert batch['terminal_value'][0] == pytest.approx(single.terminal_value, rel=1e-10)
+
+
+def test_dcf_batch_matches_single_valuation_per_scenario(monkeypatch):
+    calc = _calculator()
+    total_debt = calc.calculate_wacc().total_debt
+    wacc = np.array([0.07, 0.09, 0.11, 0.13])
+    growth = np.array([-0.05, 0.03, 0.08, 0.15])
+    batch = calc.calculate_dcf_batch(wacc, growth, 0.025)
+    for i, (rate, growth_rate) in enumerate(zip(wacc, growth)):
+        monkeypatch.setattr(calc, '_estimate_revenue_growth', lambda growth_rate=growth_rate: growth_rate)
+        single = calc.calculate_dcf_valuation(wacc_data=WACCResult(wacc=rate, total_debt=total_debt))
+        assert batch['intrinsic_value'][i] == pytest.approx(single.intrinsic_value_per_share, rel=1e-10)
+        assert batch['enterprise_value'][i] == pytest.approx(single.enterprise_value, rel=1e-10)
+
+
+def test_dcf_batch_broadcasts_scalar_assumptions():
+    batch = _calculator().calculate_dcf_batch(0.09, np.array([0.02, 0.04, 0.06]), 0.025)
+    assert batch['wacc'].shape == batch['terminal_growth'].shape == (3,)
+    assert np.all(np.diff(batch['intrinsic_value']) > 0)
+
+
+def test_dcf_batch_without_cash_flow():
+    calc = _calculator()
+    calc._cache['cashflow'] = pd.DataFrame()
+    assert calc.calculate_dcf_batch(np.array([0.09]), np.array([0.05]), np.array([0.025])) == {
+        'error': 'No cash flow data available'
+    }
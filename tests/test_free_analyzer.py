@@ -0,0 +1,97 @@
+"""
+FreeStockAnalyzer batch and vectorized paths against the per-stock analysis.
+"""
+
+import numpy as np
+import pytest
+
+from data_analysis import free_analyzer
+from data_analysis.free_analyzer import FreeStockAnalyzer, _Inputs
+
+
+def _stocks(n, seed=0):
+    """Stock snapshots across every size band and P/E bucket, with some missing and non-numeric fields."""
+    rng = np.random.default_rng(seed)
+    stocks = []
+    for i in range(n):
+        stock = {
+            'symbol': f'S{i}',
+            'company_name': f'Company {i}',
+            'sector': ['Technology', 'Healthcare', 'Energy'][i % 3],
+            'current_price': float(rng.uniform(5, 500)),
+            'pe_ratio': float(rng.choice([0.0, 8.0, 15.0, 25.0, 40.0, rng.uniform(1, 60)])),
+            'eps': float(rng.choice([0.0, rng.uniform(-2, 15)])),
+            'market_cap': float(10 ** rng.uniform(8, 12.5)),
+            'beta': float(rng.uniform(0.3, 2.2)),
+            'dividend_yield': float(rng.choice([0.0, rng.uniform(0, 0.06)])),
+            'pb_ratio': float(rng.uniform(0.5, 8)),
+            '52w_high': float(rng.uniform(300, 600)),
+            '52w_low': float(rng.uniform(1, 300)),
+        }
+        if i % 7 == 0:
+            del stock['beta']
+        if i % 11 == 0:
+            stock['pe_ratio'] = 'N/A'
+        if i % 13 == 0:
+            stock['market_cap'] = None
+        stocks.append(stock)
+    return stocks
+
+
+def _without_date(analysis):
+    return {key: value for key, value in analysis.items() if key != 'analysis_date'}
+
+
+def test_batch_matches_per_stock_analysis():
+    stocks = _stocks(200)
+    batch = FreeStockAnalyzer().analyze_stocks_batch(stocks)
+    scalar = FreeStockAnalyzer()
+    assert [_without_date(a) for a in batch] == [_without_date(scalar.analyze_stock_free(s)) for s in stocks]
+
+
+def test_analyze_many_matches_batch_across_workers(monkeypatch):
+    # Force the pool even on a single CPU and for a small batch
+    monkeypatch.setattr(free_analyzer.os, 'cpu_count', lambda: 2)
+    monkeypatch.setattr(free_analyzer, '_POOL_STARTUP_MS', float('-inf'))
+    stocks = _stocks(40, seed=1)
+    analyzer = FreeStockAnalyzer()
+    pooled = analyzer.analyze_many(stocks, workers=2)
+    assert [_without_date(a) for a in pooled] == [_without_date(a) for a in analyzer.analyze_stocks_batch(stocks)]
+
+
+def test_analyze_many_small_batch_stays_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('pool started for a small batch')
+    monkeypatch.setattr(free_analyzer, 'ProcessPoolExecutor', no_pool)
+    stocks = _stocks(20, seed=2)
+    assert len(FreeStockAnalyzer().analyze_many(stocks, workers=4)) == 20
+
+
+def test_dcf_fair_values_match_per_stock_dcf():
+    stocks = _stocks(200, seed=3)
+    analyzer = FreeStockAnalyzer()
+    expected = [analyzer._calculate_dcf_valuation(_Inputs.from_dict(s))['fair_value'] for s in stocks]
+    np.testing.assert_allclose(analyzer.dcf_fair_values(stocks), np.array(expected, dtype=np.float64), rtol=1e-12)
+
+
+def test_dcf_monte_carlo_without_spread_is_the_point_estimate(monkeypatch):
+    for name in ('_MC_GROWTH_STD', '_MC_TERMINAL_GROWTH_STD', '_MC_DISCOUNT_STD'):
+        monkeypatch.setattr(free_analyzer, name, 0.0)
+    analyzer = FreeStockAnalyzer()
+    for stock in _stocks(30, seed=4):
+        if not stock['eps'] or stock['market_cap'] is None:
+            continue
+        expected = analyzer._calculate_dcf_valuation(_Inputs.from_dict(stock))['fair_value']
+        result = analyzer.dcf_monte_carlo(stock, n_paths=1000, seed=0)
+        for key in ('mean_fair_value', 'median_fair_value', 'percentile_5', 'percentile_95'):
+            assert result[key] == pytest.approx(expected, rel=1e-10)
+
+
+def test_dcf_monte_carlo_is_reproducible_and_brackets_the_estimate():
+    stock = {'current_price': 150.0, 'eps': 6.0, 'market_cap': 5e11}
+    analyzer = FreeStockAnalyzer()
+    first = analyzer.dcf_monte_carlo(stock, n_paths=20_000, seed=42)
+    assert first == analyzer.dcf_monte_carlo(stock, n_paths=20_000, seed=42)
+    point = analyzer._calculate_dcf_valuation(_Inputs.from_dict(stock))['fair_value']
+    assert first['percentile_5'] < point < first['percentile_95']
+    assert analyzer.dcf_monte_carlo({'current_price': 10.0}, seed=0)['status'] == 'Insufficient data'
@@ -0,0 +1,107 @@
+"""
+Price indicator kernels against the pandas implementations they replaced.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analysis.indicators import (
+    TRADING_DAYS_PER_YEAR, annualized_volatility, bollinger_bands, macd_lines, rolling_mean,
+    rolling_means, rsi, total_return,
+)
+
+
+def _prices(n, seed, nan_fraction=0.0):
+    """Random-walk closes, with a fraction of them replaced by NaN."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 + rng.normal(0.0, 1.0, n).cumsum()
+    close[rng.random(n) < nan_fraction] = np.nan
+    return close
+
+
+@pytest.mark.parametrize('nan_fraction', [0.0, 0.05])
+@pytest.mark.parametrize('window', [1, 20, 50])
+def test_rolling_mean_matches_pandas(window, nan_fraction):
+    close = _prices(300, window, nan_fraction)
+    expected = pd.Series(close).rolling(window).mean().to_numpy()
+    np.testing.assert_allclose(rolling_mean(close.copy(), window), expected, rtol=1e-9)
+
+
+def test_rolling_mean_recovers_after_nan():
+    close = np.arange(1.0, 11.0)
+    close[2] = np.nan
+    out = rolling_mean(close, 3)
+    assert np.isnan(out[2:5]).all()
+    assert out[5] == pytest.approx(5.0)
+
+
+def test_total_return_and_volatility_match_pandas():
+    close = _prices(500, 5)
+    series = pd.Series(close)
+    assert total_return(close) == pytest.approx(series.iloc[-1] / series.iloc[0] - 1)
+    expected = np.log(series).diff().std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+    assert annualized_volatility(close, TRADING_DAYS_PER_YEAR) == pytest.approx(expected, rel=1e-9)
+
+
+def test_short_series_are_nan():
+    assert np.isnan(total_return(np.array([100.0])))
+    assert np.isnan(annualized_volatility(np.array([100.0, 101.0]), TRADING_DAYS_PER_YEAR))
+
+
+def _wilder_rsi(close, period):
+    """Wilder RSI in pandas: a simple-average seed, then ewm(alpha=1/period) smoothing."""
+    delta = pd.Series(close).diff()
+    averages = []
+    for moves in (delta.clip(lower=0).fillna(0), (-delta).clip(lower=0).fillna(0)):
+        seeded = pd.concat([pd.Series([moves.iloc[1:period + 1].mean()]), moves.iloc[period + 1:]])
+        averages.append(seeded.ewm(alpha=1 / period, adjust=False).mean().to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - 100 / (1 + averages[0] / averages[1])
+    return np.concatenate([np.full(period, np.nan), values])
+
+
+@pytest.mark.parametrize('nan_fraction', [0.0, 0.05])
+def test_rsi_matches_wilder_reference(nan_fraction):
+    close = _prices(300, 3, nan_fraction)
+    np.testing.assert_allclose(rsi(close.copy(), 14), _wilder_rsi(close, 14), rtol=1e-9)
+
+
+def test_rsi_of_steady_rise_is_100():
+    out = rsi(np.arange(1.0, 31.0), 14)
+    assert np.isnan(out[:14]).all()
+    assert (out[14:] == 100.0).all()
+
+
+def test_rolling_means_matches_pandas():
+    rows = np.vstack([_prices(260, seed, 0.03) for seed in range(4)])
+    windows = np.array([20, 50, 200, 5], dtype=np.int64)
+    out = rolling_means(rows, windows)
+    for row, window, result in zip(rows, windows, out):
+        np.testing.assert_allclose(result, pd.Series(row).rolling(window).mean().to_numpy(), rtol=1e-9)
+
+
+@pytest.mark.parametrize('nan_fraction', [0.0, 0.05])
+def test_bollinger_bands_matches_pandas(nan_fraction):
+    close = _prices(300, 7, nan_fraction)
+    upper, middle, lower, bandwidth, percent_b = bollinger_bands(close.copy(), 20, 2.0)
+    series = pd.Series(close)
+    sma = series.rolling(20).mean()
+    std = series.rolling(20).std()
+    np.testing.assert_allclose(middle, sma.to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(upper, (sma + 2 * std).to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(lower, (sma - 2 * std).to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(bandwidth, ((4 * std) / sma).to_numpy(), rtol=1e-7)
+    np.testing.assert_allclose(percent_b, ((series - (sma - 2 * std)) / (4 * std)).to_numpy(), rtol=1e-7)
+
+
+@pytest.mark.parametrize('nan_fraction', [0.0, 0.05])
+def test_macd_lines_matches_pandas(nan_fraction):
+    close = _prices(300, 11, nan_fraction)
+    macd, signal, histogram = macd_lines(close.copy(), 12, 26, 9)
+    series = pd.Series(close)
+    expected_macd = series.ewm(span=12).mean() - series.ewm(span=26).mean()
+    expected_signal = expected_macd.ewm(span=9).mean()
+    np.testing.assert_allclose(macd, expected_macd.to_numpy(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(signal, expected_signal.to_numpy(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(histogram, (expected_macd - expected_signal).to_numpy(), rtol=1e-9, atol=1e-12)
@@ -0,0 +1,213 @@
+"""
+StockAnalyzer streaming, fetching and AI caching, with yfinance and OpenAI replaced by fakes.
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analysis import stock_analyzer
+from data_analysis.stock_analyzer import StockAnalyzer, TechnicalIndicators, _JsonFieldStream
+
+_RESPONSE = {
+    "analysis": "DCF: FCF of $1,000 {growing} at \"5%\"; [terminal] 2.5%\nWACC 9%",
+    "investment_thesis": "Fair value $110 vs $100 \\ 10% undervalued",
+    "highlights": ["WACC 9%", "ROE {21%}", "Debt, cash: [1, 2]"],
+    "risks": [],
+    "recommendation": "BUY",
+    "target_price": 110.5,
+    "upside_potential": -3.0,
+    "nested": {"a": [1, {"b": "}"}], "c": None},
+}
+
+
+def _analyzer(cache_enabled=True, api_key='sk-test-key'):
+    return StockAnalyzer(SimpleNamespace(openai_api_key=api_key, cache_enabled=cache_enabled))
+
+
+# _JsonFieldStream
+
+@pytest.mark.parametrize('seed', range(20))
+def test_field_stream_matches_json_loads_for_any_chunking(seed):
+    text = json.dumps(_RESPONSE, indent=seed % 3 or None)
+    rng = np.random.default_rng(seed)
+    cuts = sorted(set(rng.integers(0, len(text), size=int(rng.integers(1, 40)))))
+    stream = _JsonFieldStream()
+    fields = []
+    for start, end in zip([0] + cuts, cuts + [len(text)]):
+        fields.extend(stream.feed(text[start:end]))
+    assert fields == list(json.loads(text).items())
+
+
+def test_field_stream_skips_malformed_fields():
+    stream = _JsonFieldStream()
+    assert stream.feed('{"a": 1, "b": tru, "c": "ok"}') == [('a', 1), ('c', 'ok')]
+
+
+# Technical indicators
+
+def test_technical_indicators_match_pandas():
+    rng = np.random.default_rng(0)
+    close = pd.Series(100 + rng.normal(0, 1, 300).cumsum())
+    volume = pd.Series(rng.uniform(1e6, 2e6, 300))
+    indicators = TechnicalIndicators(pd.DataFrame({'Close': close, 'Volume': volume}))
+    sma, std = close.rolling(20).mean(), close.rolling(20).std()
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    expected = {
+        'sma_20': sma, 'sma_50': close.rolling(50).mean(), 'sma_200': close.rolling(200).mean(),
+        'volume_sma': volume.rolling(20).mean(),
+        'macd': macd, 'macd_signal': macd.ewm(span=9).mean(), 'macd_histogram': macd - macd.ewm(span=9).mean(),
+        'bb_upper': sma + 2 * std, 'bb_lower': sma - 2 * std, 'bb_middle': sma,
+    }
+    for key, series in expected.items():
+        np.testing.assert_allclose(indicators[key].to_numpy(), series.to_numpy(), rtol=1e-9, atol=1e-12)
+    assert list(indicators) == indicators.columns
+    np.testing.assert_allclose(indicators.to_array(np.float64)[:, indicators.columns.index('rsi')],
+                               indicators['rsi'].to_numpy())
+
+
+# Fetching
+
+class _FakeTicker:
+    """yfinance Ticker stand-in with a fixed price history and info."""
+
+    def __init__(self, symbol, start, days):
+        rng = np.random.default_rng(len(symbol) + days)
+        index = pd.bdate_range(start, periods=days, name='Date')
+        close = 50 + rng.normal(0, 1, days).cumsum()
+        self.hist = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                                  'Volume': rng.integers(1_000_000, 2_000_000, days).astype(float)}, index=index)
+        self.info = {'longName': f'{symbol} Inc', 'sector': 'Technology', 'marketCap': 1e11, 'trailingPE': 21.0,
+                     'trailingEps': 2.5, 'beta': 1.2, 'freeCashflow': 4e9, 'website': 'dropped'}
+        self.financials = pd.DataFrame({'2024': [1.0e10]}, index=['Total Revenue'])
+        self.balance_sheet = pd.DataFrame({'2024': [5.0e10]}, index=['Total Assets'])
+        self.cashflow = pd.DataFrame({'2024': [4.0e9]}, index=['Free Cash Flow'])
+
+    def history(self, period):
+        return self.hist
+
+
+def _assert_same_stock_data(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(actual[key], value, check_dtype=False, check_freq=False)
+        elif isinstance(value, TechnicalIndicators):
+            np.testing.assert_allclose(actual[key].to_array(np.float64), value.to_array(np.float64))
+        else:
+            assert actual[key] == value, key
+
+
+@pytest.mark.parametrize('include_statements', [False, True])
+def test_fetch_batch_matches_single_fetches(monkeypatch, include_statements):
+    tickers = {'AAA': _FakeTicker('AAA', '2024-01-01', 260), 'BB': _FakeTicker('BB', '2024-03-01', 200)}
+
+    def download(symbols, period, **kwargs):
+        # yf.download aligns every history on one index, leaving NaN rows for shorter ones
+        return pd.concat({symbol: tickers[symbol].hist for symbol in symbols}, axis=1)
+
+    monkeypatch.setattr(stock_analyzer.yf, 'download', download)
+    single, batch = _analyzer(), _analyzer()
+    for analyzer in (single, batch):
+        analyzer._tickers.update(tickers)
+    expected = {symbol: single.fetch_stock_data(symbol, include_statements=include_statements) for symbol in tickers}
+    actual = batch.fetch_stock_data_batch(list(tickers), include_statements=include_statements)
+    assert actual.keys() == expected.keys()
+    for symbol in tickers:
+        _assert_same_stock_data(actual[symbol], expected[symbol])
+    assert 'website' not in actual['AAA']['company_info']
+
+
+def test_fetch_batch_accepts_flat_columns_for_one_symbol(monkeypatch):
+    # Older yfinance versions don't add the symbol level when only one was requested
+    ticker = _FakeTicker('AAA', '2024-01-01', 260)
+    monkeypatch.setattr(stock_analyzer.yf, 'download', lambda symbols, period, **kwargs: ticker.hist)
+    single, batch = _analyzer(), _analyzer()
+    for analyzer in (single, batch):
+        analyzer._tickers['AAA'] = ticker
+    _assert_same_stock_data(batch.fetch_stock_data_batch(['AAA'])['AAA'], single.fetch_stock_data('AAA'))
+
+
+# AI response caching
+
+def _chunks(text, finish_reason):
+    """Streamed completion chunks for text, ending with finish_reason and a usage-only chunk."""
+    parts = [text[i:i + 16] for i in range(0, len(text), 16)]
+    for i, part in enumerate(parts):
+        finish = finish_reason if i == len(parts) - 1 else None
+        yield SimpleNamespace(usage=None, choices=[SimpleNamespace(finish_reason=finish,
+                                                                   delta=SimpleNamespace(content=part))])
+    yield SimpleNamespace(usage=SimpleNamespace(completion_tokens=len(parts)), choices=[])
+
+
+class _FakeClient:
+    """OpenAI client stand-in streaming one canned response and counting requests."""
+
+    def __init__(self, text, finish_reason='stop'):
+        self.text, self.finish_reason, self.calls = text, finish_reason, 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return _chunks(self.text, self.finish_reason)
+
+
+_STOCK = {'symbol': 'ZZZ', 'company_name': 'Zed', 'current_price': 100.0, 'beta': 1.1,
+          'company_info': {'freeCashflow': 4e9, 'marketCap': 1e11}}
+
+
+def _run(analyzer, client, on_field=None, **changes):
+    analyzer.client = client
+    return analyzer._get_comprehensive_ai_analysis({**_STOCK, **changes}, on_field)
+
+
+def test_ai_result_is_cached_and_replayed():
+    analyzer, client = _analyzer(), _FakeClient(json.dumps(_RESPONSE))
+    streamed, replayed = [], []
+    assert _run(analyzer, client, lambda *f: streamed.append(f)) == _RESPONSE
+    assert _run(analyzer, client, lambda *f: replayed.append(f)) == _RESPONSE
+    assert client.calls == 1
+    assert streamed == replayed == list(_RESPONSE.items())
+
+
+@pytest.mark.parametrize('text, finish_reason', [
+    (json.dumps(_RESPONSE)[:60], 'length'),
+    ('not json', 'stop'),
+])
+def test_incomplete_ai_result_is_not_cached(cache_dir, text, finish_reason):
+    analyzer, client = _analyzer(), _FakeClient(text, finish_reason)
+    _run(analyzer, client)
+    _run(analyzer, client)
+    assert client.calls == 2
+    assert not cache_dir.exists() or not any(cache_dir.iterdir())
+
+
+def test_latest_ai_result_reuse_is_limited_to_price_moves():
+    analyzer, client = _analyzer(), _FakeClient(json.dumps(_RESPONSE))
+    _run(analyzer, client)
+    _run(analyzer, client, current_price=100.5)
+    _run(analyzer, client, company_info={'freeCashflow': 4e9, 'marketCap': 2e11}, pe_ratio=40.0)
+    assert client.calls == 1
+    _run(analyzer, client, current_price=102.0)
+    assert client.calls == 2
+    _run(analyzer, client, current_price=100.5, company_info={'freeCashflow': 5e9, 'marketCap': 1e11})
+    assert client.calls == 3
+    _run(_analyzer(api_key='sk-other-key'), client, current_price=100.5)
+    assert client.calls == 4
+
+
+def test_ai_cache_disabled_always_requests():
+    analyzer, client = _analyzer(cache_enabled=False), _FakeClient(json.dumps(_RESPONSE))
+    _run(analyzer, client)
+    _run(analyzer, client)
+    assert client.calls == 2
+
+
+def test_ai_result_is_cached_per_api_key():
+    client = _FakeClient(json.dumps(_RESPONSE))
+    _run(_analyzer(), client)
+    _run(_analyzer(api_key='sk-other-key'), client)
+    assert client.calls == 2
@@ -0,0 +1,70 @@
+"""
+Valuation kernels against straightforward NumPy DCF projections.
+"""
+
+import numpy as np
+import pytest
+
+from data_analysis.valuation_kernels import (
+    capm_cost_of_equity, dcf_paths, dcf_projection, dcf_scenarios, discounted_sum,
+    gordon_terminal_value, weighted_cost_of_capital,
+)
+
+
+def _decaying_growth_dcf(free_cash_flow, wacc, growth, terminal_growth, years):
+    """FinancialCalculator's scalar projection: growth decays 10% a year, then a Gordon terminal value."""
+    projected = free_cash_flow * np.cumprod(1 + growth * 0.9 ** np.arange(years))
+    factors = (1 + wacc) ** np.arange(1, years + 1)
+    terminal_value = projected[-1] * (1 + terminal_growth) / (wacc - terminal_growth)
+    return (projected / factors).sum() + terminal_value / factors[-1], terminal_value
+
+
+def _constant_growth_dcf(base_cash_flow, growth, terminal_growth, rate, years):
+    """Single-stage DCF with constant growth."""
+    projected = base_cash_flow * (1 + growth) ** np.arange(1, years + 1)
+    factors = (1 + rate) ** np.arange(1, years + 1)
+    terminal_value = projected[-1] * (1 + terminal_growth) / (rate - terminal_growth)
+    return projected, projected / factors, terminal_value, terminal_value / factors[-1]
+
+
+def test_dcf_scenarios_matches_scalar_projection():
+    rng = np.random.default_rng(0)
+    n = 500
+    wacc = rng.uniform(0.06, 0.14, n)
+    growth = rng.uniform(-0.10, 0.20, n)
+    terminal_growth = rng.uniform(0.0, 0.04, n)
+    enterprise_value, terminal_value = dcf_scenarios(2.5e9, wacc, growth, terminal_growth, 5)
+    for i in range(n):
+        expected_ev, expected_tv = _decaying_growth_dcf(2.5e9, wacc[i], growth[i], terminal_growth[i], 5)
+        assert enterprise_value[i] == pytest.approx(expected_ev, rel=1e-10)
+        assert terminal_value[i] == pytest.approx(expected_tv, rel=1e-10)
+
+
+def test_dcf_paths_matches_single_projection():
+    rng = np.random.default_rng(1)
+    n = 500
+    growth = rng.normal(0.08, 0.03, n)
+    terminal_growth = np.clip(rng.normal(0.025, 0.005, n), 0.0, None)
+    rate = np.maximum(rng.normal(0.10, 0.015, n), terminal_growth + 0.01)
+    fair_value = dcf_paths(4.2, growth, terminal_growth, rate, 5)
+    for i in range(n):
+        _, _, total, _, terminal_pv = dcf_projection(4.2, growth[i], terminal_growth[i], rate[i], 5)
+        assert fair_value[i] == pytest.approx(total + terminal_pv, rel=1e-10)
+
+
+def test_dcf_projection_matches_numpy():
+    projected, present_value, total, terminal_value, terminal_pv = dcf_projection(3.0, 0.07, 0.025, 0.095, 5)
+    expected = _constant_growth_dcf(3.0, 0.07, 0.025, 0.095, 5)
+    np.testing.assert_allclose(projected, expected[0], rtol=1e-12)
+    np.testing.assert_allclose(present_value, expected[1], rtol=1e-12)
+    assert total == pytest.approx(expected[1].sum(), rel=1e-12)
+    assert terminal_value == pytest.approx(expected[2], rel=1e-12)
+    assert terminal_pv == pytest.approx(expected[3], rel=1e-12)
+
+
+def test_scalar_helpers():
+    assert capm_cost_of_equity(0.045, 1.2, 0.065) == pytest.approx(0.045 + 1.2 * 0.065)
+    cash_flows = np.array([100.0, 110.0, 121.0])
+    assert discounted_sum(cash_flows, 0.1) == pytest.approx(sum(cf / 1.1 ** t for t, cf in enumerate(cash_flows, 1)))
+    assert weighted_cost_of_capital(0.12, 0.04, 0.5) == pytest.approx((0.12 + 0.5 * 0.04) / 1.5)
+    assert gordon_terminal_value(100.0, 0.02, 0.09) == pytest.approx(100.0 * 1.02 / 0.07)